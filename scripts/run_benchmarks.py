@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Solver Benchmark Runner
+=======================
+
+Benchmarks the AdaptiveStepSolver on the harmonic test system, the
+modified Friedmann equations and the CMB perturbation system at several
+k, appends the run to a JSON history and flags regressions against the
+stored baseline. The committed baseline holds only the deterministic
+counts; --update-baseline records wall time and memory as well, which
+are compared only on the machine that recorded them.
+
+Usage:
+    python scripts/run_benchmarks.py
+    python scripts/run_benchmarks.py --update-baseline
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import argparse
+import logging
+import sys
+import numpy as np
+
+
+from core.chronodynamic_tensor import ChronodynamicTensor, ChronodynamicEvolution, CosmologicalParams
+from observational.cmb_predictions import ChronodynamicTransferFunction, CMBConfig
+from numerical.differential_solvers import SolverConfig
+from numerical.benchmarks import SolverBenchmark, BenchmarkConfig, BenchmarkCase, harmonic_case
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+
+class AnalyticBackgroundTransfer(ChronodynamicTransferFunction):
+    """
+    Transfer function on the analytic radiation-era background a(τ) = τ.
+
+    Uses the scaling that _precompute_background starts from
+    (a_ini = τ_ini) instead of the full Friedmann integration, so that
+    the benchmark only times the perturbation system.
+    """
+
+    def _precompute_background(self):
+        def a_interp_func(tau, nu=0):
+            tau = np.asarray(tau, dtype=float)
+            if nu == 0:
+                return np.array([tau, np.ones_like(tau)])
+            return np.array([np.ones_like(tau), np.zeros_like(tau)])
+
+        self.a_interp_func = a_interp_func
+        self.H_interp_func = lambda tau: self.a_interp_func(tau, 1)[0] / self.a_interp_func(tau, 0)[0]
+
+
+def build_cases(k_values, grid_size: int) -> list:
+    """Harmonic, Friedmann and CMB perturbation benchmark cases"""
+    params = CosmologicalParams()
+    tensor = ChronodynamicTensor(params, grid_size=grid_size)
+    evolution = ChronodynamicEvolution(tensor)
+
+    # Today's expansion rate, integrated up to just before the recollapse
+    a_prime_today = np.sqrt(8 * np.pi * (params.Omega_m + params.Omega_r + params.Omega_lambda) / 3)
+
+    cases = [
+        harmonic_case(),
+        BenchmarkCase(
+            name='friedmann_modified',
+            system_func=evolution.friedmann_equations_modified,
+            tau_span=(1.0, 1.4),
+            initial_conditions=np.array([1.0, a_prime_today]),
+            solver_config=SolverConfig(method='RK45', rtol=1e-10, atol=1e-12)
+        )
+    ]
+
+    transfer = AnalyticBackgroundTransfer(tensor, CMBConfig(n_k=len(k_values)))
+    tau_ini, tau_rec = 1e-4, transfer._conformal_time_at_recombination()
+    for k in k_values:
+        cases.append(BenchmarkCase(
+            name=f'cmb_perturbations_k{k:g}',
+            system_func=lambda tau, y, k=k: transfer._chronodynamic_perturbation_equations(tau, y, k),
+            tau_span=(tau_ini, tau_rec),
+            initial_conditions=transfer._adiabatic_initial_conditions(k, tau_ini),
+            # Mirrors the settings of solve_perturbation_equations
+            solver_config=SolverConfig(method='LSODA', rtol=1e-6, atol=1e-7, max_step=np.inf)
+        ))
+
+    return cases
+
+
+def main():
+    """Benchmark runner"""
+    parser = argparse.ArgumentParser(description='Benchmark the numerical solvers')
+    parser.add_argument('--k', type=float, nargs='+', default=[1e-3, 1e-2, 1e-1],
+                       help='Wavenumbers for the CMB perturbation cases')
+    parser.add_argument('--grid-size', type=int, default=8,
+                       help='Chronodynamic tensor grid size')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Timed runs per case')
+    parser.add_argument('--history', default='benchmarks/history.json',
+                       help='JSON history file')
+    parser.add_argument('--baseline', default='benchmarks/baseline.json',
+                       help='Baseline file')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help='Store this run as the new baseline')
+
+    args = parser.parse_args()
+
+    benchmark = SolverBenchmark(BenchmarkConfig(
+        repeats=args.repeats, history_path=args.history, baseline_path=args.baseline
+    ))
+
+    record = benchmark.run(build_cases(args.k, args.grid_size))
+    benchmark.append_history(record)
+
+    baseline = benchmark.load_baseline()
+    regressions = [] if baseline is None else benchmark.compare(record, baseline)
+
+    if args.update_baseline or baseline is None:
+        benchmark.save_baseline(record)
+
+    print("\nBenchmark results")
+    print("=" * 50)
+    for name, metrics in record['results'].items():
+        print(f"{name:28s} {metrics['wall_time']:9.4f} s  nfev={metrics['nfev']:<7d} "
+              f"steps={metrics['accepted_steps']}/{metrics['rejected_steps']}  "
+              f"peak={metrics['peak_memory'] / 1024:.1f} KiB")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against the baseline:")
+        for r in regressions:
+            print(f"  {r['case']}.{r['metric']}: {r['baseline']} → {r['current']} (×{r['ratio']:.2f})")
+        return 1
+
+    print("\nNo regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -74,7 +74,12 @@ def create_default_config() -> dict:
         'cmb_settings': {
             'l_max': 2500,
             'n_k': 200,
-            'z_recombination': 1090.0
+            'z_recombination': 1090.0,
+            'max_workers': 1,
+            'bessel_cache_dir': None,
+            'l_sample_max_step': 0,
+            'l_approximation': 'exact',
+            'l_approximation_switch': 500
         },
         'mcmc_settings': {
             'nwalkers': 64,
@@ -163,7 +168,13 @@ def run_cmb_predictions(tensor: ChronodynamicTensor, config: dict, output_dir: P
     cmb_config = CMBConfig(
         l_max=config['cmb_settings']['l_max'],
         n_k=config['cmb_settings']['n_k'],
-        z_recombination=config['cmb_settings']['z_recombination']
+        z_recombination=config['cmb_settings']['z_recombination'],
+        max_workers=config['cmb_settings'].get('max_workers', 1),
+        bessel_cache_dir=config['cmb_settings'].get('bessel_cache_dir'),
+        l_sample_max_step=config['cmb_settings'].get('l_sample_max_step', 0),
+        l_approximation=config['cmb_settings'].get('l_approximation', 'exact'),
+        l_approximation_switch=config['cmb_settings'].get('l_approximation_switch', 500),
+        transfer_cache_dir=config['cmb_settings'].get('transfer_cache_dir')
     )
     
     # Initialize CMB predictor
@@ -333,6 +344,8 @@ def main():
                        help='Output directory')
     parser.add_argument('--skip-mcmc', action='store_true',
                        help='Skip MCMC analysis (for faster testing)')
+    parser.add_argument('--transfer-cache', metavar='DIR', default=None,
+                       help='Cache per-k transfer solutions in DIR and reuse them on reruns')
     
     args = parser.parse_args()
     
@@ -343,6 +356,8 @@ def main():
     # Load configuration
     config_file_path = Path(__file__).resolve().parent.parent / args.config
     config = load_config(config_file_path)
+    if args.transfer_cache:
+        config['cmb_settings']['transfer_cache_dir'] = args.transfer_cache
     
     # Set up output directory
     output_dir = setup_output_directory(args.output)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Solver Benchmarks with Regression Tracking
+==========================================
+
+Performance benchmarks for the AdaptiveStepSolver of the Chronodynamic
+Cosmological Divergence (CCD) model. Each case records wall time,
+function evaluations, accepted/rejected steps and peak memory; runs are
+appended to a JSON history and compared against a stored baseline so
+solver changes can be judged quantitatively. Wall time and memory are
+only compared when the baseline was recorded in the same environment.
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import numpy as np
+import scipy
+import hashlib
+import json
+import os
+import time
+import tracemalloc
+import platform
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Optional
+import logging
+from dataclasses import dataclass, field
+
+from .differential_solvers import AdaptiveStepSolver, SolverConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkConfig:
+    """Configuration for solver benchmarks"""
+    repeats: int = 3                 # Timed runs per case (the fastest is kept)
+    time_tolerance: float = 0.5      # Allowed relative wall time increase
+    count_tolerance: float = 0.05    # Allowed relative nfev/step count increase
+    memory_tolerance: float = 0.25   # Allowed relative peak memory increase
+    history_path: str = 'benchmarks/history.json'
+    baseline_path: str = 'benchmarks/baseline.json'
+
+
+@dataclass
+class BenchmarkCase:
+    """One system integrated by the AdaptiveStepSolver"""
+    name: str
+    system_func: Callable
+    tau_span: Tuple[float, float]
+    initial_conditions: np.ndarray
+    solver_config: SolverConfig = field(default_factory=SolverConfig)
+
+
+def harmonic_case(solver_config: SolverConfig = None) -> BenchmarkCase:
+    """Harmonic oscillator over ten periods, the reference test system"""
+    def harmonic_system(tau, y):
+        x, v = y
+        return np.array([v, 2.0 - x])
+
+    return BenchmarkCase(
+        name='harmonic',
+        system_func=harmonic_system,
+        tau_span=(0.0, 20*np.pi),
+        initial_conditions=np.array([3.0, 0.0]),
+        solver_config=solver_config or SolverConfig(method='RK45', rtol=1e-10, atol=1e-12)
+    )
+
+
+class SolverBenchmark:
+    """
+    Runs benchmark cases and tracks them against a baseline.
+
+    Wall time is the fastest of several untraced runs; peak memory comes
+    from a separate tracemalloc run, since tracing slows execution down.
+    Evaluation and step counts are deterministic, so they get a tight
+    tolerance and are always compared. Wall time and memory depend on the
+    machine and library versions, so they get looser tolerances and are
+    compared only against a baseline with the same environment fingerprint.
+    """
+
+    # Metric -> config attribute holding its tolerance
+    TRACKED_METRICS = {
+        'wall_time': 'time_tolerance',
+        'nfev': 'count_tolerance',
+        'accepted_steps': 'count_tolerance',
+        'rejected_steps': 'count_tolerance',
+        'peak_memory': 'memory_tolerance'
+    }
+    # Metrics only comparable within one environment
+    MACHINE_DEPENDENT_METRICS = ('wall_time', 'peak_memory')
+
+    def __init__(self, config: BenchmarkConfig = None):
+        self.config = config or BenchmarkConfig()
+
+    def run_case(self, case: BenchmarkCase) -> Dict:
+        """
+        Benchmark a single case.
+
+        Returns:
+            Dictionary with wall time (s), nfev, accepted/rejected steps
+            and peak traced memory (bytes)
+        """
+        solver = AdaptiveStepSolver(case.solver_config)
+
+        def integrate():
+            return solver.solve_chronodynamic_system(
+                case.system_func, case.tau_span, case.initial_conditions
+            )
+
+        wall_times = []
+        for _ in range(max(1, self.config.repeats)):
+            start = time.perf_counter()
+            result = integrate()
+            wall_times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            integrate()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        metrics = {
+            'wall_time': min(wall_times),
+            'nfev': int(result['nfev']),
+            'accepted_steps': result['accepted_steps'],
+            'rejected_steps': result['rejected_steps'],
+            'peak_memory': int(peak_memory),
+            'method': case.solver_config.method
+        }
+
+        logger.info(f"Benchmark {case.name}: {metrics['wall_time']:.4f} s, "
+                    f"{metrics['nfev']} evaluations, {metrics['accepted_steps']} accepted / "
+                    f"{metrics['rejected_steps']} rejected steps, "
+                    f"peak {metrics['peak_memory'] / 1024:.1f} KiB")
+
+        return metrics
+
+    def run(self, cases: List[BenchmarkCase]) -> Dict:
+        """
+        Benchmark every case.
+
+        Returns:
+            Run record with a timestamp, environment and per-case metrics
+        """
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'environment': self.environment(),
+            'results': {case.name: self.run_case(case) for case in cases}
+        }
+
+    @staticmethod
+    def environment() -> Dict:
+        """
+        Describe the benchmarking environment.
+
+        The fingerprint hashes the host name together with the listed
+        fields, so wall times from another host are never compared
+        without storing the host name itself.
+        """
+        environment = {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'system': platform.system(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count()
+        }
+        identity = json.dumps([platform.node(), environment], sort_keys=True)
+        environment['fingerprint'] = hashlib.sha256(identity.encode()).hexdigest()[:16]
+        return environment
+
+    def compare(self, record: Dict, baseline: Dict) -> List[Dict]:
+        """
+        Flag metrics that got worse than the baseline beyond tolerance.
+
+        Cases or metrics missing from either side are not compared, and
+        wall time and memory are skipped unless both records carry the
+        same environment fingerprint.
+
+        Returns:
+            One entry per regression with the baseline and current values
+        """
+        fingerprint = record.get('environment', {}).get('fingerprint')
+        same_environment = (fingerprint is not None and
+                            fingerprint == baseline.get('environment', {}).get('fingerprint'))
+        if not same_environment:
+            logger.info("Baseline comes from another environment; comparing counts only")
+
+        regressions = []
+        for name, metrics in record['results'].items():
+            reference = baseline.get('results', {}).get(name)
+            if reference is None:
+                continue
+
+            for metric, tolerance_attr in self.TRACKED_METRICS.items():
+                if metric in self.MACHINE_DEPENDENT_METRICS and not same_environment:
+                    continue
+                current, previous = metrics.get(metric), reference.get(metric)
+                if current is None or previous is None:
+                    continue
+
+                tolerance = getattr(self.config, tolerance_attr)
+                limit = previous * (1 + tolerance)
+                if tolerance_attr == 'count_tolerance':
+                    # Slack of one for small counts such as rejected steps
+                    limit = max(limit, previous + 1)
+
+                if current > limit:
+                    regressions.append({
+                        'case': name,
+                        'metric': metric,
+                        'baseline': previous,
+                        'current': current,
+                        'ratio': current / previous if previous else np.inf
+                    })
+                    logger.warning(f"Regression in {name}.{metric}: {previous} → {current}")
+
+        return regressions
+
+    def append_history(self, record: Dict, path: Optional[str] = None) -> Path:
+        """Append a run record to the JSON history file"""
+        path = Path(path or self.config.history_path)
+        history = self._load_json(path) or []
+        history.append(record)
+        self._write_json(path, history)
+        return path
+
+    def load_baseline(self, path: Optional[str] = None) -> Optional[Dict]:
+        """Stored baseline record, or None if there is none yet"""
+        return self._load_json(Path(path or self.config.baseline_path))
+
+    def save_baseline(self, record: Dict, path: Optional[str] = None) -> Path:
+        """Store a run record as the new baseline"""
+        path = Path(path or self.config.baseline_path)
+        self._write_json(path, record)
+        logger.info(f"Benchmark baseline saved to {path}")
+        return path
+
+    @staticmethod
+    def _load_json(path: Path):
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path: Path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
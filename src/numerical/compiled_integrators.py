@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Compiled Integrators for Small Chronodynamic Systems
+====================================================
+
+Fixed-step RK4 and embedded Dormand–Prince 5(4) / DOP853 integrators for
+the small ODE systems of the Chronodynamic Cosmological Divergence (CCD)
+model (2-8 states). For systems this small, the per-step Python overhead
+of scipy's solve_ivp dominates; here the whole integration loop is
+compiled with numba and takes a compiled right-hand side.
+
+Without numba, or for right-hand sides numba cannot compile (e.g. bound
+methods of ChronodynamicEvolution), the same kernels run as plain NumPy
+code.
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import inspect
+import numpy as np
+from scipy.integrate import RK45, DOP853
+from typing import Callable, Dict, Tuple, Optional
+import logging
+from dataclasses import dataclass
+
+try:
+    import numba
+    from numba.core.registry import CPUDispatcher
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _njit(func: Callable) -> Callable:
+    """numba.njit when available, identity otherwise"""
+    return numba.njit(func) if NUMBA_AVAILABLE else func
+
+
+# Compiled right-hand sides, keyed by the original Python function;
+# None marks functions numba failed to compile
+_COMPILED_RHS = {}
+
+# Step-size control constants (same as scipy.integrate)
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+def _tableau(method: str) -> Tuple[np.ndarray, ...]:
+    """Butcher tableau (A, B, C, E, E3) and error estimator order"""
+    if method == 'RK45':
+        solver_cls = RK45
+        E3 = np.zeros(solver_cls.n_stages + 1)
+        E = solver_cls.E
+    elif method == 'DOP853':
+        solver_cls = DOP853
+        E3 = solver_cls.E3
+        E = solver_cls.E5
+    else:
+        raise ValueError(f"Unknown embedded method: {method}")
+
+    s = solver_cls.n_stages
+    A = np.zeros((s, s))
+    A[:, :solver_cls.A.shape[1]] = solver_cls.A[:s, :s]
+
+    return (np.ascontiguousarray(A),
+            np.ascontiguousarray(solver_cls.B, dtype=float),
+            np.ascontiguousarray(solver_cls.C[:s], dtype=float),
+            np.ascontiguousarray(E, dtype=float),
+            np.ascontiguousarray(E3, dtype=float),
+            solver_cls.error_estimator_order)
+
+
+@_njit
+def _rms(x):
+    return np.sqrt(np.mean(x * x))
+
+
+def _initial_step(rhs, t0, y0, f0, direction, order, rtol, atol):
+    """Initial step heuristic of Hairer, Nørsett & Wanner (as in scipy)"""
+    scale = atol + np.abs(y0) * rtol
+    d0 = _rms(y0 / scale)
+    d1 = _rms(f0 / scale)
+    if d0 < 1e-5 or d1 < 1e-5:
+        h0 = 1e-6
+    else:
+        h0 = 0.01 * d0 / d1
+
+    y1 = y0 + h0 * direction * f0
+    f1 = rhs(t0 + h0 * direction, y1)
+    d2 = _rms((f1 - f0) / scale) / h0
+
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1.0 / (order + 1))
+
+    return min(100 * h0, h1)
+
+
+@_njit
+def _embedded_rk_kernel(rhs, t0, t1, y0, f0, A, B, C, E, E3, error_order,
+                        rtol, atol, max_step, first_step, max_steps):
+    """
+    Adaptive embedded Runge-Kutta integration from t0 to t1, starting
+    with step size first_step from the derivative f0 = rhs(t0, y0).
+
+    Returns accepted times, states and derivatives together with
+    (nfev, n_accepted, n_rejected, status); status is 0 on success,
+    1 when max_steps was reached and -1 when the step size underflowed.
+    """
+    n = y0.shape[0]
+    s = B.shape[0]
+    use_e3 = np.any(E3 != 0.0)
+    direction = 1.0 if t1 >= t0 else -1.0
+    exponent = -1.0 / (error_order + 1)
+
+    # Output buffers grow by doubling up to max_steps + 1 entries
+    capacity = min(max_steps, 1024) + 1
+    ts = np.empty(capacity)
+    ys = np.empty((capacity, n))
+    fs = np.empty((capacity, n))
+    K = np.empty((s + 1, n))
+
+    t = t0
+    y = y0.copy()
+    f = f0.copy()
+    nfev = 0
+    ts[0] = t
+    ys[0] = y
+    fs[0] = f
+
+    h_abs = first_step
+
+    n_accepted = 0
+    n_rejected = 0
+    status = 1
+
+    while n_accepted < max_steps:
+        if direction * (t - t1) >= 0:
+            status = 0
+            break
+
+        min_step = 10 * np.abs(np.nextafter(t, direction * np.inf) - t)
+        if h_abs > max_step:
+            h_abs = max_step
+
+        step_rejected = False
+        underflow = False
+        while True:
+            if h_abs < min_step:
+                underflow = True
+                break
+
+            t_new = t + h_abs * direction
+            if direction * (t_new - t1) > 0:
+                t_new = t1
+            h = t_new - t
+            h_abs = np.abs(h)
+
+            K[0] = f
+            for i in range(1, s):
+                dy = np.zeros(n)
+                for j in range(i):
+                    dy += A[i, j] * K[j]
+                K[i] = rhs(t + C[i] * h, y + h * dy)
+
+            y_new = y + h * np.dot(B, K[:s])
+            f_new = rhs(t_new, y_new)
+            K[s] = f_new
+            nfev += s
+
+            scale = atol + np.maximum(np.abs(y), np.abs(y_new)) * rtol
+            if use_e3:
+                err5 = np.dot(E, K) / scale
+                err3 = np.dot(E3, K) / scale
+                err5_sq = np.sum(err5 * err5)
+                err3_sq = np.sum(err3 * err3)
+                if err5_sq == 0.0 and err3_sq == 0.0:
+                    error_norm = 0.0
+                else:
+                    error_norm = h_abs * err5_sq / np.sqrt((err5_sq + 0.01 * err3_sq) * n)
+            else:
+                error_norm = _rms(np.dot(E, K) * h / scale)
+
+            if error_norm < 1.0:
+                if error_norm == 0.0:
+                    factor = MAX_FACTOR
+                else:
+                    factor = min(MAX_FACTOR, SAFETY * error_norm ** exponent)
+                if step_rejected:
+                    factor = min(1.0, factor)
+                h_abs *= factor
+                break
+
+            h_abs *= max(MIN_FACTOR, SAFETY * error_norm ** exponent)
+            step_rejected = True
+            n_rejected += 1
+
+        if underflow:
+            status = -1
+            break
+
+        t = t_new
+        y = y_new
+        f = f_new
+        n_accepted += 1
+        if n_accepted == capacity:
+            capacity = min(2 * capacity, max_steps + 1)
+            ts_grown = np.empty(capacity)
+            ys_grown = np.empty((capacity, n))
+            fs_grown = np.empty((capacity, n))
+            ts_grown[:n_accepted] = ts
+            ys_grown[:n_accepted] = ys
+            fs_grown[:n_accepted] = fs
+            ts, ys, fs = ts_grown, ys_grown, fs_grown
+        ts[n_accepted] = t
+        ys[n_accepted] = y
+        fs[n_accepted] = f
+
+    if status == 1 and direction * (t - t1) >= 0:
+        status = 0
+
+    return (ts[:n_accepted + 1], ys[:n_accepted + 1], fs[:n_accepted + 1],
+            nfev, n_accepted, n_rejected, status)
+
+
+@_njit
+def _rk4_kernel(rhs, t0, t1, y0, n_steps):
+    """Classical fixed-step RK4 with n_steps steps"""
+    n = y0.shape[0]
+    h = (t1 - t0) / n_steps
+
+    ts = np.empty(n_steps + 1)
+    ys = np.empty((n_steps + 1, n))
+    fs = np.empty((n_steps + 1, n))
+
+    t = t0
+    y = y0.copy()
+    f = rhs(t, y)
+    ts[0] = t
+    ys[0] = y
+    fs[0] = f
+
+    for i in range(n_steps):
+        k2 = rhs(t + 0.5 * h, y + 0.5 * h * f)
+        k3 = rhs(t + 0.5 * h, y + 0.5 * h * k2)
+        k4 = rhs(t + h, y + h * k3)
+        y = y + (h / 6.0) * (f + 2 * k2 + 2 * k3 + k4)
+        t = t0 + (i + 1) * h
+        f = rhs(t, y)
+        ts[i + 1] = t
+        ys[i + 1] = y
+        fs[i + 1] = f
+
+    return ts, ys, fs, 4 * n_steps + 1
+
+
+@dataclass
+class CompiledSolverConfig:
+    """Configuration for compiled integrators"""
+    method: str = 'DOP853'    # 'RK4', 'RK45' or 'DOP853'
+    rtol: float = 1e-10       # Relative tolerance
+    atol: float = 1e-12       # Absolute tolerance
+    max_step: float = np.inf  # Maximum step size
+    first_step: Optional[float] = None  # Initial step (None: automatic)
+    max_steps: int = 1000000  # Accepted-step budget for embedded methods
+    n_steps: int = 1000       # Number of steps for fixed-step RK4
+
+
+class CompiledIntegrator:
+    """
+    Compiled integrator for small ODE systems.
+
+    The right-hand side must have the signature f(τ, y) -> ndarray. Numba
+    dispatchers are used as they are; plain functions are compiled with
+    numba.njit when possible, otherwise the kernels run in Python.
+    """
+
+    def __init__(self, config: CompiledSolverConfig = None):
+        self.config = config or CompiledSolverConfig()
+
+    @staticmethod
+    def compile_rhs(func: Callable) -> Callable:
+        """
+        Compile a plain-function right-hand side with numba.
+
+        Dispatchers, bound methods and other callables are returned
+        unchanged, as is everything when numba is not installed or has
+        already failed to compile func.
+        """
+        if not NUMBA_AVAILABLE or not inspect.isfunction(func):
+            return func
+        # Reuse dispatchers so the kernels are not recompiled on every solve
+        if func not in _COMPILED_RHS:
+            _COMPILED_RHS[func] = numba.njit(func)
+        return _COMPILED_RHS[func] or func
+
+    def solve(self,
+              rhs: Callable,
+              tau_span: Tuple[float, float],
+              initial_conditions: np.ndarray,
+              tau_eval: Optional[np.ndarray] = None) -> Dict:
+        """
+        Integrate dy/dτ = rhs(τ, y) over tau_span.
+
+        Args:
+            rhs: Right-hand side, ideally a numba-compiled function
+            tau_span: Integration interval (tau_start, tau_end)
+            initial_conditions: Initial values y(tau_start)
+            tau_eval: Points where the solution is returned, by cubic
+                Hermite interpolation between accepted steps (third order;
+                limit max_step when high-order methods take long steps)
+
+        Returns:
+            Dictionary with solution data and statistics
+        """
+        y0 = np.ascontiguousarray(initial_conditions, dtype=float)
+        tau_start, tau_end = float(tau_span[0]), float(tau_span[1])
+
+        compiled = self.compile_rhs(rhs)
+        if NUMBA_AVAILABLE and isinstance(compiled, CPUDispatcher):
+            try:
+                output = self._run(compiled, tau_start, tau_end, y0, jit=True)
+            except numba.core.errors.NumbaError:
+                logger.warning("numba could not compile the right-hand side, running the NumPy kernel")
+                # Remember the failure so later solves skip straight to Python
+                _COMPILED_RHS[rhs] = None
+                output = self._run(rhs, tau_start, tau_end, y0, jit=False)
+        else:
+            output = self._run(rhs, tau_start, tau_end, y0, jit=False)
+
+        ts, ys, fs, nfev, n_accepted, n_rejected, status = output
+
+        if status == 1:
+            message = f"Reached max_steps={self.config.max_steps} before τ={tau_end}"
+        elif status == -1:
+            message = "Required step size is less than spacing between numbers."
+        else:
+            message = "The solver successfully reached the end of the integration interval."
+
+        if status != 0:
+            logger.error(f"Compiled integration failed: {message}")
+            raise RuntimeError(f"Solver failed: {message}")
+
+        if tau_eval is not None:
+            tau_out = np.asarray(tau_eval, dtype=float)
+            y_out = self._hermite_interpolate(ts, ys, fs, tau_out)
+        else:
+            tau_out, y_out = ts, ys.T
+
+        return {
+            'tau': tau_out,
+            'y': y_out,
+            'success': True,
+            'message': message,
+            'nfev': int(nfev),
+            'n_accepted': int(n_accepted),
+            'n_rejected': int(n_rejected)
+        }
+
+    def _run(self, rhs: Callable, tau_start: float, tau_end: float,
+             y0: np.ndarray, jit: bool) -> Tuple:
+        method = self.config.method
+
+        if method == 'RK4':
+            kernel = _rk4_kernel if jit else getattr(_rk4_kernel, 'py_func', _rk4_kernel)
+            ts, ys, fs, nfev = kernel(rhs, tau_start, tau_end, y0, self.config.n_steps)
+            return ts, ys, fs, nfev, self.config.n_steps, 0, 0
+
+        A, B, C, E, E3, error_order = _tableau(method)
+
+        # f(t0) is evaluated once and shared with the step size heuristic, as in scipy
+        f0 = np.asarray(rhs(tau_start, y0), dtype=float)
+        extra_nfev = 1
+        first_step = self.config.first_step
+        if not first_step:
+            direction = 1.0 if tau_end >= tau_start else -1.0
+            first_step = _initial_step(rhs, tau_start, y0, f0, direction, error_order,
+                                       self.config.rtol, self.config.atol)
+            extra_nfev += 1
+
+        kernel = _embedded_rk_kernel if jit else getattr(_embedded_rk_kernel, 'py_func', _embedded_rk_kernel)
+        ts, ys, fs, nfev, n_accepted, n_rejected, status = kernel(
+            rhs, tau_start, tau_end, y0, f0, A, B, C, E, E3, error_order,
+            self.config.rtol, self.config.atol, self.config.max_step,
+            first_step, self.config.max_steps
+        )
+        return ts, ys, fs, nfev + extra_nfev, n_accepted, n_rejected, status
+
+    @staticmethod
+    def _hermite_interpolate(ts: np.ndarray, ys: np.ndarray, fs: np.ndarray,
+                             tau: np.ndarray) -> np.ndarray:
+        """Cubic Hermite interpolation between accepted steps, shape (n_vars, n_tau)"""
+        order = 1 if ts[-1] >= ts[0] else -1
+        ts_sorted, ys_sorted, fs_sorted = ts[::order], ys[::order], fs[::order]
+
+        idx = np.clip(np.searchsorted(ts_sorted, tau, side='right') - 1, 0, len(ts_sorted) - 2)
+        h = ts_sorted[idx + 1] - ts_sorted[idx]
+        s = ((tau - ts_sorted[idx]) / h)[:, np.newaxis]
+        h = h[:, np.newaxis]
+
+        h00 = 2 * s**3 - 3 * s**2 + 1
+        h10 = s**3 - 2 * s**2 + s
+        h01 = -2 * s**3 + 3 * s**2
+        h11 = s**3 - s**2
+
+        y = (h00 * ys_sorted[idx] + h10 * h * fs_sorted[idx] +
+             h01 * ys_sorted[idx + 1] + h11 * h * fs_sorted[idx + 1])
+
+        return y.T
@@ -11,14 +11,22 @@ Date: August 2025
 """
 
 import numpy as np
+import scipy.integrate
 from scipy.integrate import solve_ivp, odeint
-from scipy.optimize import fsolve
+from scipy.optimize import fsolve, brentq
+from scipy.interpolate import CubicSpline
 from typing import Callable, Dict, List, Tuple, Optional
 import logging
-from dataclasses import dataclass
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 
 logger = logging.getLogger(__name__)
 
+# Tuned solver settings per problem signature, shared by all solvers
+_AUTO_TUNE_CACHE = {}
+
 
 @dataclass
 class SolverConfig:
@@ -28,6 +36,8 @@ class SolverConfig:
     atol: float = 1e-12   # Absolute tolerance
     max_step: float = 0.01 # Maximum step size
     dense_output: bool = True  # Enable dense output
+    health_check: str = 'every'  # NaN/Inf guard: 'every', 'interval', 'step' or 'off'
+    health_check_interval: int = 10  # RHS evaluations between checks for 'interval'
     
     
 class AdaptiveStepSolver:
@@ -54,7 +64,9 @@ class AdaptiveStepSolver:
                                  system_func: Callable,
                                  tau_span: Tuple[float, float],
                                  initial_conditions: np.ndarray,
-                                 tau_eval: Optional[np.ndarray] = None) -> Dict:
+                                 tau_eval: Optional[np.ndarray] = None,
+                                 stability_monitor: Optional['StabilityMonitor'] = None,
+                                 events: Optional[List[Callable]] = None) -> Dict:
         """
         Solve the chronodynamic system with adaptive step control.
         
@@ -63,23 +75,70 @@ class AdaptiveStepSolver:
             tau_span: Integration interval (tau_start, tau_end)
             initial_conditions: Initial values y(tau_start)
             tau_eval: Specific points to evaluate solution
+            stability_monitor: Online monitor checked after every accepted
+                step; integration stops as soon as it flags an instability
+            events: Extra event functions g(τ, y) in solve_ivp form, with
+                optional `terminal` and `direction` attributes; see
+                TargetValueEvent for target-value and a >= a_target stops
             
         Returns:
-            Dictionary with solution data and statistics
+            Dictionary with solution data and statistics; 'user_events'
+            and 'user_event_states' hold the roots of `events`, and
+            'terminated_by' names the terminal event that ended the run
         """
         logger.info(f"Starting chronodynamic system integration over τ ∈ {tau_span}")
         
+        policy = self.config.health_check
+        if policy not in ('every', 'interval', 'step', 'off'):
+            raise ValueError(f"Unknown health check policy: {policy}")
+        
+        # Last accepted step, so failures can name the step that produced them
+        progress = {'step': 0, 'tau': tau_span[0], 'y': np.asarray(initial_conditions), 'nfev': 0}
+        direction = np.sign(tau_span[1] - tau_span[0])
+        
+        def unstable(tau):
+            logger.error(f"Numerical instability detected at τ={tau}")
+            raise RuntimeError(
+                f"Integration became unstable in step {progress['step'] + 1} "
+                f"(τ={progress['tau']} → {tau})"
+            )
+        
         # Enhanced solver with event detection for stability
-        def monitored_system(tau, y):
-            """System function with monitoring"""
-            dydt = system_func(tau, y)
-            
-            # Check for numerical instabilities
-            if np.any(np.isnan(dydt)) or np.any(np.isinf(dydt)):
-                logger.error(f"Numerical instability detected at τ={tau}")
-                raise RuntimeError("Integration became unstable")
+        if policy == 'every':
+            def monitored_system(tau, y):
+                """System function with monitoring"""
+                dydt = system_func(tau, y)
+                
+                # Single pass over dydt for NaN and Inf
+                if not np.isfinite(dydt).all():
+                    unstable(tau)
+                
+                return dydt
+        elif policy == 'interval':
+            interval = max(1, self.config.health_check_interval)
             
-            return dydt
+            def monitored_system(tau, y):
+                """System function checked every `interval` evaluations"""
+                dydt = system_func(tau, y)
+                
+                progress['nfev'] += 1
+                if progress['nfev'] % interval == 0 and not np.isfinite(dydt).all():
+                    unstable(tau)
+                
+                return dydt
+        else:
+            # 'step' checks each accepted state in the step tracker below
+            monitored_system = system_func
+        
+        def step_tracker(tau, y):
+            """Record every accepted step; never triggers"""
+            if policy == 'step' and not np.isfinite(y).all():
+                unstable(tau)
+            if (tau - progress['tau']) * direction > 0:
+                progress['step'] += 1
+                progress['tau'] = tau
+                progress['y'] = y
+            return 1.0
         
         # Event functions for detecting critical points
         def scale_factor_event(tau, y):
@@ -89,6 +148,27 @@ class AdaptiveStepSolver:
         scale_factor_event.terminal = True
         scale_factor_event.direction = -1
         
+        # User events follow the built-in ones, so existing 'events' indices hold
+        user_events = list(events or [])
+        events = [scale_factor_event]
+        if stability_monitor is not None:
+            stability_monitor.reset(direction)
+            events.append(stability_monitor)
+        n_internal = len(events)
+        events += user_events
+        # The internal step tracker goes last and is left out of the result
+        n_reported = len(events)
+        if policy != 'off':
+            events.append(step_tracker)
+        
+        # A crossing event never fires if its target is already met at τ0
+        reached = [event for event in user_events
+                   if getattr(event, 'terminal', False) and isinstance(event, TargetValueEvent)
+                   and event.reached(tau_span[0], initial_conditions)]
+        if reached:
+            return self._stopped_at_start(tau_span[0], initial_conditions, events[:n_reported],
+                                          n_internal, reached[0], stability_monitor)
+        
         # Solve with monitoring
         solution = solve_ivp(
             monitored_system,
@@ -99,19 +179,41 @@ class AdaptiveStepSolver:
             atol=self.config.atol,
             max_step=self.config.max_step,
             dense_output=self.config.dense_output,
-            events=[scale_factor_event],
+            events=events,
             t_eval=tau_eval
         )
         
         if not solution.success:
             logger.error(f"Integration failed: {solution.message}")
+            if policy != 'off':
+                # A non-finite RHS under 'step' or 'interval' shows up as a failed step
+                raise RuntimeError(
+                    f"Solver failed in step {progress['step'] + 1} "
+                    f"(after τ={progress['tau']}): {solution.message}"
+                )
             raise RuntimeError(f"Solver failed: {solution.message}")
         
         # Update statistics
+        accepted_steps = progress['step'] if policy != 'off' else (
+            len(solution.t) - 1 if tau_eval is None else None
+        )
+        rejected_steps = self._count_rejected_steps(solution, accepted_steps, tau_eval)
         self.integration_stats['total_steps'] = solution.nfev
+        self.integration_stats['accepted_steps'] = accepted_steps
+        self.integration_stats['rejected_steps'] = rejected_steps
         
         logger.info(f"Integration completed successfully with {solution.nfev} function evaluations")
         
+        terminated_by = self._terminating_event(solution, events)
+        if terminated_by is not None:
+            logger.info(f"Integration stopped at τ={solution.t[-1]} by {terminated_by}")
+        
+        stability = None
+        if stability_monitor is not None:
+            stability = stability_monitor.report()
+            if not stability['is_stable']:
+                logger.warning(f"Integration aborted at τ={stability['terminated_at']}: {stability['reason']}")
+        
         return {
             'tau': solution.t,
             'y': solution.y,
@@ -120,29 +222,346 @@ class AdaptiveStepSolver:
             'nfev': solution.nfev,
             'njev': solution.njev,
             'nlu': solution.nlu,
-            'events': solution.t_events,
-            'sol': solution.sol if self.config.dense_output else None
+            'events': solution.t_events[:n_reported],
+            'sol': solution.sol if self.config.dense_output else None,
+            'stability': stability,
+            'accepted_steps': accepted_steps,
+            'rejected_steps': rejected_steps,
+            'user_events': solution.t_events[n_internal:n_reported],
+            'user_event_states': solution.y_events[n_internal:n_reported],
+            'terminated_by': terminated_by
+        }
+    
+    @staticmethod
+    def _stopped_at_start(tau0: float,
+                          initial_conditions: np.ndarray,
+                          events: List[Callable],
+                          n_internal: int,
+                          stop: 'TargetValueEvent',
+                          stability_monitor: Optional['StabilityMonitor']) -> Dict:
+        """Result of a run whose terminal event already holds at τ0"""
+        logger.info(f"Integration stopped at τ={tau0} by {stop.name}: target met by the initial state")
+        
+        y0 = np.asarray(initial_conditions, dtype=float)
+        t_events = [np.array([tau0]) if event is stop else np.empty(0) for event in events]
+        y_events = [y0[np.newaxis, :] if event is stop else np.empty((0, y0.size)) for event in events]
+        
+        return {
+            'tau': np.array([tau0]),
+            'y': y0[:, np.newaxis],
+            'success': True,
+            'message': 'A termination event occurred.',
+            'nfev': 0,
+            'njev': 0,
+            'nlu': 0,
+            'events': t_events,
+            'sol': None,
+            'stability': None if stability_monitor is None else stability_monitor.report(),
+            'accepted_steps': 0,
+            'rejected_steps': 0,
+            'user_events': t_events[n_internal:],
+            'user_event_states': y_events[n_internal:],
+            'terminated_by': stop.name
+        }
+    
+    @staticmethod
+    def _terminating_event(solution, events: List[Callable]) -> Optional[str]:
+        """Name of the terminal event that stopped the integration, if any"""
+        if solution.status != 1:
+            return None
+        
+        # The run ended at the latest terminal root (solution.t may stop short under tau_eval)
+        candidates = [(t_events[-1], event) for event, t_events in zip(events, solution.t_events)
+                      if getattr(event, 'terminal', False) and len(t_events)]
+        if not candidates:
+            return None
+        
+        event = max(candidates, key=lambda c: c[0] * np.sign(solution.t[-1] - solution.t[0]))[1]
+        return getattr(event, 'name', None) or getattr(event, '__name__', type(event).__name__)
+    
+    def _count_rejected_steps(self,
+                              solution,
+                              accepted_steps: Optional[int],
+                              tau_eval: Optional[np.ndarray]) -> Optional[int]:
+        """
+        Rejected steps of an explicit Runge-Kutta run, recovered from nfev.
+        
+        Every step attempt costs n_stages evaluations on top of the two
+        made at start-up (f(τ0) and the initial step selection). DOP853
+        spends 3 more per dense-output polynomial, which is only built on
+        every step when dense output is on, or never when there is no
+        tau_eval and no event fired. Other cases return None.
+        """
+        method_cls = getattr(scipy.integrate, self.config.method, None)
+        n_stages = getattr(method_cls, 'n_stages', None)
+        if accepted_steps is None or n_stages is None:
+            return None
+        
+        dense_nfev = 0
+        extra = len(getattr(method_cls, 'A_EXTRA', ()))
+        if extra:
+            if self.config.dense_output:
+                dense_nfev = extra * accepted_steps
+            elif tau_eval is not None or any(len(t) for t in solution.t_events):
+                return None
+        
+        attempts = (solution.nfev - 2 - dense_nfev) // n_stages
+        return max(attempts - accepted_steps, 0)
+    
+    def solve_sensitivities(self,
+                            system_func: Callable,
+                            tau_span: Tuple[float, float],
+                            initial_conditions: np.ndarray,
+                            parameters: np.ndarray,
+                            jacobian: Optional[Callable] = None,
+                            parameter_jacobian: Optional[Callable] = None,
+                            initial_sensitivities: Optional[np.ndarray] = None,
+                            tau_eval: Optional[np.ndarray] = None,
+                            events: Optional[List[Callable]] = None,
+                            fd_step: float = 1e-7) -> Dict:
+        """
+        Solve dy/dτ = f(τ, y, θ) together with the forward sensitivities.
+        
+        The sensitivities S = dy/dθ obey the tangent equations
+        dS/dτ = (∂f/∂y) S + ∂f/∂θ and are integrated alongside y, with
+        the same steps and the same error control. With both Jacobians
+        given they are exact; otherwise each column J_y S_j + ∂f/∂θ_j is
+        a single directional difference of f, one extra evaluation per
+        parameter instead of a full re-integration.
+        
+        Args:
+            system_func: Function defining dy/dτ = f(τ, y, θ)
+            tau_span: Integration interval (tau_start, tau_end)
+            initial_conditions: Initial values y(tau_start)
+            parameters: Parameter vector θ (e.g. values of CosmologicalParams fields)
+            jacobian: ∂f/∂y(τ, y, θ) as an (n, n) array; give both
+                Jacobians or neither
+            parameter_jacobian: ∂f/∂θ(τ, y, θ) as an (n, m) array
+            initial_sensitivities: dy(tau_start)/dθ as an (n, m) array,
+                zero when the initial values do not depend on θ
+            tau_eval: Specific points to evaluate solution
+            events: Extra event functions, evaluated on the augmented state
+                (y comes first, so indices into y are unchanged)
+            fd_step: Relative step of the directional differences, scaled
+                down by ‖S_j‖ so the state perturbation stays small
+            
+        Returns:
+            Dictionary of solve_chronodynamic_system for y, with
+            'sensitivities' of shape (n, m, n_tau); 'sol' interpolates
+            the augmented state [y, S.ravel()]
+        """
+        theta = np.asarray(parameters, dtype=float)
+        y0 = np.asarray(initial_conditions, dtype=float)
+        n, m = len(y0), len(theta)
+        
+        S0 = np.zeros((n, m)) if initial_sensitivities is None else np.asarray(initial_sensitivities, dtype=float)
+        if S0.shape != (n, m):
+            raise ValueError(f"Initial sensitivities must have shape {(n, m)}, got {S0.shape}")
+        
+        if (jacobian is None) != (parameter_jacobian is None):
+            raise ValueError("Give both jacobian and parameter_jacobian, or neither")
+        exact = jacobian is not None
+        
+        def augmented_system(tau, z):
+            y = z[:n]
+            S = z[n:].reshape(n, m)
+            f = np.asarray(system_func(tau, y, theta), dtype=float)
+            
+            if exact:
+                dS = jacobian(tau, y, theta) @ S + parameter_jacobian(tau, y, theta)
+            else:
+                dS = np.empty((n, m))
+                for j in range(m):
+                    # Perturb y along S_j and θ_j together: one evaluation per column
+                    h = fd_step * max(abs(theta[j]), 1.0) / max(np.linalg.norm(S[:, j]), 1.0)
+                    theta_j = theta.copy()
+                    theta_j[j] += h
+                    f_j = np.asarray(system_func(tau, y + h * S[:, j], theta_j), dtype=float)
+                    dS[:, j] = (f_j - f) / h
+            
+            return np.concatenate([f, dS.ravel()])
+        
+        logger.info(f"Integrating {n} states with sensitivities to {m} parameters"
+                    f" ({'exact' if exact else 'finite-difference'} tangent equations)")
+        
+        result = self.solve_chronodynamic_system(
+            augmented_system, tau_span, np.concatenate([y0, S0.ravel()]),
+            tau_eval=tau_eval, events=events
+        )
+        
+        z = result['y']
+        result['y'] = z[:n]
+        result['sensitivities'] = z[n:].reshape(n, m, -1)
+        
+        return result
+    
+    def auto_tune(self,
+                  system_func: Callable,
+                  tau_span: Tuple[float, float],
+                  initial_conditions: np.ndarray,
+                  target_accuracy: float = 1e-8,
+                  problem_key=None,
+                  apply: bool = True,
+                  pilot_tolerances: Tuple[float, float, float] = (1e-3, 1e-4, 1e-5),
+                  n_compare: int = 64) -> Dict:
+        """
+        Choose rtol, atol and max_step for a global accuracy target.
+        
+        Three cheap pilot integrations at loose tolerances estimate how
+        the global error scales with the tolerance (err ≈ C·tol^q). The
+        tolerance meeting target_accuracy follows from that law, and
+        max_step is set from the pilot step sizes rescaled to the new
+        tolerance, so it no longer forces needlessly small steps.
+        Results are cached per problem signature.
+        
+        Args:
+            system_func: Function defining dy/dτ = f(τ, y)
+            tau_span: Integration interval (tau_start, tau_end)
+            initial_conditions: Initial values y(tau_start)
+            target_accuracy: Desired maximum relative global error
+            problem_key: Cache key; defaults to the function itself (bound
+                methods include their instance), span, initial conditions,
+                target and method. Required for unhashable callables
+            apply: Replace self.config with the tuned configuration
+            pilot_tolerances: Decreasing pilot rtol values
+            n_compare: Number of points where pilot runs are compared
+            
+        Returns:
+            Tuned settings and the pilot error model
+        """
+        if problem_key is None:
+            # Identity, not the name: lambdas and methods of different instances share names
+            try:
+                hash(system_func)
+            except TypeError:
+                raise ValueError("auto_tune needs an explicit problem_key for unhashable system functions")
+            problem_key = (
+                system_func,
+                tuple(tau_span),
+                tuple(np.asarray(initial_conditions, dtype=float).tolist()),
+                target_accuracy,
+                self.config.method
+            )
+        
+        if problem_key in _AUTO_TUNE_CACHE:
+            report = dict(_AUTO_TUNE_CACHE[problem_key], cached=True)
+        else:
+            report = self._pilot_tuning(system_func, tau_span, initial_conditions,
+                                        target_accuracy, pilot_tolerances, n_compare)
+            _AUTO_TUNE_CACHE[problem_key] = report
+            report = dict(report, cached=False)
+        
+        logger.info(
+            f"Auto-tuned solver for target {target_accuracy:.1e}: rtol={report['rtol']:.2e}, "
+            f"atol={report['atol']:.2e}, max_step={report['max_step']:.3g} "
+            f"(estimated error {report['estimated_error']:.2e}, order q={report['tolerance_order']:.2f})"
+        )
+        
+        tuned = replace(self.config, rtol=report['rtol'], atol=report['atol'],
+                        max_step=report['max_step'])
+        if apply:
+            self.config = tuned
+        
+        return dict(report, config=tuned)
+    
+    def _pilot_tuning(self,
+                      system_func: Callable,
+                      tau_span: Tuple[float, float],
+                      initial_conditions: np.ndarray,
+                      target_accuracy: float,
+                      pilot_tolerances: Tuple[float, float, float],
+                      n_compare: int) -> Dict:
+        """Run the pilot integrations and fit the tolerance-error law"""
+        tau_compare = np.linspace(tau_span[0], tau_span[1], n_compare)
+        
+        pilots = []
+        for tol in pilot_tolerances:
+            solution = solve_ivp(system_func, tau_span, initial_conditions,
+                                 method=self.config.method, rtol=tol, atol=tol * 1e-3,
+                                 dense_output=True)
+            if not solution.success:
+                raise RuntimeError(f"Pilot integration failed at rtol={tol}: {solution.message}")
+            pilots.append(solution)
+        
+        values = [p.sol(tau_compare) for p in pilots]
+        y_scale = np.max(np.abs(values[-1]))
+        floor = 1e-3 * y_scale if y_scale > 0 else 1.0
+        
+        def rel_diff(u, v):
+            return np.max(np.abs(u - v) / (np.abs(v) + floor))
+        
+        d12 = rel_diff(values[0], values[1])
+        d23 = rel_diff(values[1], values[2])
+        tol2, tol3 = pilot_tolerances[1], pilot_tolerances[2]
+        ratio = tol2 / tol3
+        
+        if d23 <= 1e-15 or d12 <= d23:
+            # Already exact (or no measurable trend): no error law to extrapolate,
+            # so never run looser than the target itself
+            q = 1.0
+            err3 = d23
+            rtol = min(tol3, target_accuracy)
+            logger.warning(
+                f"Pilot errors show no convergence trend (d12={d12:.2e}, d23={d23:.2e}); "
+                f"using rtol={rtol:.2e}"
+            )
+        else:
+            q = np.log(d12 / d23) / np.log(ratio)
+            # d23 = C(tol2^q - tol3^q) = err3 (ratio^q - 1)
+            err3 = d23 / (ratio**q - 1.0)
+            rtol = tol3 * (target_accuracy / err3)**(1.0 / q)
+        
+        rtol = float(np.clip(rtol, 1e-13, pilot_tolerances[0]))
+        atol = float(rtol * floor)
+        
+        # Step size scales like tol^(1/(order+1)); allow headroom over the largest pilot step
+        error_order = getattr(getattr(scipy.integrate, self.config.method, None),
+                              'error_estimator_order', 4)
+        pilot_steps = np.abs(np.diff(pilots[-1].t))
+        max_step = float(2.0 * np.max(pilot_steps) * (rtol / tol3)**(1.0 / (error_order + 1)))
+        
+        return {
+            'rtol': rtol,
+            'atol': atol,
+            'max_step': max_step,
+            'estimated_error': float(err3 * (rtol / tol3)**q),
+            'tolerance_order': float(q),
+            'pilot_errors': [float(d12), float(d23)],
+            'pilot_nfev': int(sum(p.nfev for p in pilots))
         }
     
     def solve_constraint_equations(self, 
                                  constraint_func: Callable,
                                  initial_guess: np.ndarray,
-                                 tau: float) -> Dict:
+                                 tau: float,
+                                 jacobian: Optional[Callable] = None) -> Dict:
         """
         Solve constraint equations at a given time τ.
         
         Used for enforcing Hamiltonian and momentum constraints
         in the chronodynamic system.
+        
+        Args:
+            constraint_func: Function (τ, variables) -> residuals
+            initial_guess: Starting point for the root finder
+            tau: Conformal time
+            jacobian: Optional analytic Jacobian (τ, variables) -> (n, n)
         """
         def constraint_system(variables):
             """Constraint equations to be solved"""
             constraints = constraint_func(tau, variables)
             return constraints
         
+        fprime = None
+        if jacobian is not None:
+            def fprime(variables):
+                return jacobian(tau, variables)
+        
         # Solve constraints
         solution = fsolve(
             constraint_system,
             initial_guess,
+            fprime=fprime,
             xtol=1e-12,
             full_output=True
         )
@@ -159,15 +578,241 @@ class AdaptiveStepSolver:
             'message': message,
             'function_calls': info['nfev']
         }
+    
+    def solve_constraint_sequence(self,
+                                  constraint_func: Callable,
+                                  initial_guess: np.ndarray,
+                                  tau_array: np.ndarray,
+                                  jacobian: Optional[Callable] = None,
+                                  vectorized: bool = False,
+                                  batch_size: int = 64,
+                                  xtol: float = 1e-12,
+                                  ftol: float = 1e-10,
+                                  max_iter: int = 50) -> Dict:
+        """
+        Solve constraint equations along a whole τ sequence by continuation.
+        
+        Every solve is seeded from the last converged solutions, linearly
+        extrapolated in τ, so each point starts close to its root; failed
+        points are never used as seeds, and initial_guess is used until
+        a point converges.
+        
+        With vectorized=True, constraint_func(tau, variables) must accept
+        tau of shape (b,) and variables of shape (n, b) and return (n, b);
+        jacobian, if given, must return (b, n, n). Blocks of batch_size
+        points are then solved together with a batched Newton iteration,
+        one function call per block and iteration. Otherwise each τ is
+        solved with fsolve.
+        
+        Args:
+            constraint_func: Constraint residual function
+            initial_guess: Starting point for the first τ
+            tau_array: Monotonic sequence of conformal times
+            jacobian: Optional analytic Jacobian
+            vectorized: Whether constraint_func and jacobian are batched
+            batch_size: Number of τ values per batched Newton block
+            xtol: Relative tolerance on the Newton update
+            ftol: Tolerance on the residual norm, required as well as xtol
+            max_iter: Maximum Newton iterations per block
+            
+        Returns:
+            Per-τ variables, residuals, convergence flags and call counts
+        """
+        tau_array = np.asarray(tau_array, dtype=float)
+        n_tau = len(tau_array)
+        n_vars = len(initial_guess)
+        
+        variables = np.zeros((n_tau, n_vars))
+        residual = np.zeros((n_tau, n_vars))
+        converged = np.zeros(n_tau, dtype=bool)
+        function_calls = np.zeros(n_tau, dtype=int)
+        
+        if vectorized:
+            for start in range(0, n_tau, batch_size):
+                block = slice(start, min(start + batch_size, n_tau))
+                guess = self._continuation_guess(tau_array, variables, converged[:block.start],
+                                                 tau_array[block], initial_guess)
+                (variables[block], residual[block],
+                 converged[block], function_calls[block]) = self._batched_newton(
+                    constraint_func, jacobian, tau_array[block], guess, xtol, ftol, max_iter
+                )
+        else:
+            for i, tau in enumerate(tau_array):
+                guess = self._continuation_guess(tau_array, variables, converged[:i],
+                                                 tau_array[i:i+1], initial_guess)[0]
+                result = self.solve_constraint_equations(constraint_func, guess, tau, jacobian)
+                variables[i] = result['variables']
+                residual[i] = result['residual']
+                converged[i] = result['converged']
+                function_calls[i] = result['function_calls']
+        
+        if not np.all(converged):
+            logger.warning(f"Constraint continuation failed at {np.sum(~converged)}/{n_tau} points")
+        
+        return {
+            'tau': tau_array,
+            'variables': variables,
+            'residual': residual,
+            'converged': converged,
+            'function_calls': function_calls,
+            'n_converged': int(np.sum(converged)),
+            'total_function_calls': int(np.sum(function_calls))
+        }
+    
+    @staticmethod
+    def _continuation_guess(tau_array: np.ndarray,
+                            solved: np.ndarray,
+                            converged: np.ndarray,
+                            tau_targets: np.ndarray,
+                            initial_guess: np.ndarray) -> np.ndarray:
+        """
+        Linear extrapolation from the last two converged points among the
+        first len(converged) (the last one if only one, initial_guess if none)
+        """
+        seeds = np.flatnonzero(converged & np.all(np.isfinite(solved[:len(converged)]), axis=1))
+        if len(seeds) == 0:
+            return np.tile(initial_guess, (len(tau_targets), 1))
+        
+        x_prev = solved[seeds[-1]]
+        if len(seeds) == 1:
+            return np.tile(x_prev, (len(tau_targets), 1))
+        
+        tau_prev, tau_prev2 = tau_array[seeds[-1]], tau_array[seeds[-2]]
+        slope = (x_prev - solved[seeds[-2]]) / (tau_prev - tau_prev2)
+        
+        return x_prev + np.outer(tau_targets - tau_prev, slope)
+    
+    @staticmethod
+    def _batched_newton(constraint_func: Callable,
+                        jacobian: Optional[Callable],
+                        tau: np.ndarray,
+                        guess: np.ndarray,
+                        xtol: float,
+                        ftol: float,
+                        max_iter: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Newton iteration on a block of independent constraint systems.
+        
+        Jacobians are analytic when provided, otherwise forward
+        differences with one batched call per variable. A member stops
+        once its update is below xtol and has converged only if its
+        residual norm is below ftol as well; singular members take
+        pseudo-inverse steps, which can stall short of a root.
+        """
+        x = guess.copy()
+        n_batch, n_vars = x.shape
+        active = np.ones(n_batch, dtype=bool)
+        converged = np.zeros(n_batch, dtype=bool)
+        calls = np.zeros(n_batch, dtype=int)
+        
+        def evaluate(tau_active, x_active):
+            return np.asarray(constraint_func(tau_active, x_active.T)).T
+        
+        F = evaluate(tau, x)
+        calls += 1
+        
+        for _ in range(max_iter):
+            if not np.any(active):
+                break
+            
+            tau_a, x_a, F_a = tau[active], x[active], F[active]
+            
+            if jacobian is not None:
+                J = np.asarray(jacobian(tau_a, x_a.T))
+            else:
+                J = np.empty((len(x_a), n_vars, n_vars))
+                for j in range(n_vars):
+                    h = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(x_a[:, j]), 1.0)
+                    x_step = x_a.copy()
+                    x_step[:, j] += h
+                    J[:, :, j] = (evaluate(tau_a, x_step) - F_a) / h[:, np.newaxis]
+                calls[active] += n_vars
+            
+            try:
+                dx = np.linalg.solve(J, -F_a[..., np.newaxis])[..., 0]
+            except np.linalg.LinAlgError:
+                dx = np.empty_like(x_a)
+                for b in range(len(x_a)):
+                    try:
+                        dx[b] = np.linalg.solve(J[b], -F_a[b])
+                    except np.linalg.LinAlgError:
+                        dx[b] = -np.linalg.pinv(J[b]) @ F_a[b]
+            
+            x_a = x_a + dx
+            x[active] = x_a
+            F[active] = evaluate(tau_a, x_a)
+            calls[active] += 1
+            
+            step_small = (np.linalg.norm(dx, axis=1)
+                          <= xtol * (np.linalg.norm(x_a, axis=1) + xtol))
+            residual_small = np.linalg.norm(F[active], axis=1) <= ftol
+            members = np.flatnonzero(active)
+            converged[members[step_small & residual_small]] = True
+            active[members[step_small]] = False
+        
+        converged &= np.all(np.isfinite(x), axis=1)
+        
+        return x, F, converged, calls
+
+
+class TargetValueEvent:
+    """
+    Stopping event for solve_chronodynamic_system.
+    
+    Fires when y[index] reaches target, e.g. a(τ) reaching the scale
+    factor of the highest-redshift data point, so callers integrate
+    exactly as far as needed. Crossing direction follows solve_ivp:
+    +1 only while increasing, -1 only while decreasing, 0 either way.
+    """
+    
+    def __init__(self,
+                 target: float,
+                 index: int = 0,
+                 direction: float = 0,
+                 terminal: bool = True,
+                 name: Optional[str] = None):
+        self.target = target
+        self.index = index
+        self.direction = direction
+        self.terminal = terminal
+        self.name = name or f"y[{index}] = {target:g}"
+    
+    def __call__(self, tau: float, y: np.ndarray) -> float:
+        return y[self.index] - self.target
+    
+    def reached(self, tau: float, y: np.ndarray) -> bool:
+        """Whether the target already holds at (τ, y) on the side the crossing leads to"""
+        g = self(tau, y)
+        if self.direction > 0:
+            return g >= 0
+        if self.direction < 0:
+            return g <= 0
+        return g == 0
+    
+    @classmethod
+    def scale_factor(cls, a_target: float, index: int = 0) -> 'TargetValueEvent':
+        """Stop once the scale factor grows to a >= a_target"""
+        return cls(a_target, index=index, direction=1, name=f"a >= {a_target:g}")
+    
+    @classmethod
+    def redshift(cls, z_target: float, index: int = 0) -> 'TargetValueEvent':
+        """Stop once the scale factor reaches redshift z_target, a = 1/(1 + z)"""
+        return cls(1.0 / (1.0 + z_target), index=index, direction=1, name=f"z <= {z_target:g}")
 
 
 class StabilityAnalyzer:
     """
     Analyzes numerical stability of chronodynamic solutions.
+    
+    Growth rates and dominant frequencies are computed for all variables
+    (and all ensemble members) at once, with one batched least-squares
+    fit and one rFFT per call.
     """
     
-    def __init__(self):
+    def __init__(self, growth_threshold: float = 10.0, frequency_threshold: float = 1000.0):
         self.stability_metrics = {}
+        self.growth_threshold = growth_threshold
+        self.frequency_threshold = frequency_threshold
     
     def analyze_solution_stability(self, 
                                  tau: np.ndarray, 
@@ -182,74 +827,265 @@ class StabilityAnalyzer:
         Returns:
             Stability metrics and diagnostics
         """
-        n_vars = solution.shape[0]
-        stability_report = {
-            'is_stable': True,
-            'growth_rates': [],
-            'oscillation_detection': [],
+        ensemble = self.analyze_ensemble_stability(tau, solution[np.newaxis])
+        
+        for i in np.flatnonzero(ensemble['unstable_growth'][0]):
+            logger.warning(f"Variable {i} shows exponential growth: λ={ensemble['growth_rates'][0, i]}")
+        for i in np.flatnonzero(ensemble['unstable_oscillation'][0]):
+            logger.warning(f"Variable {i} shows high-frequency oscillations")
+        
+        return {
+            'is_stable': bool(ensemble['is_stable'][0]),
+            'growth_rates': ensemble['growth_rates'][0].tolist(),
+            'oscillation_detection': ensemble['dominant_frequencies'][0].tolist(),
             'conservation_violations': []
         }
+    
+    def analyze_ensemble_stability(self,
+                                   tau: np.ndarray,
+                                   solutions: np.ndarray) -> Dict:
+        """
+        Analyze the stability of an ensemble of trajectories.
         
-        for i in range(n_vars):
-            var_data = solution[i]
-            
-            # Check for exponential growth
-            growth_rate = self._compute_growth_rate(tau, var_data)
-            stability_report['growth_rates'].append(growth_rate)
-            
-            if growth_rate > 10.0:  # Threshold for instability
-                stability_report['is_stable'] = False
-                logger.warning(f"Variable {i} shows exponential growth: λ={growth_rate}")
-            
-            # Check for high-frequency oscillations
-            oscillation_freq = self._detect_oscillations(tau, var_data)
-            stability_report['oscillation_detection'].append(oscillation_freq)
+        Args:
+            tau: Time array shared by all members, possibly non-uniform
+            solutions: Array of shape (n_members, n_vars, n_tau)
             
-            if oscillation_freq > 1000:  # High frequency threshold
-                stability_report['is_stable'] = False
-                logger.warning(f"Variable {i} shows high-frequency oscillations")
+        Returns:
+            Per-member stability flags and (n_members, n_vars) metrics
+        """
+        tau = np.asarray(tau, dtype=float)
+        solutions = np.asarray(solutions, dtype=float)
         
-        return stability_report
+        growth_rates = self._batched_growth_rates(tau, solutions)
+        frequencies = self._batched_dominant_frequencies(tau, solutions)
+        
+        unstable_growth = growth_rates > self.growth_threshold
+        unstable_oscillation = frequencies > self.frequency_threshold
+        
+        return {
+            'is_stable': ~np.any(unstable_growth | unstable_oscillation, axis=1),
+            'growth_rates': growth_rates,
+            'dominant_frequencies': frequencies,
+            'unstable_growth': unstable_growth,
+            'unstable_oscillation': unstable_oscillation
+        }
     
     def _compute_growth_rate(self, tau: np.ndarray, variable: np.ndarray) -> float:
         """Compute exponential growth rate of a variable"""
-        if len(variable) < 10:
-            return 0.0
+        return self._batched_growth_rates(tau, variable[np.newaxis, np.newaxis])[0, 0]
+    
+    def _detect_oscillations(self, tau: np.ndarray, variable: np.ndarray) -> float:
+        """Detect high-frequency oscillations using FFT"""
+        return self._batched_dominant_frequencies(tau, variable[np.newaxis, np.newaxis])[0, 0]
+    
+    @staticmethod
+    def _batched_growth_rates(tau: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+        """
+        Least-squares slope of log|var| against τ for every series.
+        
+        Fit exponential growth: var(t) ≈ var₀ * exp(λt), using the
+        closed-form slope Σ(t - t̄)(log|var| - mean) / Σ(t - t̄)².
+        """
+        if tau.shape[-1] < 10:
+            return np.zeros(solutions.shape[:-1])
         
-        # Fit exponential growth: var(t) ≈ var₀ * exp(λt)
-        log_var = np.log(np.abs(variable) + 1e-16)  # Avoid log(0)
+        log_var = np.log(np.abs(solutions) + 1e-16)  # Avoid log(0)
         
-        # Linear fit to log(var) vs τ
-        coeffs = np.polyfit(tau, log_var, 1)
-        growth_rate = coeffs[0]  # Slope = growth rate
+        t_centered = tau - tau.mean()
+        log_centered = log_var - log_var.mean(axis=-1, keepdims=True)
         
-        return growth_rate
+        return log_centered @ t_centered / np.dot(t_centered, t_centered)
     
-    def _detect_oscillations(self, tau: np.ndarray, variable: np.ndarray) -> float:
-        """Detect high-frequency oscillations using FFT"""
-        if len(variable) < 20:
-            return 0.0
+    @staticmethod
+    def _batched_dominant_frequencies(tau: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+        """
+        Dominant non-zero frequency of every series from one rFFT.
+        
+        Non-uniform τ grids are first resampled linearly onto a uniform
+        grid with the same number of points and end points.
+        """
+        n = tau.shape[-1]
+        if n < 20:
+            return np.zeros(solutions.shape[:-1])
+        
+        steps = np.diff(tau)
+        if not np.allclose(steps, steps[0], rtol=1e-6, atol=0):
+            tau_uniform = np.linspace(tau[0], tau[-1], n)
+            idx = np.clip(np.searchsorted(tau, tau_uniform, side='right'), 1, n - 1)
+            weight = (tau_uniform - tau[idx - 1]) / (tau[idx] - tau[idx - 1])
+            solutions = solutions[..., idx - 1] * (1 - weight) + solutions[..., idx] * weight
         
-        # Compute power spectral density
-        dt = np.mean(np.diff(tau))
-        freqs = np.fft.fftfreq(len(variable), dt)
-        fft_var = np.fft.fft(variable)
-        power = np.abs(fft_var)**2
+        dt = (tau[-1] - tau[0]) / (n - 1)
+        freqs = np.fft.rfftfreq(n, dt)
+        power = np.abs(np.fft.rfft(solutions, axis=-1))**2
         
-        # Find dominant frequency
-        dominant_freq_idx = np.argmax(power[1:len(power)//2]) + 1
-        dominant_freq = np.abs(freqs[dominant_freq_idx])
+        # Skip the zero frequency and, for even n, the Nyquist bin
+        dominant_freq_idx = np.argmax(power[..., 1:n//2], axis=-1) + 1
         
-        return dominant_freq
+        return freqs[dominant_freq_idx]
+
+
+class StabilityMonitor:
+    """
+    Online stability monitor with early termination.
+    
+    Plugs into solve_ivp as a terminal event, so it sees every accepted
+    step. Keeps a rolling least-squares estimate of the exponential growth
+    rate of the state norm over the last `window` steps (individual
+    variables crossing zero would fake huge rates) and periodically runs
+    a spectral oscillation check on the same window. Thresholds match those of
+    StabilityAnalyzer.
+    """
+    
+    terminal = True
+    direction = -1
+    
+    def __init__(self,
+                 window: int = 64,
+                 growth_threshold: float = 10.0,
+                 frequency_threshold: float = 1000.0,
+                 spectral_every: int = 8):
+        self.window = window
+        self.growth_threshold = growth_threshold
+        self.frequency_threshold = frequency_threshold
+        self.spectral_every = spectral_every
+        self.reset()
+    
+    def reset(self, integration_direction: float = 1.0):
+        """Clear all monitoring state before a new integration in the given τ direction"""
+        self._sign = -1.0 if integration_direction < 0 else 1.0
+        self._tau = deque()
+        self._y = deque()
+        self._log_y = deque()
+        self._tau0 = None
+        self._last_tau = None
+        self._sums = np.zeros(4)  # Running Σt, Σt², Σlog|y|, Σt·log|y|
+        self.n_steps = 0
+        self.growth_rate = None
+        self.dominant_frequencies = None
+        self.tripped_tau = None
+        self.reason = None
+    
+    def __call__(self, tau: float, y: np.ndarray) -> float:
+        """Event function: positive while stable, negative once tripped"""
+        if self.tripped_tau is not None:
+            return -1.0 if (tau - self.tripped_tau) * self._sign >= 0 else 1.0
+        
+        # Root refinement re-evaluates earlier times; only new steps count
+        if self._last_tau is not None and (tau - self._last_tau) * self._sign <= 0:
+            return 1.0
+        
+        return 1.0 if self.update(tau, y) else -1.0
+    
+    def update(self, tau: float, y: np.ndarray) -> bool:
+        """
+        Add one accepted step and check the thresholds.
+        
+        Returns:
+            False as soon as an instability is detected
+        """
+        y = np.asarray(y, dtype=float)
+        self.n_steps += 1
+        
+        if not np.all(np.isfinite(y)):
+            return self._trip(tau, "non-finite state")
+        
+        if self._tau0 is None:
+            self._tau0 = tau
+        self._last_tau = tau
+        
+        # Elapsed integration time, so backward runs grow along increasing t
+        t = (tau - self._tau0) * self._sign
+        log_y = np.log(np.linalg.norm(y) + 1e-16)  # Avoid log(0)
+        self._push(t, y, log_y)
+        
+        n = len(self._tau)
+        if n >= min(10, self.window):
+            sum_t, sum_tt, sum_ly, sum_tly = self._sums
+            denom = n * sum_tt - sum_t**2
+            if denom > 0:
+                self.growth_rate = (n * sum_tly - sum_t * sum_ly) / denom
+                if self.growth_rate > self.growth_threshold:
+                    return self._trip(tau, f"growth rate λ={self.growth_rate:.3g}")
+        
+        if n >= 20 and self.n_steps % self.spectral_every == 0:
+            self.dominant_frequencies = self._window_frequencies()
+            worst = np.argmax(self.dominant_frequencies)
+            if self.dominant_frequencies[worst] > self.frequency_threshold:
+                return self._trip(
+                    tau, f"variable {worst} oscillates at f={self.dominant_frequencies[worst]:.3g}"
+                )
+        
+        return True
+    
+    def report(self) -> Dict:
+        """Summary in the style of StabilityAnalyzer reports"""
+        return {
+            'is_stable': self.tripped_tau is None,
+            'terminated_at': self.tripped_tau,
+            'reason': self.reason,
+            'growth_rate': self.growth_rate,
+            'dominant_frequencies': (None if self.dominant_frequencies is None
+                                     else self.dominant_frequencies.tolist()),
+            'steps_monitored': self.n_steps
+        }
+    
+    def _push(self, t: float, y: np.ndarray, log_y: float):
+        self._tau.append(t)
+        self._y.append(y)
+        self._log_y.append(log_y)
+        self._sums += (t, t * t, log_y, t * log_y)
+        
+        if len(self._tau) > self.window:
+            t_old = self._tau.popleft()
+            self._y.popleft()
+            ly_old = self._log_y.popleft()
+            self._sums -= (t_old, t_old * t_old, ly_old, t_old * ly_old)
+    
+    def _window_frequencies(self) -> np.ndarray:
+        """Dominant frequency of every variable over the current window"""
+        tau = np.array(self._tau)
+        values = np.array(self._y)
+        n = len(tau)
+        
+        # Accepted steps are non-uniform: resample before the rFFT
+        tau_uniform = np.linspace(tau[0], tau[-1], n)
+        resampled = np.column_stack([
+            np.interp(tau_uniform, tau, values[:, i]) for i in range(values.shape[1])
+        ])
+        resampled -= resampled.mean(axis=0)
+        
+        power = np.abs(np.fft.rfft(resampled, axis=0))**2
+        freqs = np.fft.rfftfreq(n, tau_uniform[1] - tau_uniform[0])
+        
+        dominant = freqs[np.argmax(power[1:], axis=0) + 1]
+        dominant[power[1:].max(axis=0) <= 1e-30] = 0.0  # Flat variables
+        
+        return dominant
+    
+    def _trip(self, tau: float, reason: str) -> bool:
+        self.tripped_tau = tau
+        self.reason = reason
+        return False
 
 
 class ConvergenceAnalyzer:
     """
     Analyzes numerical convergence of chronodynamic simulations.
+    
+    Resolution ladders are cached by resolution, so repeated studies
+    reuse earlier runs. They run serially by default: starting a process
+    pool costs more than the solves of a small ladder, so pass
+    max_workers (None: one per CPU) for expensive solver functions. Errors
+    are measured against a Richardson-extrapolated reference built from
+    the three finest resolutions.
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = 1):
         self.convergence_history = []
+        self.max_workers = max_workers  # 1: serial, None: one worker per CPU
+        self._solution_cache = {}
     
     def test_spatial_convergence(self, 
                                 solver_func: Callable,
@@ -261,48 +1097,41 @@ class ConvergenceAnalyzer:
         Args:
             solver_func: Function that runs simulation for given grid size
             grid_sizes: List of grid sizes to test [N₁, N₂, N₃, ...]
-            reference_solution: High-resolution reference solution
+            reference_solution: High-resolution reference solution on the
+                finest grid; defaults to the Richardson extrapolation
             
         Returns:
-            Convergence analysis results
+            Convergence analysis results; 'errors' holds the largest
+            difference between consecutive grids, keyed 'N1→N2', and
+            'reference_errors' each grid's error against the reference
         """
-        solutions = {}
-        errors = {}
-        
         logger.info("Starting spatial convergence analysis")
         
-        for N in grid_sizes:
-            logger.info(f"Computing solution for grid size N={N}")
-            solutions[N] = solver_func(N)
-        
-        # Compute convergence rates
-        convergence_rates = {}
+        grid_sizes = sorted(grid_sizes)  # Coarse to fine
+        solutions = self._run_resolution_ladder(solver_func, grid_sizes)
         
-        for i in range(len(grid_sizes) - 1):
-            N1, N2 = grid_sizes[i], grid_sizes[i+1]
-            sol1, sol2 = solutions[N1], solutions[N2]
-            
-            # Interpolate coarser solution to finer grid
-            sol1_interp = self._interpolate_solution(sol1, sol2['tau'])
-            
-            # Compute error
-            error = np.abs(sol2['y'] - sol1_interp)
-            max_error = np.max(error)
-            
-            # Estimate convergence rate: error ∝ h^p where h = 1/N
-            h1, h2 = 1.0/N1, 1.0/N2
-            if max_error > 1e-16:  # Avoid numerical noise
-                p = np.log(max_error / np.max(np.abs(sol1['y'] - sol1_interp))) / np.log(h2/h1)
-                convergence_rates[f'{N1}→{N2}'] = p
-            
-            errors[f'{N1}→{N2}'] = max_error
+        # Effective spacing h = 1/N
+        analysis = self._analyze_ladder(
+            solutions, grid_sizes, [1.0 / N for N in grid_sizes], reference_solution
+        )
         
-        return {
+        convergence_rates = analysis['convergence_rates']
+        result = {
             'solutions': solutions,
-            'errors': errors,
+            'errors': analysis['level_differences'],
+            'reference_errors': analysis['errors'],
             'convergence_rates': convergence_rates,
+            'observed_order': analysis['observed_order'],
+            'richardson_reference': analysis['reference'],
             'is_converged': all(p > 1.5 for p in convergence_rates.values())
         }
+        self.convergence_history.append({
+            'type': 'spatial',
+            'resolutions': grid_sizes,
+            'observed_order': analysis['observed_order']
+        })
+        
+        return result
     
     def test_temporal_convergence(self,
                                 solver_func: Callable,
@@ -317,54 +1146,189 @@ class ConvergenceAnalyzer:
         Returns:
             Temporal convergence analysis
         """
-        solutions = {}
-        errors = {}
-        
-        for dt in dt_values:
-            logger.info(f"Computing solution for dt={dt}")
-            solutions[dt] = solver_func(dt)
+        dt_values = sorted(dt_values, reverse=True)  # Coarse to fine
+        solutions = self._run_resolution_ladder(solver_func, dt_values)
         
-        # Use finest resolution as reference
-        dt_ref = min(dt_values)
-        ref_solution = solutions[dt_ref]
+        analysis = self._analyze_ladder(solutions, dt_values, dt_values)
         
-        for dt in dt_values[:-1]:  # Exclude reference
-            sol = solutions[dt]
-            
-            # Interpolate to reference time grid
-            sol_interp = self._interpolate_solution(sol, ref_solution['tau'])
-            
-            # Compute temporal error
-            error = np.abs(ref_solution['y'] - sol_interp)
-            errors[dt] = np.max(error)
+        self.convergence_history.append({
+            'type': 'temporal',
+            'resolutions': dt_values,
+            'observed_order': analysis['observed_order']
+        })
         
         return {
             'solutions': solutions,
+            'errors': analysis['errors'],
+            'convergence_rates': analysis['convergence_rates'],
+            'observed_order': analysis['observed_order'],
+            'richardson_reference': analysis['reference'],
+            'reference_dt': dt_values[-1]
+        }
+    
+    def clear_cache(self):
+        """Drop all cached ladder solutions"""
+        self._solution_cache.clear()
+    
+    def _run_resolution_ladder(self, solver_func: Callable, resolutions: List) -> Dict:
+        """
+        Run solver_func for every resolution not already cached.
+        
+        With max_workers other than 1, missing resolutions are dispatched
+        to a process pool; solver functions that cannot be pickled
+        (lambdas, closures) fall back to serial execution.
+        """
+        missing = [res for res in resolutions
+                   if (solver_func, res) not in self._solution_cache]
+        
+        if len(missing) > 1 and self.max_workers != 1 and self._is_picklable(solver_func):
+            logger.info(f"Computing {len(missing)} resolutions on a process pool")
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                for res, sol in zip(missing, executor.map(solver_func, missing)):
+                    self._solution_cache[(solver_func, res)] = sol
+        else:
+            for res in missing:
+                logger.info(f"Computing solution for resolution {res}")
+                self._solution_cache[(solver_func, res)] = solver_func(res)
+        
+        return {res: self._solution_cache[(solver_func, res)] for res in resolutions}
+    
+    @staticmethod
+    def _is_picklable(func: Callable) -> bool:
+        try:
+            pickle.dumps(func)
+        except Exception:
+            logger.warning("Solver function is not picklable, running ladder serially")
+            return False
+        return True
+    
+    def _analyze_ladder(self,
+                        solutions: Dict,
+                        resolutions: List,
+                        h_values: List[float],
+                        reference_solution: Optional[np.ndarray] = None) -> Dict:
+        """
+        Estimate observed order and errors for a coarse-to-fine ladder.
+        
+        All solutions are compared on the finest time grid, skipping points
+        outside a coarser run's interval. The observed
+        order p comes from the three finest levels and the Richardson
+        reference is u_ref = u_h3 + (u_h3 - u_h2) / ((h2/h3)^p - 1).
+        """
+        target_tau = solutions[resolutions[-1]]['tau']
+        on_fine_grid = [
+            solutions[res]['y'] if res == resolutions[-1]
+            else self._interpolate_solution(solutions[res], target_tau)
+            for res in resolutions
+        ]
+        
+        observed_order = np.nan
+        reference = reference_solution
+        if len(resolutions) >= 3:
+            u1, u2, u3 = on_fine_grid[-3:]
+            h1, h2, h3 = h_values[-3:]
+            observed_order = self._observed_order(
+                np.nanmax(np.abs(u1 - u2)), np.nanmax(np.abs(u2 - u3)), h1, h2, h3
+            )
+            if reference is None and np.isfinite(observed_order):
+                reference = u3 + (u3 - u2) / ((h2 / h3)**observed_order - 1.0)
+        
+        if reference is None:
+            # Too few levels for extrapolation: finest run is the reference
+            reference = on_fine_grid[-1]
+        
+        errors = {}
+        convergence_rates = {}
+        for i, res in enumerate(resolutions):
+            errors[res] = np.nanmax(np.abs(on_fine_grid[i] - reference))
+        
+        level_differences = {}
+        for i in range(len(resolutions) - 1):
+            res1, res2 = resolutions[i], resolutions[i+1]
+            level_differences[f'{res1}→{res2}'] = np.nanmax(np.abs(on_fine_grid[i+1] - on_fine_grid[i]))
+            e1, e2 = errors[res1], errors[res2]
+            # error ∝ h^p between consecutive levels
+            if e1 > 1e-16 and e2 > 1e-16:  # Avoid numerical noise
+                convergence_rates[f'{res1}→{res2}'] = np.log(e1 / e2) / np.log(h_values[i] / h_values[i+1])
+        
+        return {
             'errors': errors,
-            'reference_dt': dt_ref
+            'level_differences': level_differences,
+            'convergence_rates': convergence_rates,
+            'observed_order': observed_order,
+            'reference': reference
         }
     
+    @staticmethod
+    def _observed_order(d_coarse: float, d_fine: float,
+                        h1: float, h2: float, h3: float) -> float:
+        """
+        Observed order of accuracy from three levels h1 > h2 > h3.
+        
+        Solves d_coarse / d_fine = (h1^p - h2^p) / (h2^p - h3^p), which
+        reduces to p = log(d_coarse / d_fine) / log(r) for a constant
+        refinement ratio r.
+        """
+        if d_coarse <= 1e-16 or d_fine <= 1e-16:
+            return np.nan
+        
+        ratio = d_coarse / d_fine
+        r21, r32 = h1 / h2, h2 / h3
+        if np.isclose(r21, r32):
+            return np.log(ratio) / np.log(r32)
+        
+        def residual(p):
+            return np.log((h1**p - h2**p) / (h2**p - h3**p)) - np.log(ratio)
+        
+        try:
+            return brentq(residual, 1e-3, 20.0)
+        except ValueError:
+            logger.warning("Observed order could not be bracketed")
+            return np.nan
+    
     def _interpolate_solution(self, 
                             source_solution: Dict, 
                             target_tau: np.ndarray) -> np.ndarray:
-        """Interpolate solution to target time grid"""
-        from scipy.interpolate import interp1d
-        
-        interpolator = interp1d(
-            source_solution['tau'],
-            source_solution['y'],
-            axis=1,
-            kind='cubic',
-            bounds_error=False,
-            fill_value='extrapolate'
-        )
+        """
+        Interpolate solution to target time grid.
+        
+        Uses the solver dense output ('sol') when the solution carries one,
+        otherwise a cubic spline that is built once and stored under
+        'spline'. Points outside the source interval are returned as NaN
+        rather than extrapolated.
+        """
+        interpolant = self._get_interpolant(source_solution)
         
-        return interpolator(target_tau)
+        tau = source_solution['tau']
+        tau_min, tau_max = min(tau[0], tau[-1]), max(tau[0], tau[-1])
+        inside = (target_tau >= tau_min) & (target_tau <= tau_max)
+        
+        values = np.full((source_solution['y'].shape[0], len(target_tau)), np.nan)
+        values[:, inside] = interpolant(target_tau[inside])
+        
+        return values
+    
+    @staticmethod
+    def _get_interpolant(source_solution: Dict) -> Callable:
+        """Return the dense-output callable of a solution, building a spline if needed"""
+        if source_solution.get('sol') is not None:
+            return source_solution['sol']
+        
+        if source_solution.get('spline') is None:
+            source_solution['spline'] = CubicSpline(
+                source_solution['tau'], source_solution['y'], axis=1
+            )
+        
+        return source_solution['spline']
 
 
 class ConstraintPreservation:
     """
     Ensures preservation of physical constraints during evolution.
+    
+    The constraint functions broadcast over time: passing a solution
+    array of shape (n_vars, n_t) with a stacked (n_t, 4, 4) tensor
+    history evaluates every sample in a few NumPy operations.
     """
     
     def __init__(self, tolerance: float = 1e-10):
@@ -382,7 +1346,7 @@ class ConstraintPreservation:
         H = G₀₀ + Λ + C₀₀ - 8πT₀₀ = 0
         """
         a, a_prime = variables[:2]
-        C00 = tensor_components[0, 0]
+        C00 = tensor_components[..., 0, 0]
         
         # Einstein tensor component G₀₀
         H_conf_squared = (a_prime / a)**2
@@ -409,7 +1373,7 @@ class ConstraintPreservation:
         """
         # For FLRW spacetime, momentum constraints are trivial
         # But chronodynamic effects might introduce violations
-        C0i = tensor_components[0, 1:4]  # Time-space components
+        C0i = tensor_components[..., 0, 1:4]  # Time-space components
         
         # Momentum constraint: ∇ⱼ(Gⱼᵢ + Cⱼᵢ) = 8π∇ⱼTⱼᵢ
         # In homogeneous case, this reduces to checking C₀ᵢ = 0
@@ -425,29 +1389,18 @@ class ConstraintPreservation:
         
         Compute ∇_μ T^μν = 0 for the chronodynamic system.
         """
-        conservation_violations = []
+        # This is a simplified check - full implementation would compute
+        # the covariant divergence of the stress-energy tensor
+        energy_change = np.diff(solution[0]**3) / np.diff(tau_array)
         
-        for i, tau in enumerate(tau_array):
-            # Extract solution at this time
-            variables = solution[:, i]
-            
-            # Compute energy density evolution
-            # This is a simplified check - full implementation would compute
-            # the covariant divergence of the stress-energy tensor
-            
-            if i > 0:
-                dt = tau_array[i] - tau_array[i-1]
-                energy_change = (variables[0]**3 - solution[0, i-1]**3) / dt
-                
-                # Expected change from chronodynamic effects
-                expected_change = 0.0  # Placeholder for full calculation
-                
-                violation = abs(energy_change - expected_change)
-                conservation_violations.append(violation)
-            else:
-                conservation_violations.append(0.0)
+        # Expected change from chronodynamic effects
+        expected_change = 0.0  # Placeholder for full calculation
         
-        return np.array(conservation_violations)
+        conservation_violations = np.empty(len(tau_array))
+        conservation_violations[0] = 0.0
+        conservation_violations[1:] = np.abs(energy_change - expected_change)
+        
+        return conservation_violations
     
     def monitor_constraints(self, 
                           solution_data: Dict,
@@ -455,43 +1408,29 @@ class ConstraintPreservation:
         """
         Monitor all constraints throughout the evolution.
         
+        Args:
+            solution_data: Solver output with 'tau' (n_t,) and 'y' (n_vars, n_t)
+            tensor_data: Dictionary with the tensor history 'C', stacked
+                as (n_t, 4, 4)
+        
         Returns comprehensive constraint violation report.
         """
-        tau_array = solution_data['tau']
-        solution = solution_data['y']
+        tau_array = np.asarray(solution_data['tau'])
+        solution = np.asarray(solution_data['y'])
+        tensor_history = np.asarray(tensor_data['C'])
+        
+        H_viol = np.abs(self.hamiltonian_constraint(tau_array, solution, tensor_history))
+        mom_viol = np.max(np.abs(self.momentum_constraint(tau_array, solution, tensor_history)), axis=-1)
+        energy_viol = self.energy_conservation(tau_array, solution)
         
         violations = {
-            'hamiltonian': [],
-            'momentum': [],
-            'energy_conservation': [],
-            'max_violation': 0.0,
+            'hamiltonian': H_viol.tolist(),
+            'momentum': mom_viol.tolist(),
+            'energy_conservation': energy_viol.tolist(),
+            'max_violation': float(max(np.max(H_viol), np.max(mom_viol), np.max(energy_viol))),
             'is_satisfied': True
         }
         
-        for i, tau in enumerate(tau_array):
-            variables = solution[:, i]
-            tensor_components = tensor_data['C'][i]  # Assuming stored tensor data
-            
-            # Check Hamiltonian constraint
-            H_viol = abs(self.hamiltonian_constraint(tau, variables, tensor_components))
-            violations['hamiltonian'].append(H_viol)
-            
-            # Check momentum constraints
-            mom_viol = np.max(np.abs(self.momentum_constraint(tau, variables, tensor_components)))
-            violations['momentum'].append(mom_viol)
-            
-            # Update maximum violation
-            violations['max_violation'] = max(
-                violations['max_violation'], 
-                H_viol, 
-                mom_viol
-            )
-        
-        # Check energy conservation
-        energy_viol = self.energy_conservation(tau_array, solution)
-        violations['energy_conservation'] = energy_viol.tolist()
-        violations['max_violation'] = max(violations['max_violation'], np.max(energy_viol))
-        
         # Determine if constraints are satisfied
         violations['is_satisfied'] = violations['max_violation'] < self.tolerance
         
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Multirate Integration for Chronodynamic Perturbations
+=====================================================
+
+Multirate scheme for perturbation equations that only need the slowly
+evolving background (a(τ), a'(τ), ...) of the Chronodynamic
+Cosmological Divergence (CCD) model. The background is advanced once on
+large steps with dense output; every perturbation mode then sub-cycles
+on its own fine steps inside each background step, reading the
+background from that step's local interpolating polynomial. The
+background right-hand side is never re-evaluated on the fine steps.
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import numpy as np
+import scipy.integrate
+from scipy.integrate import solve_ivp
+from typing import Callable, Dict, List, Tuple, Optional, Sequence
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MultirateConfig:
+    """Configuration for multirate integration"""
+    background_method: str = 'DOP853'  # Slow system integrator
+    background_rtol: float = 1e-10
+    background_atol: float = 1e-12
+    macro_step: float = np.inf         # Maximum background (macro) step
+    fast_method: str = 'RK45'          # Perturbation sub-cycling integrator
+    fast_rtol: float = 1e-8
+    fast_atol: float = 1e-10
+
+
+class MultirateIntegrator:
+    """
+    Slow background / fast perturbation multirate integrator.
+
+    The perturbation right-hand side has the signature
+    f(τ, y, background, param), where background is the interpolated
+    background state at τ and param the per-mode parameter (e.g. k).
+    """
+
+    def __init__(self, config: MultirateConfig = None):
+        self.config = config or MultirateConfig()
+
+    def integrate_background(self,
+                             background_func: Callable,
+                             tau_span: Tuple[float, float],
+                             initial_conditions: np.ndarray) -> Dict:
+        """
+        Advance the background on large steps with dense output.
+
+        Returns:
+            Dictionary with the macro step nodes, the dense output and nfev
+        """
+        solution = solve_ivp(
+            background_func,
+            tau_span,
+            initial_conditions,
+            method=self.config.background_method,
+            rtol=self.config.background_rtol,
+            atol=self.config.background_atol,
+            max_step=self.config.macro_step,
+            dense_output=True
+        )
+
+        if not solution.success:
+            raise RuntimeError(f"Background integration failed: {solution.message}")
+
+        logger.info(f"Background integrated in {len(solution.t) - 1} macro steps "
+                    f"({solution.nfev} evaluations)")
+
+        return {'tau': solution.t, 'y': solution.y, 'sol': solution.sol, 'nfev': solution.nfev}
+
+    def solve(self,
+              background_func: Callable,
+              perturbation_func: Callable,
+              tau_span: Tuple[float, float],
+              background_initial: np.ndarray,
+              perturbation_initial: Sequence[np.ndarray],
+              mode_params: Optional[Sequence] = None,
+              tau_eval: Optional[np.ndarray] = None,
+              background: Optional[Dict] = None) -> Dict:
+        """
+        Integrate the background once and sub-cycle every perturbation mode.
+
+        Args:
+            background_func: Slow system dy_b/dτ = g(τ, y_b)
+            perturbation_func: Fast system dy/dτ = f(τ, y, y_b(τ), param)
+            tau_span: Integration interval (tau_start, tau_end)
+            background_initial: Initial background state
+            perturbation_initial: Initial state of every mode
+            mode_params: Per-mode parameter passed to perturbation_func
+            tau_eval: Sorted output times within tau_span (default: the
+                macro step nodes)
+            background: Result of integrate_background to reuse
+
+        Returns:
+            Dictionary with the background and every mode on the output grid
+        """
+        tau_start, tau_end = tau_span
+        if not tau_end > tau_start:
+            raise ValueError(f"Multirate integration runs forward only, got tau_span={tau_span}")
+        if tau_eval is not None:
+            tau_eval = np.asarray(tau_eval, dtype=float)
+            if tau_eval.ndim != 1 or np.any(np.diff(tau_eval) < 0):
+                raise ValueError("tau_eval must be a sorted 1-D array")
+            if tau_eval.size and (tau_eval[0] < tau_start or tau_eval[-1] > tau_end):
+                raise ValueError(f"tau_eval must lie within tau_span={tau_span}")
+
+        if background is None:
+            background = self.integrate_background(background_func, tau_span, background_initial)
+
+        if mode_params is None:
+            mode_params = [None] * len(perturbation_initial)
+
+        nodes = background['tau']
+        interpolants = background['sol'].interpolants
+        tau_out = nodes if tau_eval is None else tau_eval
+
+        # Output points owned by each macro step (the first step also owns its start)
+        owner = np.clip(np.searchsorted(nodes, tau_out, side='left') - 1, 0, len(interpolants) - 1)
+
+        modes = []
+        mode_nfev = []
+        for y0, param in zip(perturbation_initial, mode_params):
+            values, nfev = self._subcycle_mode(perturbation_func, interpolants, nodes,
+                                               np.asarray(y0, dtype=float), param, tau_out, owner)
+            modes.append(values)
+            mode_nfev.append(nfev)
+
+        return {
+            'tau': tau_out,
+            'background': background['sol'](tau_out),
+            'modes': np.array(modes),
+            'n_macro_steps': len(interpolants),
+            'background_nfev': background['nfev'],
+            'mode_nfev': mode_nfev
+        }
+
+    def _subcycle_mode(self,
+                       perturbation_func: Callable,
+                       interpolants: List,
+                       nodes: np.ndarray,
+                       y0: np.ndarray,
+                       param,
+                       tau_out: np.ndarray,
+                       owner: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Integrate one mode macro step by macro step"""
+        method_cls = getattr(scipy.integrate, self.config.fast_method)
+        values = np.zeros((len(y0), len(tau_out)))
+        y = y0
+        first_step = None
+        nfev = 0
+
+        for i, local_background in enumerate(interpolants):
+            tau_start, tau_end = nodes[i], nodes[i+1]
+            pending = list(np.flatnonzero(owner == i))
+
+            def local_system(tau, y):
+                return perturbation_func(tau, y, local_background(tau), param)
+
+            solver = method_cls(local_system, tau_start, y, tau_end,
+                                rtol=self.config.fast_rtol, atol=self.config.fast_atol,
+                                first_step=None if first_step is None else min(first_step, tau_end - tau_start))
+
+            while pending and tau_out[pending[0]] <= tau_start:
+                values[:, pending.pop(0)] = y
+
+            step_sizes = []
+            while solver.status == 'running':
+                message = solver.step()
+                if solver.status == 'failed':
+                    raise RuntimeError(f"Perturbation sub-cycling failed at τ={solver.t}: {message}")
+                step_sizes.append(solver.step_size)
+
+                owned = []
+                while pending and tau_out[pending[0]] <= solver.t:
+                    owned.append(pending.pop(0))
+                if owned:
+                    values[:, owned] = solver.dense_output()(tau_out[owned])
+
+            y = solver.y
+            nfev += solver.nfev
+
+            # Carry the fine step size across macro steps, ignoring the final
+            # step that was shortened to land on the macro node
+            if step_sizes:
+                first_step = step_sizes[-2] if len(step_sizes) > 1 else step_sizes[-1]
+
+        return values, nfev
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Parareal Parallel-in-Time Integration
+=====================================
+
+Parareal integrator for long conformal-time spans in the Chronodynamic
+Cosmological Divergence (CCD) model. The span is split into time slices;
+a cheap fixed-step coarse propagator sweeps serially across them while
+the accurate AdaptiveStepSolver runs on every slice concurrently.
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import numpy as np
+from typing import Callable, Dict, List, Tuple, Optional
+import logging
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+from .differential_solvers import AdaptiveStepSolver, SolverConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PararealConfig:
+    """Configuration for Parareal integration"""
+    n_slices: int = 8             # Number of time slices
+    coarse_steps: int = 4         # RK4 steps per slice for the coarse propagator
+    max_iterations: int = 10      # Maximum Parareal corrections
+    tolerance: float = 1e-8       # Relative change of slice boundaries for convergence
+    max_workers: Optional[int] = None  # None: one worker per CPU, 1: serial
+    log_spacing: bool = False     # Logarithmic slices, for spans like [1e-5, τ_today]
+
+
+def _fine_propagate(task: Tuple) -> Dict:
+    """Fine propagation of one slice (module level so it can be pickled)"""
+    system_func, solver_config, tau_span, y0 = task
+    solver = AdaptiveStepSolver(solver_config)
+    result = solver.solve_chronodynamic_system(system_func, tau_span, y0)
+    return {'tau': result['tau'], 'y': result['y'], 'nfev': result['nfev']}
+
+
+class PararealIntegrator:
+    """
+    Parareal parallel-in-time integrator.
+
+    Iterates U_{n+1}^{k+1} = G(U_n^{k+1}) + F(U_n^k) - G(U_n^k), where G is a
+    low-order fixed-step coarse propagator and F is the adaptive fine
+    propagator evaluated on a process pool. After k iterations the first
+    k slices are exact, so only the remaining slices are re-run.
+    """
+
+    def __init__(self,
+                 solver_config: SolverConfig = None,
+                 config: PararealConfig = None):
+        self.solver_config = solver_config or SolverConfig()
+        self.config = config or PararealConfig()
+
+    def solve(self,
+              system_func: Callable,
+              tau_span: Tuple[float, float],
+              initial_conditions: np.ndarray) -> Dict:
+        """
+        Integrate dy/dτ = f(τ, y) over tau_span with Parareal.
+
+        Args:
+            system_func: Function defining dy/dτ = f(τ, y); must be picklable
+                to run on the process pool, otherwise slices run serially
+            tau_span: Integration interval (tau_start, tau_end)
+            initial_conditions: Initial values y(tau_start)
+
+        Returns:
+            Dictionary with the fine trajectory, slice boundaries and
+            iteration statistics. Each slice of the trajectory starts from
+            the final slice_values; without convergence the fine slices are
+            re-run from them once more, so the trajectory still jumps at
+            unconverged boundaries. nfev counts every fine solve.
+        """
+        tau_slices = self._slice_boundaries(tau_span)
+        n_slices = self.config.n_slices
+
+        logger.info(f"Starting Parareal integration over τ ∈ {tau_span} with {n_slices} slices")
+
+        # Dense output objects are not shipped back from the workers
+        fine_config = replace(self.solver_config, dense_output=False)
+
+        U = np.zeros((n_slices + 1, len(initial_conditions)))
+        U[0] = initial_conditions
+        G_old = np.zeros_like(U)
+        for n in range(n_slices):
+            G_old[n+1] = self._coarse_propagate(system_func, tau_slices[n], tau_slices[n+1], U[n])
+            U[n+1] = G_old[n+1]
+
+        fine_results: List[Optional[Dict]] = [None] * n_slices
+        increments = []
+        nfev = 0
+        converged = False
+        iteration = 0
+
+        executor = None
+        if self.config.max_workers != 1 and self._is_picklable(system_func):
+            executor = ProcessPoolExecutor(max_workers=self.config.max_workers)
+
+        try:
+            for iteration in range(1, min(self.config.max_iterations, n_slices) + 1):
+                # Slices before iteration-1 have exact initial values already
+                first = iteration - 1
+                tasks = [
+                    (system_func, fine_config, (tau_slices[n], tau_slices[n+1]), U[n])
+                    for n in range(first, n_slices)
+                ]
+                for n, result in zip(range(first, n_slices), self._map(executor, tasks)):
+                    fine_results[n] = result
+                    nfev += result['nfev']
+
+                # Serial correction sweep
+                U_new = U.copy()
+                for n in range(first, n_slices):
+                    G_new = self._coarse_propagate(system_func, tau_slices[n], tau_slices[n+1], U_new[n])
+                    U_new[n+1] = G_new + fine_results[n]['y'][:, -1] - G_old[n+1]
+                    G_old[n+1] = G_new
+
+                increment = np.max(np.abs(U_new - U) / (np.abs(U_new) + self.solver_config.atol))
+                increments.append(increment)
+                U = U_new
+
+                logger.info(f"Parareal iteration {iteration}: max relative update {increment:.3e}")
+
+                # After n_slices iterations every slice started from exact data
+                if increment < self.config.tolerance or iteration == n_slices:
+                    converged = True
+                    break
+
+            if not converged:
+                # Restart the fine slices from the corrected boundary values
+                tasks = [
+                    (system_func, fine_config, (tau_slices[n], tau_slices[n+1]), U[n])
+                    for n in range(iteration, n_slices)
+                ]
+                for n, result in zip(range(iteration, n_slices), self._map(executor, tasks)):
+                    fine_results[n] = result
+                    nfev += result['nfev']
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if not converged:
+            logger.warning(f"Parareal did not converge in {iteration} iterations")
+
+        # Stitch the fine trajectories, dropping duplicated slice boundaries
+        tau = np.concatenate([fine_results[0]['tau']] +
+                             [r['tau'][1:] for r in fine_results[1:]])
+        y = np.concatenate([fine_results[0]['y']] +
+                           [r['y'][:, 1:] for r in fine_results[1:]], axis=1)
+
+        return {
+            'tau': tau,
+            'y': y,
+            'tau_slices': tau_slices,
+            'slice_values': U.T,
+            'iterations': iteration,
+            'converged': converged,
+            'increments': increments,
+            'nfev': int(nfev)
+        }
+
+    @staticmethod
+    def _map(executor: Optional[ProcessPoolExecutor], tasks: List[Tuple]):
+        return executor.map(_fine_propagate, tasks) if executor else map(_fine_propagate, tasks)
+
+    def _slice_boundaries(self, tau_span: Tuple[float, float]) -> np.ndarray:
+        tau_start, tau_end = tau_span
+        if self.config.log_spacing:
+            return np.logspace(np.log10(tau_start), np.log10(tau_end), self.config.n_slices + 1)
+        return np.linspace(tau_start, tau_end, self.config.n_slices + 1)
+
+    def _coarse_propagate(self,
+                          system_func: Callable,
+                          tau_start: float,
+                          tau_end: float,
+                          y0: np.ndarray) -> np.ndarray:
+        """Fixed-step classical RK4 over one slice"""
+        h = (tau_end - tau_start) / self.config.coarse_steps
+        tau = tau_start
+        y = np.array(y0, dtype=float)
+
+        for _ in range(self.config.coarse_steps):
+            k1 = np.asarray(system_func(tau, y))
+            k2 = np.asarray(system_func(tau + 0.5*h, y + 0.5*h*k1))
+            k3 = np.asarray(system_func(tau + 0.5*h, y + 0.5*h*k2))
+            k4 = np.asarray(system_func(tau + h, y + h*k3))
+            y = y + (h / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
+            tau += h
+
+        return y
+
+    @staticmethod
+    def _is_picklable(func: Callable) -> bool:
+        try:
+            pickle.dumps(func)
+        except Exception:
+            logger.warning("System function is not picklable, running fine propagators serially")
+            return False
+        return True
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Spherical Bessel Tables for CMB Projections
+===========================================
+
+Precomputed spherical Bessel functions j_l(x) on an (l, x) grid for the
+line-of-sight projection of the Chronodynamic Cosmological Divergence
+(CCD) CMB spectra. All multipoles come out of one vectorized recurrence
+over the x grid; tables are stored as memory-mapped .npy files keyed by
+l_max and the x grid, and values are served in bulk.
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tables already opened in this process, keyed like the cache files
+_TABLE_CACHE: Dict[str, np.ndarray] = {}
+
+# Rescaling threshold of the downward recurrence
+_RESCALE = 1e250
+
+
+def spherical_jn_table(l_max: int, x: np.ndarray) -> np.ndarray:
+    """
+    j_l(x) for l = 0..l_max at every x, shape (l_max + 1, len(x)).
+
+    Upward recurrence j_{l+1} = (2l+1)/x j_l - j_{l-1} is stable for
+    l < x, so it serves x >= l_max. Smaller x use Miller's downward
+    recurrence, started well above l_max and normalized to j_0 or j_1.
+    """
+    x = np.asarray(x, dtype=float)
+    table = np.zeros((l_max + 1, len(x)))
+    table[0, x == 0] = 1.0
+
+    up = x >= max(l_max, 1)
+    down = (x > 0) & ~up
+
+    if np.any(up):
+        xu = x[up]
+        j_prev = np.sin(xu) / xu
+        table[0, up] = j_prev
+        if l_max >= 1:
+            j = np.sin(xu) / xu**2 - np.cos(xu) / xu
+            table[1, up] = j
+            for l in range(1, l_max):
+                j_prev, j = j, (2*l + 1) / xu * j - j_prev
+                table[l + 1, up] = j
+
+    if np.any(down):
+        xd = x[down]
+        columns = np.flatnonzero(down)
+        l_start = l_max + int(np.sqrt(40 * (l_max + 1))) + 20
+
+        j_next = np.zeros_like(xd)
+        j = np.full_like(xd, 1e-300)
+        for l in range(l_start, 0, -1):
+            j_next, j = j, (2*l + 1) / xd * j - j_next
+            # j now holds j_{l-1}
+            if l - 1 <= l_max:
+                table[l - 1, columns] = j
+
+            big = np.abs(j) > _RESCALE
+            if np.any(big):
+                j[big] /= _RESCALE
+                j_next[big] /= _RESCALE
+                if l - 1 <= l_max:
+                    table[l - 1:, columns[big]] /= _RESCALE
+
+        # Normalize with whichever of j_0, j_1 is further from a zero
+        j0 = np.sin(xd) / xd
+        j1 = np.sin(xd) / xd**2 - np.cos(xd) / xd
+        use_j0 = np.abs(j0) >= np.abs(j1)
+        if l_max >= 1:
+            norm = np.where(use_j0, j0 / table[0, columns], j1 / np.where(use_j0, 1.0, table[1, columns]))
+        else:
+            norm = j0 / table[0, columns]
+        table[:, columns] *= norm
+
+    return table
+
+
+class BesselTable:
+    """
+    Table of j_l(x) on a fixed x grid, persisted as a memory-mapped file.
+
+    Values between grid points use cubic Hermite interpolation with
+    the exact derivative j_l' = j_{l-1} - (l+1)/x j_l, so the grid must
+    resolve the oscillation in x; at grid points lookups are exact.
+    """
+
+    def __init__(self,
+                 l_max: int,
+                 x_min: float,
+                 x_max: float,
+                 n_x: int,
+                 spacing: str = 'linear',
+                 cache_dir: Optional[str] = None):
+        if l_max < 1:
+            raise ValueError(f"Bessel tables need l_max >= 1, got {l_max}")
+        if spacing not in ('linear', 'log'):
+            raise ValueError(f"Unknown grid spacing: {spacing}")
+        if spacing == 'log' and x_min <= 0:
+            raise ValueError("Logarithmic spacing needs x_min > 0")
+
+        self.l_max = l_max
+        self.spacing = spacing
+        if spacing == 'log':
+            self.x = np.logspace(np.log10(x_min), np.log10(x_max), n_x)
+        else:
+            self.x = np.linspace(x_min, x_max, n_x)
+
+        self.key = f"jl_lmax{l_max}_x{x_min:.10g}-{x_max:.10g}_n{n_x}_{spacing}"
+        self.cache_dir = None if cache_dir is None else Path(os.path.expanduser(cache_dir))
+        self.values = self._load_or_compute()
+
+    @property
+    def cache_path(self) -> Optional[Path]:
+        return None if self.cache_dir is None else self.cache_dir / f"{self.key}.npy"
+
+    def __call__(self, l: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        j_l(x) for every pair of l and x, shape (len(l), len(x)).
+
+        Args:
+            l: Multipoles, at most l_max
+            x: Arguments inside the grid range
+        """
+        l = np.atleast_1d(np.asarray(l, dtype=int))
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        if l.max() > self.l_max:
+            raise ValueError(f"Multipole {l.max()} exceeds the table l_max={self.l_max}")
+        if x.min() < self.x[0] * (1 - 1e-12) or x.max() > self.x[-1] * (1 + 1e-12):
+            raise ValueError(f"Arguments outside the table range [{self.x[0]}, {self.x[-1]}]")
+
+        i = np.clip(np.searchsorted(self.x, x) - 1, 0, len(self.x) - 2)
+        x0, x1 = self.x[i], self.x[i + 1]
+        dx = x1 - x0
+        t = np.clip((x - x0) / dx, 0.0, 1.0)
+
+        y0, y1 = self.values[l][:, i], self.values[l][:, i + 1]
+        d0, d1 = self._derivative(l, i), self._derivative(l, i + 1)
+
+        h00 = 2*t**3 - 3*t**2 + 1
+        h10 = t**3 - 2*t**2 + t
+        h01 = -2*t**3 + 3*t**2
+        h11 = t**3 - t**2
+        return h00 * y0 + h10 * dx * d0 + h01 * y1 + h11 * dx * d1
+
+    def _derivative(self, l: np.ndarray, i: np.ndarray) -> np.ndarray:
+        """dj_l/dx at grid points i from neighbouring table rows"""
+        x = self.x[i]
+        j_l = self.values[l][:, i]
+        j_lm1 = self.values[np.maximum(l - 1, 0)][:, i]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d = j_lm1 - (l[:, np.newaxis] + 1) / x * j_l
+        # j_0' = -j_1, and every j_l' vanishes at x = 0 except j_1'(0) = 1/3
+        d[l == 0] = -self.values[1][i]
+        zero = x == 0
+        if np.any(zero):
+            d[:, zero] = np.where(l == 1, 1.0 / 3.0, 0.0)[:, np.newaxis]
+        return d
+
+    def _load_or_compute(self) -> np.ndarray:
+        if self.key in _TABLE_CACHE:
+            return _TABLE_CACHE[self.key]
+
+        path = self.cache_path
+        if path is not None and path.exists():
+            values = np.load(path, mmap_mode='r')
+            if values.shape == (self.l_max + 1, len(self.x)):
+                logger.info(f"Loaded Bessel table from {path}")
+                _TABLE_CACHE[self.key] = values
+                return values
+            logger.warning(f"Ignoring Bessel table {path} with shape {values.shape}")
+
+        logger.info(f"Computing Bessel table for l ≤ {self.l_max} on {len(self.x)} arguments")
+        values = spherical_jn_table(self.l_max, self.x)
+
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write under a temporary name so readers never see partial tables
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npy")
+            stored = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=float, shape=values.shape)
+            stored[:] = values
+            stored.flush()
+            del stored
+            os.replace(tmp_path, path)
+            values = np.load(path, mmap_mode='r')
+            logger.info(f"Bessel table cached at {path}")
+
+        _TABLE_CACHE[self.key] = values
+        return values
@@ -10,16 +10,37 @@ Author: Aksel Boursier
 Date: August 2025
 """
 
+import os
+import copy
 import numpy as np
 from scipy.integrate import quad, solve_ivp
-from scipy.interpolate import interp1d
+from scipy.interpolate import interp1d, CubicSpline
 from scipy.optimize import fsolve
 from typing import Dict, List, Tuple, Optional
 import logging
-from dataclasses import dataclass
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, astuple, fields
+
+from .bessel_tables import BesselTable
+from .transfer_cache import TransferCache, stable_hash
 
 logger = logging.getLogger(__name__)
 
+# Transfer function shared by the k-mode workers, set once per worker process
+_WORKER_TRANSFER = None
+
+# CMBConfig fields that change per-k perturbation solutions
+_SOLUTION_CONFIG_FIELDS = ('z_recombination', 'tau_reionization', 'source_table_size')
+
+# CMBConfig fields that change how the spectra are computed, but not their values
+_EXECUTION_CONFIG_FIELDS = ('max_workers', 'batched_modes', 'bessel_cache_dir',
+                            'transfer_cache_dir', 'transfer_cache_max_bytes')
+
+# Perturbation variables
+_STATE_NAMES = ['delta_c', 'delta_b', 'delta_gamma', 'theta_c', 'theta_b', 'theta_gamma', 'phi', 'psi']
+
 
 @dataclass
 class CMBConfig:
@@ -30,6 +51,32 @@ class CMBConfig:
     n_k: int = 200
     z_recombination: float = 1090.0
     tau_reionization: float = 0.054
+    bessel_cache_dir: Optional[str] = None  # Disk cache of Bessel tables; None: keep them in memory only
+    max_workers: Optional[int] = 1  # k-mode worker processes; None: one per CPU
+    batched_modes: bool = False     # Integrate all k modes as one vectorized system
+    source_table_size: int = 4096   # log-τ nodes of the background source tables; 0: no tables
+    l_sample_max_step: int = 0      # Widest gap of the sparse multipole sampling; 0: every multipole
+    l_approximation: str = 'exact'  # High-l projection: 'exact', 'flat_sky' or 'limber'
+    l_approximation_switch: int = 500  # First multipole projected approximately
+    l_approximation_checks: int = 3    # Approximated multipoles checked against the exact projection; 0: none
+    l_approximation_tolerance: float = 0.05  # Self-check error beyond which every multipole is projected exactly
+    transfer_cache_dir: Optional[str] = None  # HDF5 cache of per-k solutions; None: no cache
+    transfer_cache_max_bytes: int = 2**30     # Cache size beyond which old entries are evicted
+
+
+def _init_transfer_worker(transfer):
+    global _WORKER_TRANSFER
+    _WORKER_TRANSFER = transfer
+
+
+def _solve_mode_sources(k: float) -> Tuple[float, float, Optional[str]]:
+    """Recombination sources of one k mode in a worker (module level so it can be pickled)"""
+    try:
+        S_T, S_E = _WORKER_TRANSFER.recombination_sources(k)
+        return S_T, S_E, None
+    except Exception as e:
+        return np.nan, np.nan, str(e)
+
 
 class ChronodynamicTransferFunction:
     """
@@ -47,7 +94,13 @@ class ChronodynamicTransferFunction:
             self.config.n_k
         )
         
-        self._precompute_background()
+        self._background_key = None
+        self._update_background()
+        self._source_tables = None
+        self._transfer_cache = None
+        if self.config.transfer_cache_dir is not None:
+            self._transfer_cache = TransferCache(self.config.transfer_cache_dir,
+                                                 self.config.transfer_cache_max_bytes)
         
         logger.info(f"Initialized ChronodynamicTransferFunction with l_max={self.config.l_max}")
 
@@ -89,6 +142,16 @@ class ChronodynamicTransferFunction:
         self.H_interp_func = lambda tau: self.a_interp_func(tau, 1)[0] / self.a_interp_func(tau, 0)[0]
         logger.info("Background cosmology pre-computed and interpolated.")
 
+    def _update_background(self):
+        """Recompute the background if the tensor parameters changed since it was built"""
+        key = (astuple(self.params), self.tensor.grid_size)
+        if key == self._background_key:
+            return
+        if self._background_key is not None:
+            logger.info("Tensor parameters changed, recomputing the background")
+        self._precompute_background()
+        self._background_key = key
+
     def _scale_factor(self, tau: float) -> float:
         return self.a_interp_func(tau)[0]
 
@@ -96,37 +159,229 @@ class ChronodynamicTransferFunction:
         return self.H_interp_func(tau)
 
     def solve_perturbation_equations(self, k: float) -> Dict[str, np.ndarray]:
-        tau_ini = 1e-4
-        tau_rec = self._conformal_time_at_recombination()
+        """Perturbations of mode k up to recombination, read from the transfer cache when stored"""
+        if self._transfer_cache is None:
+            return self._solve_perturbation_equations(k)
+        
+        cosmology = self.cosmology_hash()
+        perturbations = self._transfer_cache.load(cosmology, k)
+        if perturbations is None:
+            perturbations = self._solve_perturbation_equations(k)
+            self._transfer_cache.store(cosmology, k, perturbations, self._sources(perturbations, k))
+        return perturbations
+    
+    def cosmology_hash(self) -> str:
+        """
+        Stable hash of everything a per-k solution depends on: the tensor
+        parameters and grid the background was built from (rebuilt first
+        if they changed), the solution-relevant CMBConfig fields and the
+        transfer function class, which fixes the background.
+        """
+        self._update_background()
+        params, grid_size = self._background_key
+        cls = type(self)
+        return stable_hash({
+            'params': dict(zip((field.name for field in fields(self.params)), params)),
+            'grid_size': grid_size,
+            'config': {name: getattr(self.config, name) for name in _SOLUTION_CONFIG_FIELDS},
+            'transfer': f"{cls.__module__}.{cls.__qualname__}"
+        })
+    
+    def _solve_perturbation_equations(self, k: float) -> Dict[str, np.ndarray]:
+        tau, Y = self._integrate_modes(np.array([k]), f"Perturbation integration failed for k={k}")
         
-        if tau_ini >= tau_rec:
-            raise ValueError(f"Initial time (τ_ini={tau_ini}) is not smaller than recombination time (τ_rec={tau_rec})")
-
-        tau_array = np.logspace(np.log10(tau_ini), np.log10(tau_rec), 500)
+        result = {name: Y[0, i] for i, name in enumerate(_STATE_NAMES)}
+        result['tau'] = tau
+        return result
+    
+    def solve_perturbation_equations_batched(self, k_array: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Integrate all k modes as one (8·n_k)-dimensional system.
+        
+        Each right-hand side evaluation computes a(τ), H(τ), x_e(z) and
+        the tensor source once for every mode. All modes share the step
+        size. The state is mode-major, so the Jacobian is banded
+        (bandwidth 7) and LSODA's stiff phase costs 15 evaluations per
+        Jacobian, whatever n_k is.
         
-        initial_conditions = self._adiabatic_initial_conditions(k, tau_ini)
+        Returns:
+            Same keys as solve_perturbation_equations, each of shape (n_k, n_tau)
+        """
+        k_array = self.k_array if k_array is None else np.asarray(k_array, dtype=float)
+        tau, Y = self._integrate_modes(k_array, "Batched perturbation integration failed")
+        
+        result = {name: Y[:, i] for i, name in enumerate(_STATE_NAMES)}
+        result['tau'] = tau
+        return result
+    
+    def _integrate_modes(self, k_array: np.ndarray, failure_message: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Integrate modes from τ_ini to τ_rec as one mode-major system.
         
-        def perturbation_system(tau, y):
-            return self._chronodynamic_perturbation_equations(tau, y, k)
+        Returns:
+            Output times and states of shape (n_k, 8, n_tau)
+        """
+        tau_ini, tau_rec, tau_array = self._perturbation_span()
+        n_k = len(k_array)
+        initial_conditions = np.array([self._adiabatic_initial_conditions(k, tau_ini) for k in k_array])
+        # Mode-major states of several modes have a banded Jacobian
+        band = {} if n_k == 1 else {'lband': 7, 'uband': 7}
         
         solution = solve_ivp(
-            perturbation_system,
+            lambda tau, y: self._batched_perturbation_equations(tau, y, k_array),
             (tau_ini, tau_rec),
-            initial_conditions,
+            initial_conditions.ravel(),
             t_eval=tau_array,
             method='LSODA',
             rtol=1e-6,
-            atol=1e-7
+            atol=1e-7,
+            **band
         )
         
         if not solution.success:
-            raise RuntimeError(f"Perturbation integration failed for k={k}: {solution.message}")
+            raise RuntimeError(f"{failure_message}: {solution.message}")
+        return solution.t, solution.y.reshape(n_k, 8, -1)
+    
+    def _perturbation_span(self) -> Tuple[float, float, np.ndarray]:
+        """Integration span (τ_ini, τ_rec) and output grid, with the background and source tables current"""
+        self._update_background()
+        tau_ini = 1e-4
+        tau_rec = self._conformal_time_at_recombination()
         
-        return {
-            'tau': solution.t, 'delta_c': solution.y[0], 'delta_b': solution.y[1],
-            'delta_gamma': solution.y[2], 'theta_c': solution.y[3], 'theta_b': solution.y[4],
-            'theta_gamma': solution.y[5], 'phi': solution.y[6], 'psi': solution.y[7]
-        }
+        if tau_ini >= tau_rec:
+            raise ValueError(f"Initial time (τ_ini={tau_ini}) is not smaller than recombination time (τ_rec={tau_rec})")
+
+        # Clipped so rounding in logspace cannot push the ends outside the span
+        tau_array = np.clip(np.logspace(np.log10(tau_ini), np.log10(tau_rec), 500), tau_ini, tau_rec)
+        
+        self.build_source_tables(tau_ini, tau_rec)
+        
+        return tau_ini, tau_rec, tau_array
+    
+    def recombination_sources(self, k: float) -> Tuple[float, float]:
+        """Temperature and polarization sources S_T, S_E of mode k at recombination"""
+        if self._transfer_cache is None:
+            return self._sources(self.solve_perturbation_equations(k), k)
+        
+        cosmology = self.cosmology_hash()
+        sources = self._transfer_cache.load_sources(cosmology, k)
+        if sources is None:
+            # Known miss: solve and store without reading the entry again
+            perturbations = self._solve_perturbation_equations(k)
+            sources = self._sources(perturbations, k)
+            self._transfer_cache.store(cosmology, k, perturbations, sources)
+        return sources
+    
+    @staticmethod
+    def _sources(perturbations: Dict[str, np.ndarray], k) -> Tuple:
+        """S_T, S_E from the last output time, for one mode or batched modes"""
+        S_T = perturbations['delta_gamma'][..., -1] / 4 + perturbations['phi'][..., -1]
+        S_E = perturbations['theta_gamma'][..., -1] / k
+        return S_T, S_E
+    
+    def compute_sources(self, k_array: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recombination sources for every k mode, in k order.
+        
+        Modes stored in the transfer cache are read, the others are
+        distributed over config.max_workers processes. Workers are
+        forked, so they share the precomputed background without
+        copying it; without fork the transfer function is pickled once per
+        worker, or the modes run serially if it cannot be. Modes whose
+        integration fails are logged, skipped and left as NaN. With
+        config.batched_modes all modes are integrated as one system
+        first, falling back to per-mode solves if that fails. New modes
+        are stored, and the cache is trimmed to its size limit once at
+        the end.
+        """
+        k_array = self.k_array if k_array is None else np.asarray(k_array, dtype=float)
+        self._update_background()
+        S_T = np.full(len(k_array), np.nan)
+        S_E = np.full(len(k_array), np.nan)
+        
+        pending = np.arange(len(k_array))
+        if self._transfer_cache is not None:
+            cosmology = self.cosmology_hash()
+            for i, k in enumerate(k_array):
+                sources = self._transfer_cache.load_sources(cosmology, k)
+                if sources is not None:
+                    S_T[i], S_E[i] = sources
+            pending = np.flatnonzero(np.isnan(S_T))
+            logger.info(f"{len(k_array) - len(pending)} of {len(k_array)} k modes read from the transfer cache")
+            if len(pending) == 0:
+                return S_T, S_E
+        
+        k_pending = k_array[pending]
+        if self.config.batched_modes:
+            try:
+                perturbations = self.solve_perturbation_equations_batched(k_pending)
+            except Exception as e:
+                logger.warning(f"Batched integration failed ({e}), solving k modes individually")
+            else:
+                S_T[pending], S_E[pending] = self._sources(perturbations, k_pending)
+                if self._transfer_cache is not None:
+                    for j, (i, k) in enumerate(zip(pending, k_pending)):
+                        mode = {name: perturbations[name][j] for name in _STATE_NAMES}
+                        mode['tau'] = perturbations['tau']
+                        self._transfer_cache.store(cosmology, k, mode, (S_T[i], S_E[i]))
+                    self._transfer_cache.evict()
+                return S_T, S_E
+        
+        if self.config.source_table_size >= 2:
+            try:
+                # Build before forking so every worker inherits the tables
+                self._perturbation_span()
+            except ValueError as e:
+                logger.warning(f"Background source tables not built: {e}")
+        
+        executor = self._mode_executor(len(k_pending))
+        if executor is None:
+            results = map(self._solve_sources_serial, k_pending)
+        else:
+            n_workers = self.config.max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(k_pending) // (4 * n_workers))
+            results = executor.map(_solve_mode_sources, k_pending, chunksize=chunksize)
+        
+        try:
+            for n, (i, (s_t, s_e, error)) in enumerate(zip(pending, results)):
+                if n % 20 == 0:
+                    logger.info(f"Processing k mode {n+1}/{len(k_pending)}")
+                if error is not None:
+                    logger.warning(f"Skipping k={k_array[i]} due to error: {error}")
+                    continue
+                S_T[i], S_E[i] = s_t, s_e
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        if self._transfer_cache is not None:
+            # Workers only see their own writes, so trim once for all of them
+            self._transfer_cache.evict()
+        return S_T, S_E
+    
+    def _solve_sources_serial(self, k: float) -> Tuple[float, float, Optional[str]]:
+        try:
+            return (*self.recombination_sources(k), None)
+        except Exception as e:
+            return np.nan, np.nan, str(e)
+    
+    def _mode_executor(self, n_modes: int) -> Optional[ProcessPoolExecutor]:
+        max_workers = self.config.max_workers
+        if max_workers == 1 or n_modes < 2:
+            return None
+        
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            try:
+                pickle.dumps(self)
+            except Exception:
+                logger.warning("Transfer function is not picklable, solving k modes serially")
+                return None
+            context = None
+        
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                   initializer=_init_transfer_worker, initargs=(self,))
     
     def _conformal_time_at_recombination(self) -> float:
         a_rec = 1.0 / (1.0 + self.config.z_recombination)
@@ -163,8 +418,61 @@ class ChronodynamicTransferFunction:
         ])
 
     def _chronodynamic_perturbation_equations(self, tau: float, y: np.ndarray, k: float) -> np.ndarray:
-        delta_c, delta_b, delta_gamma, theta_c, theta_b, theta_gamma, phi, psi = y
+        return self._perturbation_derivatives(y, k, *self._background_sources(tau))
+    
+    def _batched_perturbation_equations(self, tau: float, y: np.ndarray, k_array: np.ndarray) -> np.ndarray:
+        """All k modes at once; y is mode-major, (n_k, 8) flattened"""
+        Y = y.reshape(len(k_array), 8).T
+        return self._perturbation_derivatives(Y, k_array, *self._background_sources(tau)).T.ravel()
+    
+    def build_source_tables(self, tau_ini: float, tau_rec: float):
+        """
+        Tabulate a, H, τ̇ and S_spatial on a uniform log-τ grid.
         
+        None of them depend on k, so one table per cosmology serves every
+        mode; it is rebuilt when the tensor parameters change. Positive
+        columns are interpolated in log-log, which is exact for power laws
+        such as a ∝ τ; the others linearly in ln τ.
+        """
+        n = self.config.source_table_size
+        key = (astuple(self.params), self.tensor.grid_size, tau_ini, tau_rec, n)
+        if n < 2 or (self._source_tables is not None and self._source_tables['key'] == key):
+            return
+        
+        ln_tau = np.linspace(np.log(tau_ini), np.log(tau_rec), n)
+        values = np.array([self._evaluate_background_sources(tau) for tau in np.exp(ln_tau)])
+        positive = np.all(values > 0, axis=0)
+        values[:, positive] = np.log(values[:, positive])
+        
+        self._source_tables = {
+            'key': key,
+            'ln_tau_min': ln_tau[0],
+            'ln_tau_max': ln_tau[-1],
+            'step': ln_tau[1] - ln_tau[0],
+            'values': values,
+            'positive': positive
+        }
+        logger.info(f"Tabulated background sources on {n} log-τ nodes over [{tau_ini}, {tau_rec}]")
+    
+    def _background_sources(self, tau: float) -> Tuple[float, float, float, float]:
+        """k-independent coefficients at τ, from the source tables when they cover τ"""
+        tables = self._source_tables
+        if tables is None:
+            return self._evaluate_background_sources(tau)
+        
+        ln_tau = np.log(tau)
+        if not tables['ln_tau_min'] <= ln_tau <= tables['ln_tau_max']:
+            return self._evaluate_background_sources(tau)
+        
+        u = (ln_tau - tables['ln_tau_min']) / tables['step']
+        i = min(int(u), len(tables['values']) - 2)
+        w = u - i
+        row = (1 - w) * tables['values'][i] + w * tables['values'][i + 1]
+        row = np.where(tables['positive'], np.exp(row), row)
+        return row[0], row[1], row[2], row[3]
+    
+    def _evaluate_background_sources(self, tau: float) -> Tuple[float, float, float, float]:
+        """k-independent coefficients a, H, τ̇ (Thomson opacity) and S_spatial at τ"""
         a = self._scale_factor(tau)
         H = self._hubble_parameter(tau)
         
@@ -181,7 +489,15 @@ class ChronodynamicTransferFunction:
         n_H = 1.9e-4
         sigma_T = 4.78e-48
         tau_dot = xe * n_H * (1+z)**3 * sigma_T * a
-
+        
+        return a, H, tau_dot, S_spatial
+    
+    @staticmethod
+    def _perturbation_derivatives(y: np.ndarray, k, a: float, H: float,
+                                  tau_dot: float, S_spatial: float) -> np.ndarray:
+        """Right-hand side for one mode (y of shape (8,)) or many (y of shape (8, n_k))"""
+        delta_c, delta_b, delta_gamma, theta_c, theta_b, theta_gamma, phi, psi = y
+        
         phi_dot = -H * phi + (k**2 / (3*a**2)) * (delta_c + delta_b)
         psi_dot = -H * psi
         
@@ -217,64 +533,282 @@ class CMBPredictor:
     def __init__(self, chronodynamic_tensor, config: CMBConfig = None):
         self.tensor = chronodynamic_tensor
         self.config = config or CMBConfig()
-        self.transfer = ChronodynamicTransferFunction(chronodynamic_tensor, config)
+        self.transfer = ChronodynamicTransferFunction(chronodynamic_tensor, self.config)
         
         self.l_array = np.arange(2, self.config.l_max + 1)
+        self._bessel_table = None
+        self._bessel_table_key = None
+        self._spectra_cache = {}  # Spectra by (tensor params, grid, physical config fields)
         
         logger.info("Initialized CMBPredictor")
     
     def compute_power_spectra(self) -> Dict[str, np.ndarray]:
         """
         Compute temperature and polarization power spectra.
+        
+        Spectra are memoized on the tensor parameters and the CMBConfig
+        fields that change their values, so repeated calls,
+        compute_chronodynamic_signatures included, reuse them until either
+        changes; the background is rebuilt along with them. Every call
+        returns its own copy.
+        """
+        cache_key = self._spectra_key()
+        if cache_key in self._spectra_cache:
+            logger.info("Reusing memoized CMB power spectra")
+        else:
+            self._spectra_cache[cache_key] = self._compute_power_spectra()
+        return copy.deepcopy(self._spectra_cache[cache_key])
+    
+    def _spectra_key(self) -> Tuple:
+        config = tuple(getattr(self.config, field.name) for field in fields(self.config)
+                       if field.name not in _EXECUTION_CONFIG_FIELDS)
+        return astuple(self.tensor.params), self.tensor.grid_size, config
+    
+    def _compute_power_spectra(self) -> Dict[str, np.ndarray]:
+        """
+        Project the spectra from freshly solved sources.
+        
+        The sources at recombination are collected per k mode, then every
+        spectrum is projected at once: C_l = Σ_k w_k P(k) S_X S_Y j_l²(kχ),
+        one (n_l × n_k) matrix-vector product with trapezoidal weights in
+        ln k over the modes that solved.
+        
+        With config.l_sample_max_step set, only a sparse set of multipoles
+        is projected and the rest are reconstructed by cubic splines; the
+        result then also holds an 'interpolation_error' per spectrum. The
+        sampling rule is fixed: the error estimate is reported, not used
+        to refine the samples, so check it before relying on sparse runs.
         """
         logger.info("Computing CMB power spectra")
         
-        C_l_TT = np.zeros(len(self.l_array))
-        C_l_TE = np.zeros(len(self.l_array))
-        C_l_EE = np.zeros(len(self.l_array))
+        k_array = self.transfer.k_array
+        S_T, S_E = self.transfer.compute_sources(k_array)
         
-        for i, k in enumerate(self.transfer.k_array):
-            if i % 20 == 0:
-                logger.info(f"Processing k mode {i+1}/{len(self.transfer.k_array)}")
+        solved = np.isfinite(S_T) & np.isfinite(S_E)
+        power = np.where(solved, self._primordial_power_spectrum(k_array), 0.0)
+        S_T, S_E = np.where(solved, S_T, 0.0), np.where(solved, S_E, 0.0)
+        sources = {'TT': power * S_T**2, 'TE': power * S_T * S_E, 'EE': power * S_E**2}
+        
+        l_sampled = self._sampled_multipoles()
+        projection = self._projection_matrix(l_sampled, solved)
+        approximation_error = self._check_approximation(l_sampled, projection, sources, solved)
+        if approximation_error is not None and approximation_error['exact_fallback']:
+            projection = self._projection_matrix(l_sampled, solved, approximate=False)
+        
+        T_CMB = 2.725e6
+        l_factor = l_sampled * (l_sampled + 1) / (2 * np.pi)
+        normalization = T_CMB**2 * (2*np.pi)**2 * l_factor
+        
+        spectra = {name: normalization * (projection @ source) for name, source in sources.items()}
+        
+        if len(l_sampled) == len(self.l_array):
+            result = {'l': self.l_array, **spectra}
+        else:
+            result = {'l': self.l_array}
+            errors = {}
+            for name, D_l in spectra.items():
+                result[name], errors[name] = self._reconstruct_multipoles(l_sampled, D_l)
+            result['interpolation_error'] = errors
             
-            try:
-                perturbations = self.transfer.solve_perturbation_equations(k)
-            except Exception as e:
-                logger.warning(f"Skipping k={k} due to error: {e}")
+            logger.info(f"Projected {len(l_sampled)} of {len(self.l_array)} multipoles, "
+                        f"estimated interpolation error TT {errors['TT']:.2e}")
+        
+        if approximation_error is not None:
+            result['approximation_error'] = approximation_error
+        return result
+    
+    def _projection_matrix(self, l_array: np.ndarray, solved: np.ndarray, approximate: bool = True) -> np.ndarray:
+        """
+        Kernel M_lk with C_l ∝ Σ_k M_lk P(k) S_X S_Y, shape (n_l, n_k).
+        
+        Exact rows are w_k j_l²(kχ); with approximate set, rows from
+        config.l_approximation_switch on use the configured approximation.
+        Columns of failed modes are zero.
+        """
+        k_array = self.transfer.k_array
+        M = np.zeros((len(l_array), len(k_array)))
+        if not np.any(solved):
+            return M
+        
+        approximated = self._approximated_multipoles(l_array) if approximate else np.zeros(len(l_array), dtype=bool)
+        if np.any(~approximated):
+            exact = self._bessel_matrix(l_array[~approximated])[:, solved]**2 * self._log_k_weights(k_array[solved])
+            M[np.ix_(~approximated, solved)] = exact
+        if np.any(approximated):
+            M[np.ix_(approximated, solved)] = self._approximate_kernel(l_array[approximated], k_array[solved])
+        return M
+    
+    def _approximated_multipoles(self, l_array: np.ndarray) -> np.ndarray:
+        """
+        Mask of the multipoles projected approximately.
+        
+        Both approximations evaluate the source at q = ν/χ_rec, so the
+        switch-over multipole must put q inside the k range.
+        """
+        method = self.config.l_approximation
+        if method == 'exact':
+            return np.zeros(len(l_array), dtype=bool)
+        if method not in ('flat_sky', 'limber'):
+            raise ValueError(f"Unknown multipole approximation: {method}")
+        
+        l_switch = self.config.l_approximation_switch
+        l_min = int(np.ceil(self.transfer.k_array[0] * self._comoving_distance_recombination() - 0.5))
+        if l_switch < l_min:
+            raise ValueError(f"{method} projection needs l_approximation_switch >= {l_min} "
+                             f"(k_min χ_rec), got {l_switch}")
+        return l_array >= l_switch
+    
+    def _approximate_kernel(self, l_array: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """
+        High-l replacements of w_k j_l²(kχ) on the k nodes, shape (n_l, n_k).
+        
+        With ν = l + 1/2 and q = ν/χ, the flat-sky limit averages j_l² over
+        its oscillation, j_l²(x) → 1/(2x√(x² - ν²)) for x > ν, and in
+        p = √(k² - q²) the projection becomes the smooth integral
+        ∫ dp F(k)/(2χ²k²), taken by trapezoids on the nodes p(k_i) and
+        p = 0. Limber further takes F at k = q, where ∫ dk j_l²(kχ) = π/(4νχ).
+        
+        Neither has an a-priori error bound for an arbitrary source.
+        Flat-sky holds to about 10⁻³ or better once q is well inside the
+        k range, for sources smooth over Δk ~ 1/χ; Limber needs a radial
+        kernel much broader than the recombination shell and fails for
+        the primary CMB. _check_approximation measures the error from the
+        switch-over l on, and the spectra fall back to the exact
+        projection when it exceeds config.l_approximation_tolerance.
+        """
+        chi = self._comoving_distance_recombination()
+        nu = l_array + 0.5
+        q = nu / chi
+        
+        if self.config.l_approximation == 'limber':
+            return np.pi / (4 * nu * chi)[:, np.newaxis] * self._interpolation_weights(q, k)
+        
+        kernel = np.zeros((len(l_array), len(k)))
+        at_q = self._interpolation_weights(q, k)
+        for row, q_l in enumerate(q):
+            above = k > q_l
+            if not np.any(above):
                 continue
             
-            tau_rec = perturbations['tau'][-1]
-            delta_gamma_rec = perturbations['delta_gamma'][-1]
-            theta_gamma_rec = perturbations['theta_gamma'][-1]
-            phi_rec = perturbations['phi'][-1]
+            p = np.sqrt(k[above]**2 - q_l**2)
+            # The p = 0 node needs F(q), available inside the k range only
+            inside = at_q[row].any()
+            nodes = np.concatenate(([0.0], p)) if inside else p
             
-            S_T = delta_gamma_rec / 4 + phi_rec
-            S_E = theta_gamma_rec / k
+            weights = np.zeros(len(nodes))
+            weights[:-1] += 0.5 * np.diff(nodes)
+            weights[1:] += 0.5 * np.diff(nodes)
             
-            for j, l in enumerate(self.l_array):
-                chi_rec = self._comoving_distance_recombination()
-                x = k * chi_rec
-                j_l = self._spherical_bessel(l, x)
-                P_k = self._primordial_power_spectrum(k)
-                dk = np.diff(self.transfer.k_array)[0] if i < len(self.transfer.k_array)-1 else 0.01
-                
-                C_l_TT[j] += P_k * S_T**2 * j_l**2 * dk
-                C_l_TE[j] += P_k * S_T * S_E * j_l**2 * dk  
-                C_l_EE[j] += P_k * S_E**2 * j_l**2 * dk
-        
-        T_CMB = 2.725e6
-        C_l_TT *= T_CMB**2 * (2*np.pi)**2
-        C_l_TE *= T_CMB**2 * (2*np.pi)**2
-        C_l_EE *= T_CMB**2 * (2*np.pi)**2
+            kernel[row, above] = weights[-len(p):] / (2 * chi**2 * k[above]**2)
+            if inside:
+                kernel[row] += weights[0] / (2 * chi**2 * q_l**2) * at_q[row]
+        return kernel
+    
+    @staticmethod
+    def _interpolation_weights(x: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """Weights on the k nodes of linear interpolation in ln k at each x; zero outside the nodes"""
+        weights = np.zeros((len(x), len(k)))
+        if len(k) < 2:
+            return weights
+        
+        i = np.clip(np.searchsorted(k, x) - 1, 0, len(k) - 2)
+        t = (np.log(x) - np.log(k[i])) / (np.log(k[i + 1]) - np.log(k[i]))
+        inside = (x >= k[0]) & (x <= k[-1])
+        rows = np.flatnonzero(inside)
+        weights[rows, i[inside]] = 1 - t[inside]
+        weights[rows, i[inside] + 1] = t[inside]
+        return weights
+    
+    def _check_approximation(self, l_array: np.ndarray, projection: np.ndarray,
+                             sources: Dict[str, np.ndarray], solved: np.ndarray) -> Optional[Dict]:
+        """
+        Compare the approximated projection with the exact one at a few
+        multipoles spread over the approximated range, the switch-over
+        multipole first.
+        
+        Returns:
+            Checked multipoles, per spectrum the largest deviation relative
+            to the largest exact value, and whether that exceeds
+            config.l_approximation_tolerance so the spectra must be
+            projected exactly; None if nothing is approximated or checked
+        """
+        approximated = np.flatnonzero(self._approximated_multipoles(l_array))
+        n_checks = self.config.l_approximation_checks
+        if len(approximated) == 0 or n_checks < 1 or not np.any(solved):
+            return None
+        
+        rows = approximated[np.unique(np.round(np.linspace(0, len(approximated) - 1, n_checks)).astype(int))]
+        exact = np.zeros((len(rows), projection.shape[1]))
+        exact[:, solved] = self._bessel_matrix(l_array[rows])[:, solved]**2 * self._log_k_weights(self.transfer.k_array[solved])
+        
+        errors = {'l': l_array[rows]}
+        for name, source in sources.items():
+            reference = exact @ source
+            scale = np.max(np.abs(reference))
+            errors[name] = float(np.max(np.abs(projection[rows] @ source - reference)) / scale) if scale > 0 else 0.0
+        
+        worst = max(errors[name] for name in sources)
+        errors['exact_fallback'] = worst > self.config.l_approximation_tolerance
+        message = (f"{self.config.l_approximation} projection from l={self.config.l_approximation_switch}: "
+                   f"largest deviation {worst:.2e} at l={list(errors['l'])}")
+        if errors['exact_fallback']:
+            logger.warning(f"{message} exceeds the tolerance {self.config.l_approximation_tolerance:g}, "
+                           f"projecting every multipole exactly")
+        else:
+            logger.info(message)
+        return errors
+    
+    def _sampled_multipoles(self) -> np.ndarray:
+        """
+        Multipoles to project: all of them, or a sparse set whose gaps grow
+        as l/20 up to config.l_sample_max_step, always including l_max.
+        """
+        max_step = self.config.l_sample_max_step
+        if max_step <= 1:
+            return self.l_array
+        
+        l_max = self.l_array[-1]
+        sampled = [self.l_array[0]]
+        while sampled[-1] < l_max:
+            sampled.append(min(l_max, sampled[-1] + int(np.clip(sampled[-1] // 20, 1, max_step))))
+        return np.array(sampled)
+    
+    def _reconstruct_multipoles(self, l_sampled: np.ndarray, D_l: np.ndarray) -> Tuple[np.ndarray, float]:
+        """
+        Spline of D_l = l(l+1)C_l/2π over every multipole, with an error estimate.
         
-        l_factor = self.l_array * (self.l_array + 1) / (2 * np.pi)
+        The estimate refits every other sample and takes the largest miss at
+        the dropped ones, relative to max |D_l|. Doubling the gaps makes it
+        conservative: the cubic spline error falls as the fourth power of
+        the gap.
         
-        return {
-            'l': self.l_array,
-            'TT': C_l_TT * l_factor,
-            'TE': C_l_TE * l_factor,
-            'EE': C_l_EE * l_factor
-        }
+        Returns:
+            D_l at every multipole and the relative error estimate
+        """
+        D_full = CubicSpline(l_sampled, D_l)(self.l_array)
+        
+        scale = np.max(np.abs(D_l))
+        if len(l_sampled) < 5 or scale == 0:
+            return D_full, 0.0
+        
+        # Keep both ends so the coarse spline only interpolates
+        coarse = np.zeros(len(l_sampled), dtype=bool)
+        coarse[::2] = True
+        coarse[-1] = True
+        miss = CubicSpline(l_sampled[coarse], D_l[coarse])(l_sampled[~coarse]) - D_l[~coarse]
+        return D_full, float(np.max(np.abs(miss)) / scale)
+    
+    @staticmethod
+    def _log_k_weights(k: np.ndarray) -> np.ndarray:
+        """Trapezoidal weights w_k with Σ w_k f(k) ≈ ∫ f dk = ∫ f k d(ln k)"""
+        if len(k) < 2:
+            return np.zeros(len(k))
+        
+        ln_k = np.log(k)
+        weights = np.zeros(len(k))
+        weights[:-1] += 0.5 * np.diff(ln_k)
+        weights[1:] += 0.5 * np.diff(ln_k)
+        return weights * k
     
     def _comoving_distance_recombination(self) -> float:
         z_rec = self.config.z_recombination
@@ -283,6 +817,24 @@ class CMBPredictor:
         chi_rec = c / H0 * 2 * np.sqrt(1 + z_rec)
         return chi_rec
     
+    def _bessel_matrix(self, l_array: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        j_l(k χ_rec) for the multipoles l_array (default: all) and every
+        k mode, shape (n_l, n_k).
+        
+        The table grid is the k grid mapped to x = k χ_rec, so lookups
+        hit grid points; it is computed once per l_max, k grid and χ_rec
+        (which follows H0 and z_recombination), and read from the disk
+        cache when config.bessel_cache_dir is set.
+        """
+        chi_rec = self._comoving_distance_recombination()
+        key = (self.config.l_max, self.config.k_min * chi_rec, self.config.k_max * chi_rec, self.config.n_k)
+        if self._bessel_table is None or self._bessel_table_key != key:
+            self._bessel_table = BesselTable(*key, spacing='log', cache_dir=self.config.bessel_cache_dir)
+            self._bessel_table_key = key
+        l_array = self.l_array if l_array is None else l_array
+        return self._bessel_table(l_array, self.transfer.k_array * chi_rec)
+    
     def _spherical_bessel(self, l: int, x: float) -> float:
         from scipy.special import spherical_jn
         return spherical_jn(l, x)
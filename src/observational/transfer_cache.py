@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Persistent Transfer Function Cache
+==================================
+
+On-disk HDF5 cache of per-k perturbation solutions and recombination
+sources for the Chronodynamic Cosmological Divergence (CCD) CMB
+pipeline. Entries are keyed by a stable hash of every input the solution
+depends on, so reruns with the same cosmology read instead of solve.
+Each entry carries a checksum, and the cache is held under a size limit
+by evicting the least recently used entries.
+
+Author: Aksel Boursier
+Date: August 2025
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+import h5py
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout or the solution it holds changes meaning
+CACHE_FORMAT_VERSION = 1
+
+
+def stable_hash(inputs: Dict) -> str:
+    """
+    SHA-256 of JSON-serialized inputs, independent of key order and process.
+
+    Floats serialize by their shortest round-trip repr, so equal inputs
+    give equal hashes across runs and machines.
+    """
+    payload = json.dumps({'format': CACHE_FORMAT_VERSION, **inputs}, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class TransferCache:
+    """
+    Directory of HDF5 entries, one per (cosmology hash, k).
+
+    Files are written under a temporary name and renamed, so concurrent
+    k-mode workers can store entries without locking and readers never
+    see partial files. Entries that fail their checksum or cannot be read
+    are deleted and reported as misses. A hit refreshes the file's
+    modification time, which orders the LRU eviction. Stores keep a
+    running total of the cache size and only scan the directory to evict
+    once it exceeds max_bytes; the total does not see other processes'
+    writes, so callers sharing the cache call evict() when done.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2**30):
+        self.cache_dir = Path(os.path.expanduser(cache_dir))
+        self.max_bytes = max_bytes
+        self._size = None  # Running total in bytes, measured on the first store
+
+    def path(self, cosmology: str, k: float) -> Path:
+        return self.cache_dir / f"{cosmology[:32]}_k{k:.17g}.h5"
+
+    def load(self, cosmology: str, k: float) -> Optional[Dict[str, np.ndarray]]:
+        """Stored solution of mode k (same keys as solve_perturbation_equations), or None"""
+        entry = self._read(cosmology, k, with_solution=True)
+        return None if entry is None else entry[0]
+
+    def load_sources(self, cosmology: str, k: float) -> Optional[Tuple[float, float]]:
+        """Stored recombination sources (S_T, S_E) of mode k, or None"""
+        entry = self._read(cosmology, k, with_solution=False)
+        return None if entry is None else entry[1]
+
+    def store(self, cosmology: str, k: float, solution: Dict[str, np.ndarray],
+              sources: Tuple[float, float]) -> Path:
+        """Write one mode, evicting old entries if the cache grows beyond max_bytes"""
+        path = self.path(cosmology, k)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {name: np.asarray(values, dtype=float) for name, values in solution.items()}
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with h5py.File(tmp_path, 'w') as f:
+            for name, values in arrays.items():
+                f.create_dataset(name, data=values)
+            f.attrs['format'] = CACHE_FORMAT_VERSION
+            f.attrs['cosmology'] = cosmology
+            f.attrs['k'] = k
+            f.attrs['S_T'], f.attrs['S_E'] = sources
+            f.attrs['checksum'] = self._checksum(arrays, sources)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += path.stat().st_size - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+        return path
+
+    def evict(self) -> int:
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            Number of entries deleted
+        """
+        entries = []
+        for path in self.cache_dir.glob('*.h5'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        n_evicted = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            n_evicted += 1
+
+        self._size = total
+        if n_evicted:
+            logger.info(f"Evicted {n_evicted} transfer cache entries from {self.cache_dir}")
+        return n_evicted
+
+    def size(self) -> int:
+        """Total bytes of the stored entries"""
+        return sum(path.stat().st_size for path in self.cache_dir.glob('*.h5'))
+
+    def _read(self, cosmology: str, k: float, with_solution: bool):
+        path = self.path(cosmology, k)
+        if not path.exists():
+            return None
+
+        try:
+            with h5py.File(path, 'r') as f:
+                if f.attrs['format'] != CACHE_FORMAT_VERSION or f.attrs['cosmology'] != cosmology \
+                        or f.attrs['k'] != k:
+                    raise ValueError("entry does not match its key")
+                sources = (float(f.attrs['S_T']), float(f.attrs['S_E']))
+                arrays = {name: f[name][()] for name in f.keys()}
+                if f.attrs['checksum'] != self._checksum(arrays, sources):
+                    raise ValueError("checksum mismatch")
+        except FileNotFoundError:
+            # Evicted by another process since the existence check
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding corrupt transfer cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return (arrays if with_solution else None), sources
+
+    @staticmethod
+    def _checksum(arrays: Dict[str, np.ndarray], sources: Tuple[float, float]) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(arrays):
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(arrays[name], dtype=float).tobytes())
+        digest.update(np.asarray(sources, dtype=float).tobytes())
+        return digest.hexdigest()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the solver benchmark suite
+"""
+
+import pytest
+import numpy as np
+import json
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from numerical.differential_solvers import SolverConfig
+from numerical.benchmarks import SolverBenchmark, BenchmarkConfig, harmonic_case
+
+
+@pytest.fixture
+def benchmark(tmp_path):
+    return SolverBenchmark(BenchmarkConfig(
+        repeats=1,
+        history_path=str(tmp_path / 'history.json'),
+        baseline_path=str(tmp_path / 'baseline.json')
+    ))
+
+
+@pytest.fixture
+def fast_case():
+    return harmonic_case(SolverConfig(method='RK45', rtol=1e-8, atol=1e-10, max_step=np.inf))
+
+
+class TestSolverBenchmark:
+    """Test suite for SolverBenchmark class"""
+
+    def test_case_metrics(self, benchmark, fast_case):
+        metrics = benchmark.run_case(fast_case)
+
+        assert metrics['wall_time'] > 0
+        assert metrics['nfev'] == (metrics['accepted_steps'] + metrics['rejected_steps']) * 6 + 2
+        assert metrics['peak_memory'] > 0
+
+    def test_history_appends_runs(self, benchmark, fast_case):
+        benchmark.append_history(benchmark.run([fast_case]))
+        benchmark.append_history(benchmark.run([fast_case]))
+
+        with open(benchmark.config.history_path) as f:
+            history = json.load(f)
+        assert len(history) == 2
+        assert 'harmonic' in history[1]['results']
+
+    def test_identical_run_has_no_regressions(self, benchmark, fast_case):
+        record = benchmark.run([fast_case])
+        benchmark.save_baseline(record)
+
+        assert benchmark.compare(record, benchmark.load_baseline()) == []
+
+    def test_flags_regressions(self, benchmark, fast_case):
+        """A tighter tolerance costs evaluations and is flagged"""
+        benchmark.save_baseline(benchmark.run([fast_case]))
+
+        tighter = harmonic_case(SolverConfig(method='RK45', rtol=1e-11, atol=1e-13, max_step=np.inf))
+        regressions = benchmark.compare(benchmark.run([tighter]), benchmark.load_baseline())
+
+        flagged = {r['metric'] for r in regressions}
+        assert {'nfev', 'accepted_steps'} <= flagged
+        assert all(r['ratio'] > 1 for r in regressions)
+
+    def test_wall_time_needs_same_environment(self, benchmark, fast_case):
+        """Slower wall times count only against a baseline from this environment"""
+        record = benchmark.run([fast_case])
+        slower = json.loads(json.dumps(record))
+        slower['results']['harmonic']['wall_time'] *= 10
+        slower['results']['harmonic']['peak_memory'] *= 10
+
+        flagged = {r['metric'] for r in benchmark.compare(slower, record)}
+        assert flagged == {'wall_time', 'peak_memory'}
+
+        record['environment']['fingerprint'] = 'another-machine'
+        assert benchmark.compare(slower, record) == []
+
+    def test_missing_baseline(self, benchmark):
+        assert benchmark.load_baseline() is None
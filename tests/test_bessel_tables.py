@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the spherical Bessel tables
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scipy.special import spherical_jn
+import observational.bessel_tables as bessel_tables
+from observational.bessel_tables import spherical_jn_table, BesselTable
+
+
+@pytest.fixture(autouse=True)
+def clear_table_cache():
+    bessel_tables._TABLE_CACHE.clear()
+    yield
+    bessel_tables._TABLE_CACHE.clear()
+
+
+class TestSphericalJnTable:
+    """Test suite for the vectorized recurrence"""
+
+    def test_matches_scipy_across_regimes(self):
+        """Both recurrences, including x around l_max and x = 0"""
+        l_max = 600
+        x = np.array([0.0, 1e-3, 0.5, 3.0, 50.0, 599.5, 600.0, 601.0, 5000.0, 3e5])
+        l = np.arange(l_max + 1)
+
+        table = spherical_jn_table(l_max, x)
+        reference = spherical_jn(l[:, np.newaxis], x[np.newaxis, :])
+
+        scale = np.abs(reference).max(axis=0)
+        assert np.all(np.abs(table - reference).max(axis=0) <= 1e-12 * scale)
+
+
+class TestBesselTable:
+    """Test suite for BesselTable class"""
+
+    def test_interpolation_between_grid_points(self):
+        table = BesselTable(50, 0.0, 100.0, 2001)
+        x = np.random.default_rng(0).uniform(0.0, 100.0, 300)
+        l = np.arange(51)
+
+        values = table(l, x)
+
+        assert values.shape == (51, 300)
+        np.testing.assert_allclose(values, spherical_jn(l[:, np.newaxis], x), atol=1e-8)
+
+    def test_grid_points_are_exact(self):
+        table = BesselTable(100, 1.0, 1e4, 64, spacing='log')
+        l = np.array([2, 10, 100])
+
+        np.testing.assert_allclose(table(l, table.x), spherical_jn(l[:, np.newaxis], table.x),
+                                   rtol=1e-12, atol=1e-300)
+
+    def test_disk_cache_round_trip(self, tmp_path, monkeypatch):
+        table = BesselTable(20, 0.0, 30.0, 301, cache_dir=str(tmp_path))
+        assert table.cache_path.exists()
+
+        bessel_tables._TABLE_CACHE.clear()
+        monkeypatch.setattr(bessel_tables, 'spherical_jn_table',
+                            lambda *args: pytest.fail("table recomputed despite the cache"))
+        reloaded = BesselTable(20, 0.0, 30.0, 301, cache_dir=str(tmp_path))
+
+        assert isinstance(reloaded.values, np.memmap)
+        np.testing.assert_array_equal(reloaded.values, table.values)
+
+    def test_out_of_range_requests(self):
+        table = BesselTable(10, 0.0, 10.0, 101)
+        with pytest.raises(ValueError):
+            table([11], [1.0])
+        with pytest.raises(ValueError):
+            table([2], [11.0])
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CMB predictions
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scipy.special import spherical_jn
+from core.chronodynamic_tensor import ChronodynamicTensor, CosmologicalParams
+from observational.cmb_predictions import ChronodynamicTransferFunction, CMBPredictor, CMBConfig
+from observational.transfer_cache import TransferCache
+
+
+def analytic_background(self):
+    """a(τ) = τ instead of the full Friedmann integration"""
+    def a_interp_func(tau, nu=0):
+        tau = np.asarray(tau, dtype=float)
+        if nu == 0:
+            return np.array([tau, np.ones_like(tau)])
+        return np.array([np.ones_like(tau), np.zeros_like(tau)])
+
+    self.a_interp_func = a_interp_func
+    self.H_interp_func = lambda tau: self.a_interp_func(tau, 1)[0] / self.a_interp_func(tau, 0)[0]
+
+
+def scaled_background(self):
+    """a(τ) = (H0/67.4) τ, a background that follows the tensor parameters"""
+    scale = self.params.H0 / 67.4
+
+    def a_interp_func(tau, nu=0):
+        tau = np.asarray(tau, dtype=float)
+        if nu == 0:
+            return np.array([scale * tau, scale * np.ones_like(tau)])
+        return np.array([scale * np.ones_like(tau), np.zeros_like(tau)])
+
+    self.a_interp_func = a_interp_func
+    self.H_interp_func = lambda tau: self.a_interp_func(tau, 1)[0] / self.a_interp_func(tau, 0)[0]
+
+
+def synthetic_perturbations(self, k):
+    """Smooth stand-in transfer functions at recombination"""
+    tau = np.array([1e-4, 1e-3])
+    return {
+        'tau': tau, 'delta_c': np.zeros(2), 'delta_b': np.zeros(2),
+        'delta_gamma': np.array([0.0, 1e-5 * np.cos(300 * k)]),
+        'theta_c': np.zeros(2), 'theta_b': np.zeros(2),
+        'theta_gamma': np.array([0.0, 1e-7 * np.sin(300 * k)]),
+        'phi': np.array([0.0, 3e-6 / (1 + k)]), 'psi': np.zeros(2)
+    }
+
+
+@pytest.fixture
+def predictor(monkeypatch, tmp_path):
+    monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', analytic_background)
+    monkeypatch.setattr(ChronodynamicTransferFunction, 'solve_perturbation_equations', synthetic_perturbations)
+    config = CMBConfig(l_max=300, k_min=1e-4, k_max=0.05, n_k=40, bessel_cache_dir=str(tmp_path),
+                       source_table_size=0)
+    return CMBPredictor(ChronodynamicTensor(CosmologicalParams(), grid_size=4), config)
+
+
+@pytest.fixture
+def dense_predictor(monkeypatch, tmp_path):
+    """Dense enough in k for the projected spectra to be smooth in l"""
+    monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', analytic_background)
+    monkeypatch.setattr(ChronodynamicTransferFunction, 'solve_perturbation_equations', synthetic_perturbations)
+    config = CMBConfig(l_max=300, k_min=1e-4, k_max=2e-3, n_k=1000, bessel_cache_dir=str(tmp_path),
+                       source_table_size=0)
+    return CMBPredictor(ChronodynamicTensor(CosmologicalParams(), grid_size=4), config)
+
+
+def reference_spectra(predictor, skip=()):
+    """Scalar double loop with scipy's spherical_jn and trapezoidal ∫ k d(ln k)"""
+    k_array = np.array([k for k in predictor.transfer.k_array if k not in skip])
+    chi_rec = predictor._comoving_distance_recombination()
+    C_l = {key: np.zeros(len(predictor.l_array)) for key in ('TT', 'TE', 'EE')}
+
+    for i, k in enumerate(k_array):
+        p = synthetic_perturbations(None, k)
+        S_T = p['delta_gamma'][-1] / 4 + p['phi'][-1]
+        S_E = p['theta_gamma'][-1] / k
+        dk = 0.5 * k * np.log(k_array[min(i + 1, len(k_array) - 1)] / k_array[max(i - 1, 0)])
+        weight = predictor._primordial_power_spectrum(k) * dk
+        j_l = spherical_jn(predictor.l_array, k * chi_rec)
+        C_l['TT'] += weight * S_T**2 * j_l**2
+        C_l['TE'] += weight * S_T * S_E * j_l**2
+        C_l['EE'] += weight * S_E**2 * j_l**2
+
+    factor = (2.725e6)**2 * (2*np.pi)**2 * predictor.l_array * (predictor.l_array + 1) / (2*np.pi)
+    return {key: value * factor for key, value in C_l.items()}
+
+
+class TestCMBPredictor:
+    """Test suite for CMBPredictor class"""
+
+    def test_power_spectra_use_bessel_table(self, predictor):
+        spectra = predictor.compute_power_spectra()
+        reference = reference_spectra(predictor)
+
+        for key in ('TT', 'TE', 'EE'):
+            np.testing.assert_allclose(spectra[key], reference[key], rtol=1e-10, atol=1e-30)
+        assert predictor._bessel_table.cache_path.exists()
+
+    def test_bessel_table_follows_distance_and_grid(self, predictor):
+        """The table is rebuilt when χ_rec or l_max change, never cached on disk by default"""
+        assert CMBConfig().bessel_cache_dir is None
+        predictor._bessel_matrix()
+        first = predictor._bessel_table
+
+        predictor._bessel_matrix()
+        assert predictor._bessel_table is first
+
+        predictor.config.z_recombination = 1000.0
+        predictor.config.l_max = 350
+        predictor.l_array = np.arange(2, 351)
+        chi_rec = predictor._comoving_distance_recombination()
+        l_array = np.array([2, 100, 350])
+        np.testing.assert_allclose(predictor._bessel_matrix(l_array),
+                                   spherical_jn(l_array[:, np.newaxis], predictor.transfer.k_array * chi_rec),
+                                   rtol=1e-10, atol=1e-15)
+        assert predictor._bessel_table is not first
+
+    def test_failed_modes_leave_the_quadrature(self, predictor, monkeypatch):
+        """Skipped k modes are dropped and the weights rebuilt on the rest"""
+        skip = set(predictor.transfer.k_array[[3, 17]])
+
+        def failing(self, k):
+            if k in skip:
+                raise RuntimeError("integration failed")
+            return synthetic_perturbations(self, k)
+
+        monkeypatch.setattr(ChronodynamicTransferFunction, 'solve_perturbation_equations', failing)
+        spectra = predictor.compute_power_spectra()
+        reference = reference_spectra(predictor, skip=skip)
+
+        for key in ('TT', 'TE', 'EE'):
+            np.testing.assert_allclose(spectra[key], reference[key], rtol=1e-10, atol=1e-30)
+
+    @pytest.mark.parametrize('fail', [False, True])
+    def test_parallel_sources_match_serial(self, predictor, monkeypatch, fail):
+        """Worker pool keeps k order and skips failed modes"""
+        skip = set(predictor.transfer.k_array[[5]]) if fail else set()
+
+        def solve(self, k):
+            if k in skip:
+                raise RuntimeError("integration failed")
+            return synthetic_perturbations(self, k)
+
+        monkeypatch.setattr(ChronodynamicTransferFunction, 'solve_perturbation_equations', solve)
+        serial = predictor.transfer.compute_sources()
+        predictor.transfer.config.max_workers = 2
+        parallel = predictor.transfer.compute_sources()
+
+        np.testing.assert_array_equal(parallel[0], serial[0])
+        np.testing.assert_array_equal(parallel[1], serial[1])
+        assert np.isnan(parallel[0][5]) == fail
+
+    def test_sampled_multipoles(self, predictor):
+        assert np.array_equal(predictor._sampled_multipoles(), predictor.l_array)
+
+        predictor.config.l_sample_max_step = 40
+        predictor.l_array = np.arange(2, 2501)
+        l_sampled = predictor._sampled_multipoles()
+        gaps = np.diff(l_sampled)
+
+        assert l_sampled[0] == 2 and l_sampled[-1] == 2500
+        assert np.all(gaps[l_sampled[:-1] < 40] == 1)
+        assert 1 <= gaps.min() and gaps.max() <= 40
+        assert len(l_sampled) < len(predictor.l_array) / 10
+
+    def test_sparse_multipoles_reconstruct_spectra(self, dense_predictor):
+        """Spline through the sampled multipoles stays within its error estimate"""
+        predictor = dense_predictor
+        full = predictor.compute_power_spectra()
+        assert 'interpolation_error' not in full
+
+        predictor.config.l_sample_max_step = 10
+        sparse = predictor.compute_power_spectra()
+        sampled = np.isin(predictor.l_array, predictor._sampled_multipoles())
+        assert sampled.sum() < len(predictor.l_array) / 3
+
+        np.testing.assert_array_equal(sparse['l'], full['l'])
+        for key in ('TT', 'TE', 'EE'):
+            np.testing.assert_allclose(sparse[key][sampled], full[key][sampled], rtol=1e-12)
+            error = np.max(np.abs(sparse[key] - full[key])) / np.max(np.abs(full[key]))
+            assert error <= sparse['interpolation_error'][key] < 1e-2
+
+    def test_flat_sky_projection(self, dense_predictor):
+        predictor = dense_predictor
+        exact = predictor.compute_power_spectra()
+        assert 'approximation_error' not in exact
+
+        predictor.config.l_approximation = 'flat_sky'
+        predictor.config.l_approximation_switch = 100
+        approximate = predictor.compute_power_spectra()
+        high = predictor.l_array >= 100
+
+        for key in ('TT', 'TE', 'EE'):
+            np.testing.assert_array_equal(approximate[key][~high], exact[key][~high])
+            error = np.max(np.abs(approximate[key][high] - exact[key][high])) / np.max(np.abs(exact[key][high]))
+            assert error < 1e-3
+            assert approximate['approximation_error'][key] < 1e-3
+            # The bound holds at the switch-over multipole itself
+            at_switch = predictor.l_array == 100
+            assert abs(approximate[key][at_switch] - exact[key][at_switch]) < 1e-3 * np.max(np.abs(exact[key][high]))
+        np.testing.assert_array_equal(approximate['approximation_error']['l'], [100, 200, 300])
+        assert not approximate['approximation_error']['exact_fallback']
+
+    def test_limber_self_check_falls_back_on_thin_shell(self, dense_predictor, caplog):
+        """Limber assumes a broad radial kernel; the self-check catches the misfit"""
+        exact = dense_predictor.compute_power_spectra()
+        dense_predictor.config.l_approximation = 'limber'
+        dense_predictor.config.l_approximation_switch = 100
+
+        with caplog.at_level('WARNING', logger='observational.cmb_predictions'):
+            spectra = dense_predictor.compute_power_spectra()
+
+        assert spectra['approximation_error']['TT'] > dense_predictor.config.l_approximation_tolerance
+        assert spectra['approximation_error']['exact_fallback']
+        assert any('limber projection' in record.message for record in caplog.records)
+        for key in ('TT', 'TE', 'EE'):
+            np.testing.assert_allclose(spectra[key], exact[key], rtol=1e-12)
+
+    @pytest.mark.parametrize('method', ['flat_sky', 'limber'])
+    def test_switch_below_k_range_rejected(self, predictor, method):
+        """At low l, q = ν/χ falls below k_min where the approximations have no source"""
+        l_min = predictor.transfer.k_array[0] * predictor._comoving_distance_recombination()
+        predictor.config.l_approximation = method
+        predictor.config.l_approximation_switch = int(l_min) - 2
+        with pytest.raises(ValueError, match='l_approximation_switch'):
+            predictor.compute_power_spectra()
+
+    def test_limber_kernel_sum_rule(self, predictor):
+        """On a constant source Limber reproduces ∫ dk j_l²(kχ) = π/(4νχ)"""
+        predictor.config.l_approximation = 'limber'
+        chi = predictor._comoving_distance_recombination()
+        l_array = np.array([100, 250])
+        k = predictor.transfer.k_array
+
+        kernel = predictor._approximate_kernel(l_array, k)
+        np.testing.assert_allclose(kernel.sum(axis=1), np.pi / (4 * (l_array + 0.5) * chi), rtol=1e-12)
+
+    def test_unknown_approximation(self, predictor):
+        predictor.config.l_approximation = 'born'
+        with pytest.raises(ValueError, match="Unknown multipole approximation"):
+            predictor.compute_power_spectra()
+
+    def test_spectra_are_memoized(self, predictor, monkeypatch):
+        calls = []
+        compute_sources = ChronodynamicTransferFunction.compute_sources
+        monkeypatch.setattr(ChronodynamicTransferFunction, 'compute_sources',
+                            lambda self, k_array=None: calls.append(k_array) or compute_sources(self, k_array))
+
+        spectra = predictor.compute_power_spectra()
+        signatures = predictor.compute_chronodynamic_signatures()
+        assert len(calls) == 1
+        np.testing.assert_array_equal(signatures['delta_TT'], spectra['TT'] - predictor._compute_standard_cmb()['TT'])
+
+        # Callers get copies; changing one leaves the memoized spectra intact
+        reference = spectra['TT'].copy()
+        spectra['TT'][:] = 0.0
+        np.testing.assert_array_equal(predictor.compute_power_spectra()['TT'], reference)
+
+        # Execution settings reuse the spectra
+        predictor.config.max_workers = 2
+        predictor.config.bessel_cache_dir = None
+        predictor.compute_power_spectra()
+        assert len(calls) == 1
+
+        # Changing the configuration or the tensor parameters recomputes
+        predictor.config.l_approximation = 'flat_sky'
+        predictor.compute_power_spectra()
+        assert len(calls) == 2
+        predictor.tensor.params.S_chrono = 0.5
+        predictor.compute_power_spectra()
+        assert len(calls) == 3
+
+    def test_parameter_change_matches_fresh_predictor(self, monkeypatch):
+        """Recomputed spectra rebuild the background, tables and sources for the new parameters"""
+        monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', scaled_background)
+        config = CMBConfig(l_max=60, k_min=1e-4, k_max=0.02, n_k=8, source_table_size=256)
+
+        predictor = CMBPredictor(ChronodynamicTensor(CosmologicalParams(), grid_size=4), config)
+        before = predictor.compute_power_spectra()
+        predictor.tensor.params.H0 = 70.0
+        after = predictor.compute_power_spectra()
+
+        fresh = CMBPredictor(ChronodynamicTensor(CosmologicalParams(H0=70.0), grid_size=4), CMBConfig(**vars(config)))
+        expected = fresh.compute_power_spectra()
+        assert not np.allclose(before['TT'], expected['TT'])
+        for key in ('TT', 'TE', 'EE'):
+            np.testing.assert_allclose(after[key], expected[key], rtol=1e-12)
+
+    def test_log_k_weights(self):
+        """Exact for f = 1/k (constant in ln k), second order for f = 1"""
+        k = np.logspace(-4, 0, 400)
+        weights = CMBPredictor._log_k_weights(k)
+
+        assert np.sum(weights / k) == pytest.approx(np.log(1e4), rel=1e-12)
+        assert np.sum(weights) == pytest.approx(1.0 - 1e-4, rel=1e-4)
+
+
+@pytest.fixture
+def transfer(monkeypatch):
+    """Transfer function on the analytic background, with the real perturbation system"""
+    monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', analytic_background)
+    config = CMBConfig(k_min=1e-4, k_max=0.03, n_k=12, source_table_size=512)
+    return ChronodynamicTransferFunction(ChronodynamicTensor(CosmologicalParams(), grid_size=4), config)
+
+
+class TestChronodynamicTransferFunction:
+    """Test suite for ChronodynamicTransferFunction class"""
+
+    def test_batched_modes_match_individual_solves(self, transfer):
+        batched = transfer.solve_perturbation_equations_batched()
+
+        for i, k in enumerate(transfer.k_array):
+            single = transfer.solve_perturbation_equations(k)
+            for name in ('delta_gamma', 'theta_gamma', 'phi'):
+                # Both runs use LSODA with atol=1e-7, but different step sequences
+                np.testing.assert_allclose(batched[name][i], single[name], rtol=1e-4, atol=5e-7)
+        np.testing.assert_array_equal(batched['tau'], single['tau'])
+
+    def test_batched_sources_fall_back_per_mode(self, transfer, monkeypatch):
+        """A failed batched integration falls back to per-mode solves"""
+        reference = transfer.compute_sources()
+
+        def failing(self, k_array=None):
+            raise RuntimeError("shared step size collapsed")
+
+        monkeypatch.setattr(ChronodynamicTransferFunction, 'solve_perturbation_equations_batched', failing)
+        transfer.config.batched_modes = True
+        S_T, S_E = transfer.compute_sources()
+
+        np.testing.assert_array_equal(S_T, reference[0])
+        np.testing.assert_array_equal(S_E, reference[1])
+
+    def test_source_tables_match_direct_evaluation(self, transfer):
+        tau_ini, tau_rec, _ = transfer._perturbation_span()
+        tau = np.geomspace(tau_ini, tau_rec, 37)[1:-1] * 1.001
+        # x_e jumps at z = 1200; linear interpolation in ln τ̇ only holds away from it
+        step = transfer._source_tables['step']
+        smooth = np.abs(np.log(tau * 1201)) > 2 * step
+        assert smooth.sum() > 30
+
+        for t, is_smooth in zip(tau, smooth):
+            tabulated = transfer._background_sources(t)
+            direct = transfer._evaluate_background_sources(t)
+            # a = τ and H = 1/τ are power laws: exact in log-log
+            assert tabulated[0] == pytest.approx(direct[0], rel=1e-12)
+            assert tabulated[1] == pytest.approx(direct[1], rel=1e-12)
+            if is_smooth:
+                assert tabulated[2] == pytest.approx(direct[2], rel=1e-4)
+            assert tabulated[3] == pytest.approx(direct[3], rel=1e-4, abs=1e-12)
+
+    def test_source_tables_follow_the_cosmology(self, transfer, monkeypatch):
+        """Tables built for one set of parameters are not served for another"""
+        evaluate = ChronodynamicTransferFunction._evaluate_background_sources
+
+        def sources(self, tau):
+            a, H, tau_dot, _ = evaluate(self, tau)
+            return a, H, tau_dot, self.params.S_chrono * tau
+
+        monkeypatch.setattr(ChronodynamicTransferFunction, '_evaluate_background_sources', sources)
+        tau_ini, tau_rec, _ = transfer._perturbation_span()
+        t = np.sqrt(tau_ini * tau_rec)
+        before = transfer._background_sources(t)[3]
+
+        transfer.params.S_chrono = 0.5
+        transfer._perturbation_span()
+        assert transfer._background_sources(t)[3] == pytest.approx(0.5 * before, rel=1e-6)
+
+    def test_tables_replace_tensor_evaluations(self, transfer, monkeypatch):
+        """Solves read the tables and agree with untabulated solves"""
+        k = transfer.k_array[6]
+        transfer._perturbation_span()
+
+        calls = []
+        original = transfer.tensor.compute_tensor_components
+        monkeypatch.setattr(transfer.tensor, 'compute_tensor_components',
+                            lambda *args: calls.append(args) or original(*args))
+        tabulated = transfer.solve_perturbation_equations(k)
+        assert calls == []
+
+        transfer.config.source_table_size = 0
+        transfer._source_tables = None
+        direct = transfer.solve_perturbation_equations(k)
+        assert len(calls) > 0
+        for name in ('delta_gamma', 'theta_gamma', 'phi'):
+            np.testing.assert_allclose(tabulated[name], direct[name], rtol=1e-4, atol=5e-7)
+
+    def test_cosmology_hash(self, transfer):
+        reference = transfer.cosmology_hash()
+        assert transfer.cosmology_hash() == reference
+
+        def other(params=None, **config):
+            tensor = ChronodynamicTensor(params or CosmologicalParams(), grid_size=4)
+            return ChronodynamicTransferFunction(tensor, CMBConfig(**{**vars(transfer.config), **config}))
+
+        # Projection settings do not change the per-k solutions
+        assert other(l_max=1000, max_workers=4).cosmology_hash() == reference
+        assert other(z_recombination=1100.0).cosmology_hash() != reference
+        assert other(CosmologicalParams(S_chrono=0.5)).cosmology_hash() != reference
+
+    def test_transfer_cache_follows_parameter_changes(self, monkeypatch, tmp_path):
+        """Changing the parameters in place neither reads nor writes entries of the old cosmology"""
+        monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', scaled_background)
+        config = CMBConfig(k_min=1e-4, k_max=0.03, n_k=4, source_table_size=256, transfer_cache_dir=str(tmp_path))
+        transfer = ChronodynamicTransferFunction(ChronodynamicTensor(CosmologicalParams(), grid_size=4), config)
+        transfer.compute_sources()
+
+        transfer.params.H0 = 70.0
+        S_T, S_E = transfer.compute_sources()
+        assert len(list(tmp_path.glob('*.h5'))) == 8
+
+        fresh = ChronodynamicTransferFunction(ChronodynamicTensor(CosmologicalParams(H0=70.0), grid_size=4),
+                                              CMBConfig(**{**vars(config), 'transfer_cache_dir': None}))
+        expected = fresh.compute_sources()
+        assert fresh.cosmology_hash() == transfer.cosmology_hash()
+        np.testing.assert_allclose(S_T, expected[0], rtol=1e-12)
+        np.testing.assert_allclose(S_E, expected[1], rtol=1e-12)
+
+    @pytest.mark.parametrize('batched', [False, True])
+    def test_transfer_cache_serves_reruns(self, monkeypatch, tmp_path, batched):
+        monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', analytic_background)
+        config = CMBConfig(k_min=1e-4, k_max=0.03, n_k=6, source_table_size=512, batched_modes=batched,
+                           transfer_cache_dir=str(tmp_path))
+        tensor = ChronodynamicTensor(CosmologicalParams(), grid_size=4)
+
+        solves = []
+        solve = ChronodynamicTransferFunction._solve_perturbation_equations
+        monkeypatch.setattr(ChronodynamicTransferFunction, '_solve_perturbation_equations',
+                            lambda self, k: solves.append(k) or solve(self, k))
+
+        evictions = []
+        evict = TransferCache.evict
+        monkeypatch.setattr(TransferCache, 'evict', lambda self: evictions.append(1) or evict(self))
+
+        first = ChronodynamicTransferFunction(tensor, config)
+        S_T, S_E = first.compute_sources()
+        assert len(list(tmp_path.glob('*.h5'))) == 6
+        # One trim for the whole run, not one per stored mode
+        assert len(evictions) == 1
+
+        # A new run with the same inputs reads every mode
+        solves.clear()
+        rerun = ChronodynamicTransferFunction(tensor, config)
+        cached = rerun.compute_sources()
+        assert solves == []
+        np.testing.assert_array_equal(cached[0], S_T)
+        np.testing.assert_array_equal(cached[1], S_E)
+
+        k = rerun.k_array[2]
+        perturbations = rerun.solve_perturbation_equations(k)
+        assert solves == []
+        assert rerun._sources(perturbations, k) == pytest.approx((S_T[2], S_E[2]), rel=1e-15)
+
+    def test_cache_miss_reads_the_entry_once(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(ChronodynamicTransferFunction, '_precompute_background', analytic_background)
+        config = CMBConfig(k_min=1e-4, k_max=0.03, n_k=6, source_table_size=512,
+                           transfer_cache_dir=str(tmp_path))
+        transfer = ChronodynamicTransferFunction(ChronodynamicTensor(CosmologicalParams(), grid_size=4), config)
+
+        reads = []
+        for name in ('load', 'load_sources'):
+            read = getattr(TransferCache, name)
+            monkeypatch.setattr(TransferCache, name,
+                                lambda self, *args, name=name, read=read: reads.append(name) or read(self, *args))
+
+        k = transfer.k_array[2]
+        S_T, S_E = transfer.recombination_sources(k)
+        assert reads == ['load_sources']
+        assert transfer.recombination_sources(k) == pytest.approx((S_T, S_E), rel=1e-15)
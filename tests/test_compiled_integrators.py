@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the compiled small-system integrators
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scipy.integrate import solve_ivp
+from numerical.compiled_integrators import CompiledIntegrator, CompiledSolverConfig
+
+
+def harmonic(tau, y):
+    return np.array([y[1], -y[0]])
+
+
+FREQUENCIES = {'omega': 1.0}
+
+
+def untyped_harmonic(tau, y):
+    """Plain function numba cannot type: it reads a global dict"""
+    omega = FREQUENCIES['omega']
+    return np.array([y[1], -omega**2 * y[0]])
+
+
+class HarmonicSystem:
+    """Bound-method right-hand side that numba cannot compile"""
+
+    def rhs(self, tau, y):
+        return np.array([y[1], -y[0]])
+
+
+class TestCompiledIntegrator:
+    """Test suite for CompiledIntegrator class"""
+
+    @pytest.mark.parametrize('method', ['RK45', 'DOP853'])
+    def test_embedded_methods_match_scipy(self, method):
+        """Same tableau and step control as scipy give the same steps"""
+        integrator = CompiledIntegrator(CompiledSolverConfig(method=method, rtol=1e-10, atol=1e-12))
+        result = integrator.solve(harmonic, (0.0, 10.0), np.array([1.0, 0.0]))
+        reference = solve_ivp(harmonic, (0.0, 10.0), [1.0, 0.0], method=method, rtol=1e-10, atol=1e-12)
+
+        assert np.isclose(result['y'][0, -1], np.cos(10.0), atol=1e-8)
+        assert abs(result['n_accepted'] - (len(reference.t) - 1)) <= 1
+        assert np.allclose(result['y'][:, -1], reference.y[:, -1], atol=1e-10)
+
+    @pytest.mark.parametrize('method', ['RK45', 'DOP853'])
+    def test_nfev_matches_scipy(self, method):
+        """f(τ0) is shared with the initial step heuristic and counted once"""
+        integrator = CompiledIntegrator(CompiledSolverConfig(method=method, rtol=1e-8, atol=1e-10))
+        result = integrator.solve(harmonic, (0.0, 10.0), np.array([1.0, 0.0]))
+        reference = solve_ivp(harmonic, (0.0, 10.0), [1.0, 0.0], method=method, rtol=1e-8, atol=1e-10)
+
+        assert result['n_accepted'] == len(reference.t) - 1
+        assert result['nfev'] == reference.nfev
+
+    def test_rk4_fourth_order(self):
+        """Halving the step divides the RK4 error by about 16"""
+        errors = []
+        for n_steps in (50, 100):
+            integrator = CompiledIntegrator(CompiledSolverConfig(method='RK4', n_steps=n_steps))
+            result = integrator.solve(harmonic, (0.0, 5.0), np.array([1.0, 0.0]))
+            errors.append(abs(result['y'][0, -1] - np.cos(5.0)))
+
+        assert 14 < errors[0] / errors[1] < 18
+
+    def test_python_fallback_and_dense_output(self):
+        """Uncompilable right-hand sides run in Python; tau_eval is interpolated"""
+        tau_eval = np.linspace(0.0, 5.0, 11)
+        integrator = CompiledIntegrator(CompiledSolverConfig(method='DOP853', rtol=1e-10, atol=1e-12,
+                                                             max_step=0.1))
+        result = integrator.solve(HarmonicSystem().rhs, (0.0, 5.0), np.array([1.0, 0.0]), tau_eval=tau_eval)
+
+        assert result['y'].shape == (2, 11)
+        assert np.allclose(result['y'][0], np.cos(tau_eval), atol=1e-6)
+
+    def test_compile_failure_is_cached(self, caplog):
+        """Only the first solve tries numba; later solves go straight to Python"""
+        integrator = CompiledIntegrator(CompiledSolverConfig(method='RK45', rtol=1e-10, atol=1e-12))
+
+        with caplog.at_level('WARNING', logger='numerical.compiled_integrators'):
+            first = integrator.solve(untyped_harmonic, (0.0, 5.0), np.array([1.0, 0.0]))
+            second = integrator.solve(untyped_harmonic, (0.0, 5.0), np.array([1.0, 0.0]))
+
+        assert caplog.text.count('numba could not compile') == 1
+        assert CompiledIntegrator.compile_rhs(untyped_harmonic) is untyped_harmonic
+        np.testing.assert_array_equal(first['y'], second['y'])
+        assert np.isclose(second['y'][0, -1], np.cos(5.0), atol=1e-8)
+
+    def test_long_run_grows_buffers(self):
+        """More accepted steps than the initial buffer"""
+        integrator = CompiledIntegrator(CompiledSolverConfig(method='RK45', max_step=0.05))
+        result = integrator.solve(harmonic, (0.0, 100.0), np.array([1.0, 0.0]))
+
+        assert result['n_accepted'] > 1024
+        assert len(result['tau']) == result['n_accepted'] + 1
+        assert np.isclose(result['tau'][-1], 100.0)
+
+    def test_step_budget(self):
+        integrator = CompiledIntegrator(CompiledSolverConfig(method='RK45', max_steps=10))
+        with pytest.raises(RuntimeError):
+            integrator.solve(harmonic, (0.0, 100.0), np.array([1.0, 0.0]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the numerical differential solvers
+"""
+
+import pytest
+import numpy as np
+import scipy.integrate
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numerical.differential_solvers as differential_solvers
+from numerical.differential_solvers import (
+    AdaptiveStepSolver, SolverConfig, ConvergenceAnalyzer, StabilityAnalyzer, StabilityMonitor,
+    ConstraintPreservation, TargetValueEvent
+)
+
+
+def harmonic_rk2(dt: float) -> dict:
+    """Midpoint-rule harmonic oscillator on τ ∈ [0, 1] (second order)"""
+    n_steps = int(round(1.0 / dt))
+    tau = np.linspace(0.0, 1.0, n_steps + 1)
+    y = np.zeros((2, n_steps + 1))
+    y[:, 0] = [1.0, 0.0]
+
+    def rhs(state):
+        return np.array([state[1], -state[0]])
+
+    for i in range(n_steps):
+        y_mid = y[:, i] + 0.5 * dt * rhs(y[:, i])
+        y[:, i+1] = y[:, i] + dt * rhs(y_mid)
+
+    return {'tau': tau, 'y': y}
+
+
+def harmonic_rk2_grid(N: int) -> dict:
+    return harmonic_rk2(1.0 / N)
+
+
+def nan_after_half(tau, y):
+    """Right-hand side that turns non-finite past τ = 0.5"""
+    return np.array([np.nan if tau > 0.5 else 1.0])
+
+
+class TestHealthCheckPolicies:
+    """Test suite for the NaN/Inf guard of AdaptiveStepSolver"""
+
+    @pytest.mark.parametrize('policy', ['every', 'interval', 'step'])
+    def test_failure_names_step(self, policy):
+        """Every active policy reports the failing step"""
+        solver = AdaptiveStepSolver(SolverConfig(health_check=policy, health_check_interval=3, max_step=0.1))
+
+        with pytest.raises(RuntimeError, match=r"in step \d+"):
+            solver.solve_chronodynamic_system(nan_after_half, (0.0, 1.0), np.array([1.0]))
+
+    def test_every_policy_reports_last_good_step(self):
+        """Per-evaluation checks stop within the step that crosses τ = 0.5"""
+        solver = AdaptiveStepSolver(SolverConfig(health_check='every', max_step=0.1))
+
+        with pytest.raises(RuntimeError) as excinfo:
+            solver.solve_chronodynamic_system(nan_after_half, (0.0, 1.0), np.array([1.0]))
+
+        tau_start, tau_end = [float(v) for v in
+                              str(excinfo.value).split('τ=')[1].rstrip(')').split(' → ')]
+        assert tau_start <= 0.5 < tau_end
+
+    def test_step_policy_checks_states_past_tau_eval(self):
+        """LSODA accepts non-finite states; 'step' catches them off the output grid"""
+        solver = AdaptiveStepSolver(SolverConfig(method='LSODA', health_check='step', max_step=0.1))
+
+        with pytest.raises(RuntimeError, match=r"in step \d+"):
+            solver.solve_chronodynamic_system(nan_after_half, (0.0, 1.0), np.array([1.0]),
+                                              tau_eval=np.array([0.0, 0.2]))
+
+    @pytest.mark.parametrize('policy', ['every', 'interval', 'step', 'off'])
+    def test_internal_events_are_not_reported(self, policy):
+        solver = AdaptiveStepSolver(SolverConfig(health_check=policy, max_step=0.1))
+        result = solver.solve_chronodynamic_system(shifted_oscillator, (0.0, 1.0), np.array([3.0, 0.0]))
+
+        # Only the scale factor event, as without health checks
+        assert len(result['events']) == 1
+
+    def test_unknown_policy(self):
+        solver = AdaptiveStepSolver(SolverConfig(health_check='sometimes'))
+        with pytest.raises(ValueError):
+            solver.solve_chronodynamic_system(nan_after_half, (0.0, 1.0), np.array([1.0]))
+
+
+def shifted_oscillator(tau, y):
+    """Harmonic oscillator around x = 2, so a(τ) = y[0] stays positive"""
+    return np.array([y[1], 2.0 - y[0]])
+
+
+class TestStepStatistics:
+    """Test suite for the accepted/rejected step counts"""
+
+    @pytest.mark.parametrize('method', ['RK23', 'RK45', 'DOP853'])
+    @pytest.mark.parametrize('dense_output', [True, False])
+    def test_counts_match_manual_stepping(self, method, dense_output):
+        """Counts agree with stepping the scipy solver by hand"""
+        config = SolverConfig(method=method, rtol=1e-6, atol=1e-9, max_step=np.inf,
+                              dense_output=dense_output)
+        result = AdaptiveStepSolver(config).solve_chronodynamic_system(
+            shifted_oscillator, (0.0, 20.0), np.array([3.0, 0.0]))
+
+        solver = getattr(scipy.integrate, method)(shifted_oscillator, 0.0, np.array([3.0, 0.0]), 20.0,
+                                                  rtol=1e-6, atol=1e-9)
+        n_accepted = 0
+        while solver.status == 'running':
+            solver.step()
+            n_accepted += 1
+
+        assert result['accepted_steps'] == n_accepted
+        n_stages = getattr(scipy.integrate, method).n_stages
+        assert (n_accepted + result['rejected_steps']) * n_stages + 2 == solver.nfev
+
+    def test_implicit_methods_leave_rejections_unknown(self):
+        config = SolverConfig(method='LSODA', max_step=np.inf, rtol=1e-6, atol=1e-9)
+        result = AdaptiveStepSolver(config).solve_chronodynamic_system(
+            shifted_oscillator, (0.0, 20.0), np.array([3.0, 0.0]))
+
+        assert result['accepted_steps'] > 0
+        assert result['rejected_steps'] is None
+
+
+def decay_with_source(tau, y, theta):
+    """y' = -k y + s with θ = (k, s)"""
+    k, s = theta
+    return np.array([-k * y[0] + s])
+
+
+class TestSensitivities:
+    """Test suite for AdaptiveStepSolver.solve_sensitivities"""
+
+    theta = np.array([0.7, 0.3])
+
+    def analytic(self, tau):
+        """y(τ) = s/k + (1 - s/k) e^{-kτ} for y(0) = 1, and dy/dθ"""
+        k, s = self.theta
+        e = np.exp(-k * tau)
+        dy_dk = -s / k**2 * (1 - e) - (1 - s / k) * tau * e
+        dy_ds = (1 - e) / k
+        return np.array([dy_dk, dy_ds])
+
+    @pytest.mark.parametrize('exact', [True, False])
+    def test_matches_analytic_gradient(self, exact):
+        jacobians = {}
+        if exact:
+            jacobians = {
+                'jacobian': lambda tau, y, theta: np.array([[-theta[0]]]),
+                'parameter_jacobian': lambda tau, y, theta: np.array([[-y[0], 1.0]])
+            }
+
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        tau_eval = np.linspace(0.0, 5.0, 11)
+        result = solver.solve_sensitivities(decay_with_source, (0.0, 5.0), np.array([1.0]),
+                                            self.theta, tau_eval=tau_eval, **jacobians)
+
+        assert result['sensitivities'].shape == (1, 2, 11)
+        np.testing.assert_allclose(result['sensitivities'][0], self.analytic(tau_eval), atol=1e-6)
+
+    def test_initial_sensitivities_propagate(self):
+        """y(0) = θ_0 in y' = -y gives dy/dθ_0 = e^{-τ}"""
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        result = solver.solve_sensitivities(lambda tau, y, theta: -y, (0.0, 2.0), np.array([2.0]),
+                                            np.array([2.0]), initial_sensitivities=np.array([[1.0]]))
+
+        np.testing.assert_allclose(result['sensitivities'][0, 0], np.exp(-result['tau']), rtol=1e-7)
+
+    def test_large_sensitivities_keep_differences_local(self):
+        """y' = -y² with y(0) = cθ: dy/dθ = c/(1 + y(0)τ)² even for large c"""
+        c = 1e8
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        result = solver.solve_sensitivities(lambda tau, y, theta: -y**2, (0.0, 3.0), np.array([1.0]),
+                                            np.array([1.0 / c]), initial_sensitivities=np.array([[c]]))
+
+        np.testing.assert_allclose(result['sensitivities'][0, 0], c / (1 + result['tau'])**2, rtol=1e-5)
+
+    def test_rejects_single_jacobian(self):
+        solver = AdaptiveStepSolver()
+        with pytest.raises(ValueError, match='both'):
+            solver.solve_sensitivities(decay_with_source, (0.0, 1.0), np.array([1.0]), self.theta,
+                                       jacobian=lambda tau, y, theta: np.array([[-theta[0]]]))
+
+    def test_rejects_wrong_initial_shape(self):
+        solver = AdaptiveStepSolver()
+        with pytest.raises(ValueError):
+            solver.solve_sensitivities(decay_with_source, (0.0, 1.0), np.array([1.0]),
+                                       self.theta, initial_sensitivities=np.zeros((2, 2)))
+
+
+def expanding(tau, y):
+    """a(τ) = e^τ"""
+    return y
+
+
+class TestStoppingEvents:
+    """Test suite for user events in solve_chronodynamic_system"""
+
+    def test_scale_factor_target_stops_exactly(self):
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        result = solver.solve_chronodynamic_system(expanding, (0.0, 10.0), np.array([1.0]),
+                                                   events=[TargetValueEvent.scale_factor(5.0)])
+
+        assert result['terminated_by'] == 'a >= 5'
+        assert result['tau'][-1] == pytest.approx(np.log(5.0), rel=1e-9)
+        assert result['user_event_states'][0][0, 0] == pytest.approx(5.0)
+
+    def test_redshift_target_with_tau_eval(self):
+        """The stop is reported even when tau_eval ends before it"""
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        result = solver.solve_chronodynamic_system(expanding, (np.log(0.1), 1.0), np.array([0.1]),
+                                                   tau_eval=np.linspace(np.log(0.1), 1.0, 7),
+                                                   events=[TargetValueEvent.redshift(1.0)])
+
+        assert result['terminated_by'] == 'z <= 1'
+        assert result['user_events'][0][0] == pytest.approx(np.log(0.5), rel=1e-9)
+        assert result['tau'][-1] < np.log(0.5)
+
+    def test_non_terminal_events_are_recorded(self):
+        """Recording events observe the run without stopping it"""
+        def crossing(tau, y):
+            return y[0] - 2.5
+
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        result = solver.solve_chronodynamic_system(
+            shifted_oscillator, (0.0, 4*np.pi), np.array([3.0, 0.0]),
+            events=[crossing, TargetValueEvent(1.5, terminal=False, direction=-1)])
+
+        assert result['terminated_by'] is None
+        assert result['tau'][-1] == pytest.approx(4*np.pi)
+        # cos crosses 0.5 four times in two periods; 1.5 downwards at τ = 2π/3 and 8π/3
+        assert len(result['user_events'][0]) == 4
+        np.testing.assert_allclose(result['user_events'][1], [2*np.pi/3, 8*np.pi/3], rtol=1e-8)
+
+    def test_user_events_follow_internal_events(self):
+        """Adding user events leaves the built-in 'events' entries in place"""
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-10, atol=1e-12, max_step=np.inf))
+        result = solver.solve_chronodynamic_system(expanding, (0.0, 10.0), np.array([1.0]),
+                                                   events=[TargetValueEvent.scale_factor(5.0)])
+
+        assert len(result['events']) == 2
+        assert len(result['events'][0]) == 0
+        np.testing.assert_array_equal(result['events'][1], result['user_events'][0])
+
+    def test_target_met_at_start_stops_immediately(self):
+        solver = AdaptiveStepSolver()
+        result = solver.solve_chronodynamic_system(expanding, (0.0, 10.0), np.array([2.0]),
+                                                   events=[TargetValueEvent.scale_factor(1.0)])
+
+        assert result['terminated_by'] == 'a >= 1'
+        np.testing.assert_array_equal(result['tau'], [0.0])
+        np.testing.assert_array_equal(result['y'], [[2.0]])
+        np.testing.assert_array_equal(result['user_events'][0], [0.0])
+        assert result['user_event_states'][0][0, 0] == 2.0
+
+
+class TestAutoTune:
+    """Test suite for AdaptiveStepSolver.auto_tune"""
+
+    @pytest.mark.parametrize('target', [1e-6, 1e-9])
+    def test_meets_target_with_fewer_evaluations(self, target):
+        """Tuned settings reach the accuracy target cheaper than the defaults"""
+        y0 = np.array([3.0, 0.0])
+        default_nfev = AdaptiveStepSolver().solve_chronodynamic_system(
+            shifted_oscillator, (0.0, 50.0), y0)['nfev']
+
+        solver = AdaptiveStepSolver()
+        report = solver.auto_tune(shifted_oscillator, (0.0, 50.0), y0, target_accuracy=target)
+        result = solver.solve_chronodynamic_system(shifted_oscillator, (0.0, 50.0), y0)
+
+        assert solver.config.rtol == report['rtol']
+        assert abs(result['y'][0, -1] - (2.0 + np.cos(50.0))) / 3.0 < 10 * target
+        assert result['nfev'] < default_nfev
+
+    def test_settings_cached_per_problem(self):
+        y0 = np.array([3.0, 0.0])
+        first = AdaptiveStepSolver().auto_tune(shifted_oscillator, (0.0, 20.0), y0,
+                                               target_accuracy=1e-7, problem_key='oscillator-20')
+        second = AdaptiveStepSolver().auto_tune(shifted_oscillator, (0.0, 20.0), y0,
+                                                target_accuracy=1e-7, problem_key='oscillator-20', apply=False)
+
+        assert not first['cached']
+        assert second['cached']
+        assert second['config'].max_step == first['max_step']
+
+    def test_default_key_distinguishes_functions(self):
+        """Lambdas and methods of different instances are tuned separately"""
+        y0 = np.array([1.0, 0.0])
+        slow = lambda tau, y: np.array([y[1], -y[0]])
+        fast = lambda tau, y: np.array([y[1], -100.0 * y[0]])
+
+        first = AdaptiveStepSolver().auto_tune(slow, (0.0, 10.0), y0, target_accuracy=1e-7, apply=False)
+        second = AdaptiveStepSolver().auto_tune(fast, (0.0, 10.0), y0, target_accuracy=1e-7, apply=False)
+        again = AdaptiveStepSolver().auto_tune(slow, (0.0, 10.0), y0, target_accuracy=1e-7, apply=False)
+
+        assert not first['cached'] and not second['cached']
+        assert again['cached']
+        assert second['max_step'] < first['max_step']
+
+    def test_no_trend_respects_target(self, caplog):
+        """Pilots that are already exact never give an rtol looser than the target"""
+        def linear(tau, y):
+            return np.ones_like(y)
+
+        with caplog.at_level('WARNING', logger='numerical.differential_solvers'):
+            report = AdaptiveStepSolver().auto_tune(linear, (0.0, 1.0), np.array([1.0]),
+                                                    target_accuracy=1e-9, apply=False)
+
+        assert report['rtol'] <= 1e-9
+        assert 'no convergence trend' in caplog.text
+
+
+class TestConvergenceAnalyzer:
+    """Test suite for ConvergenceAnalyzer class"""
+
+    def test_temporal_observed_order(self):
+        """Observed order matches the scheme order"""
+        analyzer = ConvergenceAnalyzer(max_workers=1)
+        result = analyzer.test_temporal_convergence(harmonic_rk2, [0.02, 0.01, 0.005])
+
+        assert abs(result['observed_order'] - 2.0) < 0.1
+        assert result['reference_dt'] == 0.005
+
+        # Richardson reference beats the finest run
+        exact = np.cos(1.0)
+        ref_error = abs(result['richardson_reference'][0, -1] - exact)
+        fine_error = abs(result['solutions'][0.005]['y'][0, -1] - exact)
+        assert ref_error < fine_error
+
+    def test_serial_by_default(self, monkeypatch):
+        """Small ladders do not pay for a process pool unless asked to"""
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started")
+
+        monkeypatch.setattr(differential_solvers, 'ProcessPoolExecutor', no_pool)
+        result = ConvergenceAnalyzer().test_spatial_convergence(harmonic_rk2_grid, [25, 50, 100])
+        assert result['is_converged']
+
+    def test_spatial_convergence_parallel(self):
+        """Process-pool ladder gives the same result as a serial one"""
+        grid_sizes = [100, 25, 50]
+        parallel = ConvergenceAnalyzer(max_workers=2).test_spatial_convergence(
+            harmonic_rk2_grid, grid_sizes
+        )
+        serial = ConvergenceAnalyzer(max_workers=1).test_spatial_convergence(
+            harmonic_rk2_grid, grid_sizes
+        )
+
+        assert parallel['is_converged']
+        assert np.isclose(parallel['observed_order'], serial['observed_order'])
+        assert set(parallel['convergence_rates']) == {'25→50', '50→100'}
+
+        # Consecutive-grid differences keep their 'N1→N2' keys
+        assert set(parallel['errors']) == {'25→50', '50→100'}
+        assert parallel['errors']['25→50'] > parallel['errors']['50→100'] > 0
+        assert set(parallel['reference_errors']) == {25, 50, 100}
+
+    def test_solution_cache(self):
+        """Cached resolutions are not recomputed"""
+        calls = []
+
+        def counting_solver(dt):
+            calls.append(dt)
+            return harmonic_rk2(dt)
+
+        analyzer = ConvergenceAnalyzer(max_workers=1)
+        analyzer.test_temporal_convergence(counting_solver, [0.02, 0.01])
+        analyzer.test_temporal_convergence(counting_solver, [0.02, 0.01, 0.005])
+
+        assert sorted(calls) == [0.005, 0.01, 0.02]
+
+        analyzer.clear_cache()
+        analyzer.test_temporal_convergence(counting_solver, [0.02])
+        assert len(calls) == 4
+
+    def test_interpolation_reuses_interpolant(self):
+        """Splines are built once and never extrapolate"""
+        analyzer = ConvergenceAnalyzer()
+        source = harmonic_rk2(0.01)
+        target = np.array([-0.5, 0.25, 0.5, 1.5])
+
+        values = analyzer._interpolate_solution(source, target)
+        spline = source['spline']
+        analyzer._interpolate_solution(source, target)
+
+        assert source['spline'] is spline
+        assert np.all(np.isnan(values[:, [0, 3]]))
+        assert np.allclose(values[0, 1:3], np.cos(target[1:3]), atol=1e-4)
+
+    def test_interpolation_uses_dense_output(self):
+        """Solver dense output takes precedence over splines"""
+        from scipy.integrate import solve_ivp
+
+        sol = solve_ivp(lambda t, y: [y[1], -y[0]], (0.0, 1.0), [1.0, 0.0],
+                        dense_output=True, rtol=1e-10, atol=1e-12)
+        source = {'tau': sol.t, 'y': sol.y, 'sol': sol.sol}
+
+        values = ConvergenceAnalyzer()._interpolate_solution(source, np.array([0.3]))
+
+        assert 'spline' not in source
+        assert np.isclose(values[0, 0], np.cos(0.3), atol=1e-8)
+
+
+def branch_constraints(tau, v):
+    """x² = 1 + τ, y = xτ; valid for scalar τ and batched (n, b) variables"""
+    return np.array([v[0]**2 - (1.0 + tau), v[1] - v[0] * tau])
+
+
+def branch_jacobian(tau, v):
+    """Batched analytic Jacobian of branch_constraints, shape (b, 2, 2)"""
+    J = np.zeros((len(tau), 2, 2))
+    J[:, 0, 0] = 2 * v[0]
+    J[:, 1, 0] = -tau
+    J[:, 1, 1] = 1.0
+    return J
+
+
+class TestConstraintContinuation:
+    """Test suite for AdaptiveStepSolver.solve_constraint_sequence"""
+
+    def setup_method(self):
+        self.solver = AdaptiveStepSolver()
+        self.tau = np.linspace(0.0, 3.0, 200)
+        self.exact = np.sqrt(1.0 + self.tau)
+
+    def test_warm_start_saves_calls(self):
+        """Continuation needs fewer calls than independent cold solves"""
+        result = self.solver.solve_constraint_sequence(
+            branch_constraints, np.array([1.0, 0.0]), self.tau
+        )
+        cold_calls = sum(
+            self.solver.solve_constraint_equations(branch_constraints, np.array([1.0, 0.0]), t)['function_calls']
+            for t in self.tau
+        )
+
+        assert result['n_converged'] == len(self.tau)
+        assert np.allclose(result['variables'][:, 0], self.exact)
+        assert result['function_calls'].shape == self.tau.shape
+        assert result['total_function_calls'] < cold_calls
+
+    def test_batched_newton(self):
+        """Batched solves agree with the sequential path"""
+        analytic = self.solver.solve_constraint_sequence(
+            branch_constraints, np.array([1.0, 0.0]), self.tau,
+            jacobian=branch_jacobian, vectorized=True, batch_size=50
+        )
+        finite_diff = self.solver.solve_constraint_sequence(
+            branch_constraints, np.array([1.0, 0.0]), self.tau, vectorized=True
+        )
+
+        for result in (analytic, finite_diff):
+            assert np.all(result['converged'])
+            assert np.allclose(result['variables'][:, 0], self.exact)
+            assert np.allclose(result['variables'][:, 1], self.exact * self.tau)
+        assert analytic['total_function_calls'] < finite_diff['total_function_calls']
+
+    @pytest.mark.parametrize('vectorized', [False, True])
+    def test_failed_point_does_not_seed_later_ones(self, vectorized):
+        """A point whose residual is NaN fails alone; continuation resumes from the converged ones"""
+        tau = np.linspace(0.0, 3.0, 40)
+        failing = tau[[9, 10]]
+
+        def constraints(t, v):
+            return np.where(np.isin(t, failing), np.nan, branch_constraints(t, v))
+
+        result = self.solver.solve_constraint_sequence(
+            constraints, np.array([1.0, 0.0]), tau, vectorized=vectorized, batch_size=10
+        )
+
+        ok = ~np.isin(tau, failing)
+        assert not np.any(result['converged'][~ok])
+        assert np.all(result['converged'][ok])
+        np.testing.assert_allclose(result['variables'][ok, 0], np.sqrt(1.0 + tau[ok]))
+
+    def test_stalled_singular_members_are_not_converged(self):
+        """Singular members stalling on a residual fail without holding back regular ones"""
+        def constraints(tau, x):
+            x1, x2 = x
+            # Regular system for τ < 0.5, inconsistent singular one beyond
+            inconsistent = tau >= 0.5
+            return np.array([np.where(inconsistent, x1 + x2 - 1.0, x1 - 1.0),
+                             np.where(inconsistent, x1 + x2 - 2.0, x2 - 2.0)])
+
+        tau = np.array([0.0, 0.25, 0.75, 1.0])
+        result = self.solver.solve_constraint_sequence(
+            constraints, np.array([0.0, 0.0]), tau, vectorized=True
+        )
+
+        assert list(result['converged']) == [True, True, False, False]
+        np.testing.assert_allclose(result['variables'][:2], [[1.0, 2.0], [1.0, 2.0]])
+        assert np.all(np.linalg.norm(result['residual'][2:], axis=1) > 0.1)
+
+
+class TestStabilityAnalyzer:
+    """Test suite for StabilityAnalyzer class"""
+
+    def test_matches_per_variable_reference(self):
+        """Batched fits agree with polyfit and a full FFT on a uniform grid"""
+        tau = np.linspace(0.0, 1.0, 200)
+        solution = np.vstack([np.exp(3.0 * tau), np.sin(2*np.pi*25*tau) + 2.0])
+
+        report = StabilityAnalyzer().analyze_solution_stability(tau, solution)
+
+        for i, var in enumerate(solution):
+            slope = np.polyfit(tau, np.log(np.abs(var) + 1e-16), 1)[0]
+            power = np.abs(np.fft.fft(var))**2
+            freqs = np.fft.fftfreq(len(var), np.mean(np.diff(tau)))
+            dominant = np.abs(freqs[np.argmax(power[1:len(power)//2]) + 1])
+
+            assert np.isclose(report['growth_rates'][i], slope)
+            assert np.isclose(report['oscillation_detection'][i], dominant)
+        assert report['is_stable']
+
+    def test_ensemble_on_non_uniform_grid(self):
+        """Ensemble members are flagged independently on a stretched grid"""
+        tau = np.linspace(0.0, 1.0, 512)**2
+        stable = np.vstack([np.cos(2*np.pi*5*tau), np.exp(0.5 * tau)])
+        growing = np.vstack([np.cos(2*np.pi*5*tau), np.exp(20.0 * tau)])
+
+        result = StabilityAnalyzer().analyze_ensemble_stability(tau, np.stack([stable, growing]))
+
+        assert result['growth_rates'].shape == (2, 2)
+        assert list(result['is_stable']) == [True, False]
+        assert np.isclose(result['growth_rates'][1, 1], 20.0)
+        assert abs(result['dominant_frequencies'][0, 0] - 5.0) <= 1.0
+
+    def test_fine_non_uniform_grid_is_resampled(self):
+        """Steps far below 1e-8 are compared relatively, not absolutely"""
+        tau = 1e-6 * np.linspace(0.0, 1.0, 512)**2
+        solution = np.cos(2*np.pi*5e6*tau)[np.newaxis, :]
+
+        frequencies = StabilityAnalyzer._batched_dominant_frequencies(tau, solution)
+        assert abs(frequencies[0] - 5e6) <= 1e6
+
+
+class TestStabilityMonitor:
+    """Test suite for StabilityMonitor class"""
+
+    def test_runaway_growth_aborts_integration(self):
+        """Exponential blow-up stops the solver early"""
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-6, atol=1e-9, max_step=0.01))
+        monitor = StabilityMonitor(window=32)
+
+        result = solver.solve_chronodynamic_system(
+            lambda tau, y: 50.0 * y, (0.0, 10.0), np.array([1.0]),
+            stability_monitor=monitor
+        )
+
+        assert not result['stability']['is_stable']
+        assert 'growth rate' in result['stability']['reason']
+        assert result['tau'][-1] < 1.0
+
+    @pytest.mark.parametrize('tau_span, rate', [((-2.0, 0.0), 50.0), ((3.0, 5.0), 50.0), ((2.0, 0.0), -50.0)])
+    def test_growth_detected_on_any_span(self, tau_span, rate):
+        """Spans not starting at 0, and backward runs, are monitored on every step"""
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-6, atol=1e-9, max_step=0.01))
+        result = solver.solve_chronodynamic_system(
+            lambda tau, y: rate * y, tau_span, np.array([1.0]),
+            stability_monitor=StabilityMonitor(window=32)
+        )
+
+        assert not result['stability']['is_stable']
+        assert result['stability']['growth_rate'] == pytest.approx(50.0, rel=0.05)
+        assert result['stability']['steps_monitored'] >= 10
+        assert abs(result['tau'][-1] - tau_span[0]) < 1.0
+
+    def test_stable_run_completes(self):
+        """Shifted harmonic oscillator runs to the end of the interval"""
+        solver = AdaptiveStepSolver(SolverConfig(rtol=1e-8, atol=1e-10))
+        result = solver.solve_chronodynamic_system(
+            lambda tau, y: np.array([y[1], 2.0 - y[0]]), (0.0, 2*np.pi), np.array([3.0, 0.0]),
+            stability_monitor=StabilityMonitor()
+        )
+
+        assert result['stability']['is_stable']
+        assert np.isclose(result['tau'][-1], 2*np.pi)
+
+    def test_high_frequency_detection(self):
+        """Sliding-window spectrum flags fast oscillations on a non-uniform grid"""
+        monitor = StabilityMonitor(window=256, spectral_every=1)
+        rng = np.random.default_rng(0)
+        tau = np.cumsum(rng.uniform(5e-5, 1.5e-4, 400))
+
+        stable = True
+        for t in tau:
+            stable = monitor.update(t, np.array([1.0 + 0.1 * np.sin(2*np.pi*1500*t)]))
+            if not stable:
+                break
+
+        assert not stable
+        assert 'oscillates' in monitor.report()['reason']
+
+
+class TestConstraintPreservation:
+    """Test suite for ConstraintPreservation class"""
+
+    def test_stacked_history_matches_scalar_checks(self):
+        """Array-native monitoring agrees with per-sample constraint calls"""
+        rng = np.random.default_rng(1)
+        tau = np.sort(rng.uniform(0.1, 1.0, 50))
+        solution = np.vstack([1.0 + tau, np.ones_like(tau)])
+        tensor_history = rng.normal(size=(50, 4, 4))
+
+        checker = ConstraintPreservation()
+        report = checker.monitor_constraints({'tau': tau, 'y': solution}, {'C': tensor_history})
+
+        for i in range(len(tau)):
+            H_viol = abs(checker.hamiltonian_constraint(tau[i], solution[:, i], tensor_history[i]))
+            mom_viol = np.max(np.abs(checker.momentum_constraint(tau[i], solution[:, i], tensor_history[i])))
+            assert np.isclose(report['hamiltonian'][i], H_viol)
+            assert np.isclose(report['momentum'][i], mom_viol)
+
+        energy = report['energy_conservation']
+        assert energy[0] == 0.0
+        assert np.isclose(energy[1], abs((solution[0, 1]**3 - solution[0, 0]**3) / (tau[1] - tau[0])))
+        assert not report['is_satisfied']
+        assert report['max_violation'] == max(max(report['hamiltonian']), max(report['momentum']), max(energy))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the multirate background/perturbation integrator
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scipy.integrate import solve_ivp
+from numerical.multirate import MultirateIntegrator, MultirateConfig
+
+
+class CountingBackground:
+    """Slowly growing scale factor a' = 0.2 a, counting evaluations"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, tau, y):
+        self.calls += 1
+        return np.array([0.2 * y[0]])
+
+
+def oscillator_mode(tau, y, background, k):
+    """Fast mode δ'' = -(k/a)² δ"""
+    a = background[0]
+    return np.array([y[1], -(k / a)**2 * y[0]])
+
+
+class TestMultirateIntegrator:
+    """Test suite for MultirateIntegrator class"""
+
+    def test_modes_match_coupled_integration(self):
+        """Sub-cycled modes agree with integrating background and mode together"""
+        background_func = CountingBackground()
+        k_values = [5.0, 40.0]
+        tau_eval = np.linspace(0.0, 3.0, 13)
+
+        integrator = MultirateIntegrator(MultirateConfig(fast_rtol=1e-10, fast_atol=1e-12))
+        result = integrator.solve(
+            background_func, oscillator_mode, (0.0, 3.0), np.array([1.0]),
+            [np.array([1.0, 0.0])] * len(k_values), mode_params=k_values, tau_eval=tau_eval
+        )
+
+        # Background is integrated once, independently of the number of modes
+        assert background_func.calls == result['background_nfev']
+        assert result['modes'].shape == (2, 2, 13)
+        assert np.allclose(result['background'][0], np.exp(0.2 * tau_eval), rtol=1e-8)
+
+        for mode, k in zip(result['modes'], k_values):
+            def coupled(tau, y):
+                return np.concatenate([[0.2 * y[0]], oscillator_mode(tau, y[1:], y[:1], k)])
+
+            reference = solve_ivp(coupled, (0.0, 3.0), [1.0, 1.0, 0.0], t_eval=tau_eval,
+                                  method='DOP853', rtol=1e-11, atol=1e-13)
+            assert np.allclose(mode, reference.y[1:], atol=1e-6)
+
+    def test_background_reuse(self):
+        """A precomputed background is shared across calls"""
+        integrator = MultirateIntegrator(MultirateConfig(macro_step=0.5))
+        background = integrator.integrate_background(CountingBackground(), (0.0, 2.0), np.array([1.0]))
+
+        unused = CountingBackground()
+        result = integrator.solve(unused, oscillator_mode, (0.0, 2.0), np.array([1.0]),
+                                  [np.array([1.0, 0.0])], mode_params=[10.0], background=background)
+
+        assert unused.calls == 0
+        assert result['n_macro_steps'] >= 4
+        assert np.array_equal(result['tau'], background['tau'])
+
+    @pytest.mark.parametrize('tau_eval', [
+        np.array([0.0, 1.0, 2.5]),   # beyond tau_span
+        np.array([-0.1, 1.0]),       # before tau_span
+        np.array([0.0, 1.5, 1.0]),   # unsorted
+    ])
+    def test_invalid_tau_eval(self, tau_eval):
+        background_func = CountingBackground()
+        with pytest.raises(ValueError):
+            MultirateIntegrator().solve(background_func, oscillator_mode, (0.0, 2.0), np.array([1.0]),
+                                        [np.array([1.0, 0.0])], mode_params=[10.0], tau_eval=tau_eval)
+        assert background_func.calls == 0
+
+    def test_backward_span_rejected(self):
+        with pytest.raises(ValueError, match='forward'):
+            MultirateIntegrator().solve(CountingBackground(), oscillator_mode, (2.0, 0.0), np.array([1.0]),
+                                        [np.array([1.0, 0.0])], mode_params=[10.0])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
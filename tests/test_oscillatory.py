@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Magnus oscillator integrator
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from numerical.oscillatory import MagnusOscillatorIntegrator, OscillatorConfig
+
+
+def spherical_mode(k):
+    """x'' + (2/τ) x' + k² x = 0, solved by x = sin(kτ)/(kτ)"""
+    def coefficients(tau):
+        return 2.0 / tau, k**2
+
+    def exact(tau):
+        return np.array([np.sin(k*tau) / (k*tau),
+                         np.cos(k*tau) / tau - np.sin(k*tau) / (k*tau**2)])
+
+    return coefficients, exact
+
+
+class TestMagnusOscillatorIntegrator:
+    """Test suite for MagnusOscillatorIntegrator class"""
+
+    @pytest.mark.parametrize('k', [10.0, 100.0, 1000.0])
+    def test_damped_mode_accuracy(self, k):
+        coefficients, exact = spherical_mode(k)
+        integrator = MagnusOscillatorIntegrator(OscillatorConfig(rtol=1e-8, atol=1e-12))
+
+        tau_eval = np.linspace(1.0, 20.0, 9)
+        result = integrator.solve(coefficients, (1.0, 20.0), exact(1.0), tau_eval=tau_eval)
+
+        np.testing.assert_allclose(result['y'][0], exact(tau_eval)[0], atol=1e-8)
+
+    def test_high_k_costs_no_more_steps(self):
+        """Steps span many periods, so cost does not grow with k"""
+        steps = {}
+        for k in (10.0, 1000.0):
+            coefficients, exact = spherical_mode(k)
+            result = MagnusOscillatorIntegrator().solve(coefficients, (1.0, 20.0), exact(1.0))
+            steps[k] = result['accepted_steps'] + result['rejected_steps']
+
+        periods = 1000.0 * 19.0 / (2*np.pi)
+        assert steps[1000.0] <= steps[10.0]
+        assert steps[1000.0] < periods / 10
+
+    def test_constant_coefficients_exact_in_one_step(self):
+        """Frozen-coefficient propagation is exact for constant γ and ω²"""
+        gamma, omega = 0.2, 50.0
+        integrator = MagnusOscillatorIntegrator(OscillatorConfig(first_step=10.0))
+        result = integrator.solve(lambda tau: (gamma, omega**2), (0.0, 10.0), np.array([1.0, 0.0]))
+
+        nu = np.sqrt(omega**2 - gamma**2 / 4)
+        x_exact = np.exp(-gamma * 10.0 / 2) * (np.cos(nu * 10.0) + gamma / (2 * nu) * np.sin(nu * 10.0))
+        assert result['accepted_steps'] == 1
+        assert result['y'][0, -1] == pytest.approx(x_exact, abs=1e-12)
+
+    def test_critical_damping_fallback(self):
+        """γ² = 4ω² uses the classical Magnus step, x = (1 + τ) e^{-τ}"""
+        result = MagnusOscillatorIntegrator().solve(lambda tau: (2.0, 1.0), (0.0, 5.0), np.array([1.0, 0.0]))
+        assert result['y'][0, -1] == pytest.approx(6.0 * np.exp(-5.0), rel=1e-7)
+
+    def test_decreasing_span_rejected(self):
+        with pytest.raises(ValueError):
+            MagnusOscillatorIntegrator().solve(lambda tau: (0.0, 1.0), (1.0, 0.0), np.array([1.0, 0.0]))
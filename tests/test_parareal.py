@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Parareal parallel-in-time integrator
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from numerical.differential_solvers import AdaptiveStepSolver, SolverConfig
+from numerical.parareal import PararealIntegrator, PararealConfig
+
+
+def shifted_oscillator(tau, y):
+    """Harmonic oscillator around x = 2, so a(τ) = y[0] stays positive"""
+    return np.array([y[1], 2.0 - y[0]])
+
+
+class TestPararealIntegrator:
+    """Test suite for PararealIntegrator class"""
+
+    def setup_method(self):
+        self.solver_config = SolverConfig(rtol=1e-10, atol=1e-12, max_step=0.1)
+        self.tau_span = (0.0, 8.0)
+        self.y0 = np.array([3.0, 0.0])
+        self.reference = AdaptiveStepSolver(self.solver_config).solve_chronodynamic_system(
+            shifted_oscillator, self.tau_span, self.y0
+        )
+
+    def test_matches_serial_fine_solution(self):
+        """Converged Parareal agrees with a single fine integration"""
+        integrator = PararealIntegrator(
+            self.solver_config, PararealConfig(n_slices=8, coarse_steps=10, tolerance=1e-9, max_workers=2)
+        )
+        result = integrator.solve(shifted_oscillator, self.tau_span, self.y0)
+
+        assert result['converged']
+        assert result['iterations'] < 8
+        assert np.allclose(result['y'][:, -1], self.reference['y'][:, -1], atol=1e-8)
+        assert np.isclose(result['tau'][-1], self.tau_span[1])
+        assert np.all(np.diff(result['tau']) > 0)
+
+    def test_serial_fallback_and_iteration_cap(self):
+        """Unpicklable systems run serially and respect max_iterations"""
+        integrator = PararealIntegrator(
+            self.solver_config,
+            PararealConfig(n_slices=6, coarse_steps=1, max_iterations=1, tolerance=1e-14)
+        )
+        result = integrator.solve(lambda tau, y: shifted_oscillator(tau, y), self.tau_span, self.y0)
+
+        assert result['iterations'] == 1
+        assert not result['converged']
+        assert result['slice_values'].shape == (2, 7)
+
+    def test_unconverged_trajectory_starts_from_slice_values(self):
+        """Without convergence every fine slice restarts from the corrected boundaries"""
+        integrator = PararealIntegrator(
+            self.solver_config,
+            PararealConfig(n_slices=4, coarse_steps=1, max_iterations=2, tolerance=1e-14, max_workers=1)
+        )
+        result = integrator.solve(shifted_oscillator, self.tau_span, self.y0)
+        assert not result['converged']
+
+        solver = AdaptiveStepSolver(self.solver_config)
+        tau_slices = result['tau_slices']
+        for n in range(len(tau_slices) - 1):
+            fine = solver.solve_chronodynamic_system(
+                shifted_oscillator, (tau_slices[n], tau_slices[n+1]), result['slice_values'][:, n]
+            )
+            i = np.flatnonzero(result['tau'] == tau_slices[n+1])[0]
+            np.testing.assert_allclose(result['y'][:, i], fine['y'][:, -1], rtol=1e-12)
+
+    def test_nfev_counts_every_iteration(self, monkeypatch):
+        import numerical.parareal as parareal
+        calls = []
+        fine_propagate = parareal._fine_propagate
+
+        def counting(task):
+            result = fine_propagate(task)
+            calls.append(result['nfev'])
+            return result
+
+        monkeypatch.setattr(parareal, '_fine_propagate', counting)
+        integrator = PararealIntegrator(
+            self.solver_config, PararealConfig(n_slices=4, coarse_steps=2, tolerance=1e-9, max_workers=1)
+        )
+        result = integrator.solve(shifted_oscillator, self.tau_span, self.y0)
+
+        assert result['iterations'] > 1
+        assert len(calls) > 4
+        assert result['nfev'] == sum(calls)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent transfer function cache
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import h5py
+from observational.transfer_cache import TransferCache, stable_hash
+
+
+def mode_solution(k, n_tau=50):
+    tau = np.linspace(1e-4, 1e-3, n_tau)
+    return {'tau': tau, 'delta_gamma': np.cos(k * tau), 'phi': np.full(n_tau, k)}
+
+
+class TestStableHash:
+    """Test suite for the input hash"""
+
+    def test_independent_of_key_order(self):
+        assert stable_hash({'a': 1.0, 'b': {'c': 0.1, 'd': 2}}) == stable_hash({'b': {'d': 2, 'c': 0.1}, 'a': 1.0})
+
+    def test_sensitive_to_values(self):
+        assert stable_hash({'H0': 67.4}) != stable_hash({'H0': 67.4 + 1e-12})
+
+
+class TestTransferCache:
+    """Test suite for TransferCache"""
+
+    def test_round_trip(self, tmp_path):
+        cache = TransferCache(str(tmp_path))
+        solution = mode_solution(0.01)
+        cache.store('abc', 0.01, solution, (1.5e-5, -2e-7))
+
+        loaded = cache.load('abc', 0.01)
+        assert set(loaded) == set(solution)
+        for name, values in solution.items():
+            np.testing.assert_array_equal(loaded[name], values)
+        assert cache.load_sources('abc', 0.01) == (1.5e-5, -2e-7)
+
+        # Other cosmologies and modes miss
+        assert cache.load('abd', 0.01) is None
+        assert cache.load_sources('abc', 0.01 * (1 + 1e-15)) is None
+
+    def test_corrupt_entries_are_discarded(self, tmp_path, caplog):
+        cache = TransferCache(str(tmp_path))
+        path = cache.store('abc', 0.01, mode_solution(0.01), (1.0, 2.0))
+
+        with h5py.File(path, 'r+') as f:
+            f['phi'][3] = 0.0
+
+        with caplog.at_level('WARNING', logger='observational.transfer_cache'):
+            assert cache.load_sources('abc', 0.01) is None
+        assert 'checksum mismatch' in caplog.text
+        assert not path.exists()
+
+        # Truncated files are discarded the same way
+        path = cache.store('abc', 0.01, mode_solution(0.01), (1.0, 2.0))
+        with open(path, 'r+b') as f:
+            f.truncate(path.stat().st_size // 2)
+        assert cache.load('abc', 0.01) is None
+        assert not path.exists()
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = TransferCache(str(tmp_path), max_bytes=10**9)
+        paths = [cache.store('abc', k, mode_solution(k), (k, k)) for k in (0.01, 0.02, 0.03)]
+        for age, path in enumerate(paths):
+            os.utime(path, (1000 + age, 1000 + age))
+
+        # Reading the oldest entry makes it the most recently used
+        assert cache.load('abc', 0.01) is not None
+
+        cache.max_bytes = cache.size() - 1
+        assert cache.evict() == 1
+        assert not paths[1].exists()
+        assert paths[0].exists() and paths[2].exists()
+        assert cache.size() <= cache.max_bytes
+
+    def test_store_respects_size_limit(self, tmp_path):
+        cache = TransferCache(str(tmp_path))
+        entry_size = cache.store('abc', 0.01, mode_solution(0.01), (1.0, 1.0)).stat().st_size
+        cache.max_bytes = 3 * entry_size
+
+        for k in np.linspace(0.02, 0.1, 8):
+            cache.store('abc', k, mode_solution(k), (k, k))
+
+        assert cache.size() <= cache.max_bytes
+        assert cache.load('abc', 0.1) is not None
+        assert cache.load('abc', 0.01) is None
+
+    def test_stores_below_limit_skip_eviction(self, tmp_path, monkeypatch):
+        """The directory is only scanned once the running size exceeds the limit"""
+        cache = TransferCache(str(tmp_path), max_bytes=10**9)
+        scans = []
+        evict = cache.evict
+        monkeypatch.setattr(cache, 'evict', lambda: scans.append(1) or evict())
+
+        for k in np.linspace(0.01, 0.1, 10):
+            cache.store('abc', k, mode_solution(k), (k, k))
+        # Overwriting an entry does not grow the cache
+        cache.store('abc', 0.1, mode_solution(0.1), (0.0, 0.0))
+        assert scans == []
+        assert cache._size == cache.size()
+
+        cache.max_bytes = cache.size() - 1
+        cache.store('abc', 0.2, mode_solution(0.2), (0.2, 0.2))
+        assert len(scans) == 1
+        assert cache.size() <= cache.max_bytes